@@ -0,0 +1,158 @@
+import argparse
+import contextlib
+import io
+import json
+import sys
+import time
+
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# benchmark sizes as (width, height)
+DEFAULT_SIZES = [(10, 10), (50, 50), (200, 200), (1000, 1000)]
+DEFAULT_DENSITIES = [0.12, 0.2]
+
+
+@dataclass
+class Result:
+    """Measurement of a benchmark case on one board configuration"""
+
+    case: str
+    width: int
+    height: int
+    density: float
+    value: float
+    unit: str
+    repeats: int
+
+    @property
+    def key(self) -> Tuple[str, int, int, float]:
+        """Returns the key matching the result with its baseline"""
+        return self.case, self.width, self.height, self.density
+
+
+@contextlib.contextmanager
+def captured_stdout() -> Iterator[io.BytesIO]:
+    """Redirects stdout to an in-memory stream"""
+    buffer = io.BytesIO()
+    stdout = sys.stdout
+    sys.stdout = io.TextIOWrapper(buffer, encoding="utf-8")
+    try:
+        yield buffer
+    finally:
+        sys.stdout.flush()
+        sys.stdout = stdout
+
+
+def mines_for(width: int, height: int, density: float) -> int:
+    """Returns the mines of a board of `density`, keeping the first open free"""
+    return min(round(density * width * height), max(0, width * height - 9))
+
+
+def measure(
+    setup: Callable[[], Any],
+    run: Callable[[Any], Any],
+    min_time: float = 0.2,
+    max_repeats: int = 100,
+) -> Tuple[float, int]:
+    """Returns the best time of `run(setup())` and the number of repeats
+
+    `setup` prepares a fresh state for every repeat and is not timed
+    """
+    best = float("inf")
+    total = 0.0
+    repeats = 0
+    while repeats < max_repeats and (repeats == 0 or total < min_time):
+        state = setup()
+        start = time.perf_counter()
+        run(state)
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        total += elapsed
+        repeats += 1
+    return best, repeats
+
+
+def parse_args(description: str) -> argparse.Namespace:
+    """Parses the options shared by the benchmark entry points"""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "--sizes",
+        type=_parse_sizes,
+        default=DEFAULT_SIZES,
+        help="comma separated WIDTHxHEIGHT board sizes",
+    )
+    parser.add_argument(
+        "--densities",
+        type=lambda text: [float(value) for value in text.split(",")],
+        default=DEFAULT_DENSITIES,
+        help="comma separated mine densities",
+    )
+    parser.add_argument("--cases", default=None, help="comma separated case names")
+    parser.add_argument("--json", default=None, help="write the results to this file")
+    parser.add_argument(
+        "--baseline", default=None, help="compare against results saved with --json"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="allowed relative regression against the baseline",
+    )
+    return parser.parse_args()
+
+
+def _parse_sizes(text: str) -> List[Tuple[int, int]]:
+    sizes = []
+    for size in text.split(","):
+        width, height = size.lower().split("x")
+        sizes.append((int(width), int(height)))
+    return sizes
+
+
+def selected_cases(
+    cases: Dict[str, Callable], names: Optional[str]
+) -> Dict[str, Callable]:
+    """Returns the cases chosen with --cases, all of them by default"""
+    if names is None:
+        return cases
+    return {name: cases[name] for name in names.split(",")}
+
+
+def report(results: Iterable[Result], args: argparse.Namespace) -> int:
+    """Prints and saves the results, compares them with the baseline
+
+    Returns the process exit code, 1 when a result regressed
+    """
+    results = [*results]
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump([asdict(result) for result in results], file, indent=2)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = {
+                Result(**result).key: Result(**result) for result in json.load(file)
+            }
+
+    regressions = 0
+    for result in results:
+        line = (
+            f"{result.case:>12} {result.width:>6}x{result.height:<6} "
+            f"density {result.density:<5} {result.value:14.6g} {result.unit}"
+        )
+        previous = baseline.get(result.key)
+        if previous is not None and previous.value > 0:
+            change = result.value / previous.value - 1
+            line += f" ({change:+.1%} vs baseline)"
+            if change > args.tolerance:
+                line += " REGRESSION"
+                regressions += 1
+        print(line)
+
+    if regressions:
+        print(f"{regressions} regressions above {args.tolerance:.0%}", file=sys.stderr)
+        return 1
+    return 0
@@ -0,0 +1,167 @@
+import gc
+import multiprocessing
+import os
+import sys
+import tracemalloc
+
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from minesweeper import console_utils
+from minesweeper.board_mvc.board_model import BoardModel
+from minesweeper.game_mvc import GameController
+
+from ._common import (
+    Result,
+    captured_stdout,
+    mines_for,
+    parse_args,
+    report,
+    selected_cases,
+)
+
+
+# cell views measured per board, enough for a stable per-cell size
+_CELL_SAMPLE = 10_000
+
+# bytes per page of the resident set size reported by /proc/self/statm
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _traced(run: Callable[[], Any]) -> Tuple[int, int, Any]:
+    """Returns the bytes `run` left allocated, its peak allocation and its result
+
+    The result is returned so what it holds is still allocated when measured
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = run()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return after - before, peak - before, result
+
+
+def _rss() -> Optional[int]:
+    """Returns the resident set size of the process, None where it is unknown"""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as file:
+            return int(file.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def _generated_board(width: int, height: int, mines: int) -> BoardModel:
+    board = BoardModel(width, height, mines)
+    board.generate(height // 2, width // 2)
+    return board
+
+
+def bench_board(width: int, height: int, density: float) -> Result:
+    mines = mines_for(width, height, density)
+    retained, _, _ = _traced(lambda: _generated_board(width, height, mines))
+    return Result(
+        "board", width, height, density, retained / (width * height), "B/cell", 1
+    )
+
+
+def _board_rss(width: int, height: int, mines: int) -> Optional[int]:
+    """Returns the resident set size a generated board adds to a fresh process
+
+    Pages the generation freed but the allocator kept are counted too
+    """
+    before = _rss()
+    if before is None:
+        return None
+    board = _generated_board(width, height, mines)  # pylint: disable=unused-variable
+    return _rss() - before
+
+
+def bench_board_rss(width: int, height: int, density: float) -> Optional[Result]:
+    mines = mines_for(width, height, density)
+    # a fresh process, so no memory freed by earlier cases is reused
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        grown = pool.apply(_board_rss, (width, height, mines))
+    if grown is None:
+        return None
+    return Result(
+        "board_rss", width, height, density, grown / (width * height), "B/cell", 1
+    )
+
+
+def bench_cell(width: int, height: int, density: float) -> Result:
+    mines = mines_for(width, height, density)
+    board = _generated_board(width, height, mines)
+    count = min(width * height, _CELL_SAMPLE)
+    retained, _, _ = _traced(
+        lambda: [board.cell(*divmod(index, width)) for index in range(count)]
+    )
+    return Result("cell", width, height, density, retained / count, "B/cell", 1)
+
+
+def bench_session(width: int, height: int, density: float) -> Result:
+    mines = mines_for(width, height, density)
+
+    def create_session() -> GameController:
+        game = GameController((width, height, mines))
+        with captured_stdout(), console_utils.frame():
+            game.run(None)
+        return game
+
+    retained, _, _ = _traced(create_session)
+    return Result("session", width, height, density, retained, "B", 1)
+
+
+def bench_generate_peak(width: int, height: int, density: float) -> Result:
+    mines = mines_for(width, height, density)
+    board = BoardModel(width, height, mines)
+    _, peak, _ = _traced(lambda: board.generate(height // 2, width // 2))
+    return Result(
+        "generate_peak", width, height, density, peak / (width * height), "B/cell", 1
+    )
+
+
+def bench_flood_peak(width: int, height: int, density: float) -> Result:
+    # a board without mines is opened entirely by the first press
+    board = BoardModel(width, height, 0)
+    _, peak, _ = _traced(lambda: board.open(0, 0))
+    return Result(
+        "flood_peak", width, height, 0.0, peak / (width * height), "B/cell", 1
+    )
+
+
+# case name: (benchmark, whether the mine density changes the result)
+CASES: Dict[str, Tuple[Callable[[int, int, float], Optional[Result]], bool]] = {
+    "board": (bench_board, True),
+    "board_rss": (bench_board_rss, True),
+    "cell": (bench_cell, False),
+    "session": (bench_session, True),
+    "generate_peak": (bench_generate_peak, True),
+    "flood_peak": (bench_flood_peak, False),
+}
+
+
+def run_benchmarks(
+    sizes: List[Tuple[int, int]], densities: List[float], cases: Optional[str] = None
+) -> Iterator[Result]:
+    """Runs every selected case on every size and density
+
+    Cases that cannot be measured on this platform are skipped
+    """
+    for bench, uses_density in selected_cases(CASES, cases).values():
+        for width, height in sizes:
+            for density in densities if uses_density else densities[:1]:
+                result = bench(width, height, density)
+                if result is not None:
+                    yield result
+
+
+def main() -> int:
+    args = parse_args("Memory benchmarks of the minesweeper boards and sessions")
+    return report(run_benchmarks(args.sizes, args.densities, args.cases), args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+import sys
+
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from minesweeper import console_utils
+from minesweeper.board_mvc import board_view
+from minesweeper.board_mvc.board_model import BoardModel
+from minesweeper.game_mvc import GameController
+
+from ._common import (
+    Result,
+    captured_stdout,
+    measure,
+    mines_for,
+    parse_args,
+    report,
+    selected_cases,
+)
+
+
+# operations timed together when a single one is too fast to measure
+_FLAGS_PER_RUN = 1000
+_FRAMES_PER_RUN = 50
+_FRAME_KEYS = [b"d", b"s", b"c", b"\x20", b"c", b"a", b"w"]
+
+
+def bench_generate(width: int, height: int, density: float) -> Result:
+    mines = mines_for(width, height, density)
+
+    def place_mines(board: BoardModel):
+        first_index = board.storage.index(height // 2, width // 2)
+        board._place_mines(first_index)  # pylint: disable=protected-access
+
+    seconds, repeats = measure(lambda: BoardModel(width, height, mines), place_mines)
+    return Result("generate", width, height, density, seconds, "s", repeats)
+
+
+def bench_open_empty(width: int, height: int, density: float) -> Result:
+    # a board without mines is opened entirely by the first press
+    seconds, repeats = measure(
+        lambda: BoardModel(width, height, 0), lambda board: board.open(0, 0)
+    )
+    return Result("open_empty", width, height, 0.0, seconds, "s", repeats)
+
+
+def bench_flag(width: int, height: int, density: float) -> Result:
+    mines = mines_for(width, height, density)
+    cells = [
+        divmod(index, width) for index in range(min(width * height, _FLAGS_PER_RUN))
+    ]
+
+    def flag_cells(board: BoardModel):
+        for row, col in cells:
+            board.flag(row, col)
+
+    seconds, repeats = measure(lambda: BoardModel(width, height, mines), flag_cells)
+    return Result("flag", width, height, density, seconds / len(cells), "s/op", repeats)
+
+
+def bench_render(width: int, height: int, density: float) -> Result:
+    mines = mines_for(width, height, density)
+    board = BoardModel(width, height, mines)
+    board.open(height // 2, width // 2)
+    viewport = board_view.Viewport(0, 0, height, width)
+
+    def print_grid(_):
+        with captured_stdout():
+            board_view._print_grid(board, viewport)  # pylint: disable=protected-access
+
+    seconds, repeats = measure(lambda: None, print_grid)
+    return Result("render", width, height, density, seconds, "s", repeats)
+
+
+def bench_frame(width: int, height: int, density: float) -> Result:
+    mines = mines_for(width, height, density)
+
+    def create_game() -> GameController:
+        game = GameController((width, height, mines))
+        with captured_stdout(), console_utils.frame():
+            game.run(None)
+        return game
+
+    def run_frames(game: GameController):
+        with captured_stdout():
+            for frame in range(_FRAMES_PER_RUN):
+                with console_utils.frame():
+                    game.run(_FRAME_KEYS[frame % len(_FRAME_KEYS)])
+
+    seconds, repeats = measure(create_game, run_frames)
+    return Result(
+        "frame", width, height, density, seconds / _FRAMES_PER_RUN, "s/frame", repeats
+    )
+
+
+# case name: (benchmark, whether the mine density changes the result)
+CASES: Dict[str, Tuple[Callable[[int, int, float], Result], bool]] = {
+    "generate": (bench_generate, True),
+    "open_empty": (bench_open_empty, False),
+    "flag": (bench_flag, True),
+    "render": (bench_render, True),
+    "frame": (bench_frame, True),
+}
+
+
+def run_benchmarks(
+    sizes: List[Tuple[int, int]], densities: List[float], cases: Optional[str] = None
+) -> Iterator[Result]:
+    """Runs every selected case on every size and density"""
+    for bench, uses_density in selected_cases(CASES, cases).values():
+        for width, height in sizes:
+            for density in densities if uses_density else densities[:1]:
+                yield bench(width, height, density)
+
+
+def main() -> int:
+    args = parse_args("Speed benchmarks of the minesweeper engine and views")
+    return report(run_benchmarks(args.sizes, args.densities, args.cases), args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
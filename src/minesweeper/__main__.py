@@ -1,8 +1,182 @@
+import argparse
+import os
+import random
+
+from . import console_utils
+from .board_mvc.board_model import SEED_BITS
+from .board_mvc.board_pool import BoardPool
 from .controller_runner import ControllerRunner
-from .game_mvc import GameController
+from .game_mvc.game_controller import DEFAULT_CONFIG, GameController
+from .input_log import InputLogWriter, SessionInfo
+from .instrumentation import Instrumentation
+from .no_guess import CACHE_DIRECTORY, NoGuessBoardFactory, NoGuessCache
+from .replay import create_game, replay
+from .score_board import ScoreBoard
+from .spectator_server import SpectatorServer
+
+
+_CHUNKED_SIZE = 1_000_000
+_CHUNKED_DENSITY = 0.16
+
+# seconds between frames while the game time runs, to keep it up to date
+_TICK_INTERVAL = 0.5
+
+_SCORES_PATH = os.path.join(os.path.expanduser("~"), ".minesweeper_scores")
 
 
 def main():
-    game_controller = GameController()
-    controller_runner = ControllerRunner(game_controller)
-    controller_runner.run()
+    args = _parse_args()
+    console_utils.configure_output()
+
+    instrumentation = None
+    if args.profile is not None:
+        # installed first, so the controllers created below are timed too
+        instrumentation = Instrumentation(args.profile)
+        instrumentation.install()
+
+    try:
+        _run_game(args)
+    finally:
+        if instrumentation is not None:
+            instrumentation.dump()
+
+
+def _run_game(args: argparse.Namespace):
+    if args.replay is not None:
+        report = replay(args.replay, render=not args.headless)
+        print(
+            f"Replayed {report.keys} keys in {report.frames} frames, "
+            f"{report.seconds:.3f}s, {report.frames_per_second:.1f} frames/s"
+        )
+        return
+
+    session = _create_session(args)
+    score_board = ScoreBoard(args.scores)
+    # chunked boards are generated while exploring and no-guess boards come
+    # from the cache, there is nothing to prepare
+    board_pool = None if session.chunked or args.no_guess else BoardPool()
+    spectator_server = None
+    try:
+        if args.no_guess:
+            board_factory = NoGuessBoardFactory(NoGuessCache(args.no_guess_cache))
+            game_controller = GameController(
+                session.config, board_factory, session.seed, score_board
+            )
+        else:
+            game_controller = create_game(session, score_board, board_pool)
+        if args.spectate is not None:
+            spectator_server = SpectatorServer(port=args.spectate)
+            spectator_server.start()
+            spectator_server.watch_game(game_controller)
+
+        if args.record is None:
+            ControllerRunner(
+                game_controller,
+                tick_interval=_TICK_INTERVAL,
+                is_timing=lambda: game_controller.is_timing,
+            ).run()
+            return
+
+        with InputLogWriter(args.record, session) as input_log:
+            ControllerRunner(
+                game_controller,
+                tick_interval=_TICK_INTERVAL,
+                input_log=input_log,
+                is_timing=lambda: game_controller.is_timing,
+            ).run()
+    finally:
+        if spectator_server is not None:
+            spectator_server.stop()
+        if board_pool is not None:
+            board_pool.close()
+        score_board.close()
+
+
+def _create_session(args: argparse.Namespace) -> SessionInfo:
+    # the seed is always set, so a recorded session can be replayed
+    seed = args.seed if args.seed is not None else random.getrandbits(SEED_BITS)
+    if not args.chunked:
+        return SessionInfo(DEFAULT_CONFIG, seed)
+
+    mines = round(args.density * args.width * args.height)
+    return SessionInfo((args.width, args.height, mines), seed, chunked=True)
+
+
+def _seed(value: str) -> int:
+    seed = int(value)
+    if not 0 <= seed < 1 << SEED_BITS:
+        raise argparse.ArgumentTypeError(
+            f"{value} is not an unsigned {SEED_BITS}-bit integer"
+        )
+    return seed
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="minesweeper")
+    parser.add_argument(
+        "--chunked",
+        action="store_true",
+        help="play a huge board generated lazily as it is explored",
+    )
+    parser.add_argument("--width", type=int, default=_CHUNKED_SIZE)
+    parser.add_argument("--height", type=int, default=_CHUNKED_SIZE)
+    parser.add_argument(
+        "--density",
+        type=float,
+        default=_CHUNKED_DENSITY,
+        help="share of the cells that are mines",
+    )
+    parser.add_argument(
+        "--seed", type=_seed, default=None, help="seed of the boards of the session"
+    )
+    parser.add_argument(
+        "--no-guess",
+        action="store_true",
+        help="play boards solvable without guessing, filled with minesweeper-no-guess",
+    )
+    parser.add_argument(
+        "--no-guess-cache",
+        metavar="PATH",
+        default=CACHE_DIRECTORY,
+        help="directory of the no-guess boards",
+    )
+    parser.add_argument(
+        "--scores",
+        metavar="PATH",
+        default=_SCORES_PATH,
+        help="file the best times are recorded in",
+    )
+    parser.add_argument(
+        "--spectate",
+        metavar="PORT",
+        type=int,
+        default=None,
+        help="stream the game to spectators connecting to localhost:PORT",
+    )
+    parser.add_argument(
+        "--record", metavar="PATH", default=None, help="log the keys pressed to PATH"
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="PATH",
+        default=None,
+        help="replay a key log recorded with --record as fast as possible",
+    )
+    parser.add_argument(
+        "--headless", action="store_true", help="do not draw the replayed game"
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        default=None,
+        help="record frame latency histograms, dumped as JSON to PATH on exit "
+        "and on Ctrl+P",
+    )
+    args = parser.parse_args()
+    if args.no_guess and (args.chunked or args.record is not None):
+        # cached boards do not follow the session seed, so they cannot replay
+        parser.error("--no-guess cannot be used with --chunked or --record")
+    if args.chunked and args.spectate is not None:
+        # spectators are sent the flat storage, chunked boards have none
+        parser.error("--spectate cannot be used with --chunked")
+    return args
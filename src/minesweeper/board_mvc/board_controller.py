@@ -1,21 +1,64 @@
-from typing import Optional
+import random
 
-from .board_model import BoardModel
-from .board_view import show_board_page
-from ..user_action import UserAction
+from collections import deque
+from typing import Callable, List, Optional, Tuple
 
+from .board_history import HISTORY_BUDGET, BoardHistory
+from .board_model import BoardModel, BoardState
+from .board_pool import BoardPool
+from .board_view import BoardRenderer
+from ..score_board import ScoreBoard
+from ..solver import ConstraintSolver
+from ..user_action import UserAction
 
 # default board config
-_WIDTH = 10
-_HEIGHT = 10
-_MINES = 10
+DEFAULT_CONFIG = (10, 10, 10)
+
+# boards a pool keeps ready ahead of the one being played
+_PREPARED_BOARDS = 2
+
+
+# called with (width, height, mines, seed=seed)
+BoardFactory = Callable[..., BoardModel]
+
+BoardListener = Callable[[BoardModel], None]
 
 
 class BoardController:
-    """Class to control and show the Minesweeper game board"""
+    """Class to control and show the Minesweeper game board
+
+    Every board is seeded from a generator seeded with `seed`, so the same
+    seed and the same keys replay the same game. Won games are recorded in
+    `score_board` when one is given. A `board_pool` builds the next boards
+    of the configuration in the background, so new boards are ready at once.
+    Moves can be undone within `history_budget` bytes of history per board.
+    The first board is created from `config`
+    """
 
-    def __init__(self):
-        self._board = BoardModel(_WIDTH, _HEIGHT, _MINES)
+    def __init__(
+        self,
+        config: Tuple[int, int, int] = DEFAULT_CONFIG,
+        board_factory: BoardFactory = BoardModel,
+        seed: Optional[int] = None,
+        score_board: Optional[ScoreBoard] = None,
+        board_pool: Optional[BoardPool] = None,
+        history_budget: int = HISTORY_BUDGET,
+    ):
+        self._board_factory = board_factory
+        self._rng = random.Random(seed)
+        # seeds of the next boards, drawn ahead so a pool can build them
+        self._next_seeds = deque(
+            self._rng.getrandbits(64) for _ in range(_PREPARED_BOARDS)
+        )
+        self._board_pool = board_pool
+        self._board = self._create_board(*config)
+        self._history_budget = history_budget
+        self._history = self._create_history()
+        self._renderer = BoardRenderer()
+        self._solver: Optional[ConstraintSolver] = None
+        self._score_board = score_board
+        self._is_scored = False
+        self._board_listeners: List[BoardListener] = []
 
         self._key_action_map = {
             b"w": UserAction(
@@ -48,6 +91,21 @@ class BoardController:
                 operation="new board",
                 callback=self._create_new_board_with_same_config,
             ),
+            b"u": UserAction(
+                key_visual="u",
+                operation="undo",
+                callback=self._undo,
+            ),
+            b"r": UserAction(
+                key_visual="r",
+                operation="redo",
+                callback=self._redo,
+            ),
+            b"h": UserAction(
+                key_visual="h",
+                operation="hint",
+                callback=self._move_to_safe_cell,
+            ),
             b"\x20": UserAction(
                 key_visual="space",
                 operation="press",
@@ -55,6 +113,11 @@ class BoardController:
             ),
         }
 
+    @property
+    def board(self) -> BoardModel:
+        """Returns the board being played"""
+        return self._board
+
     @property
     def help_message(self) -> str:
         """Returns the help message"""
@@ -68,15 +131,87 @@ class BoardController:
             action.callback()
             handled = True
 
-        show_board_page(self._board)
+        scores = ()
+        if self._score_board is not None and self._board.state == BoardState.WON:
+            if not self._is_scored:
+                self._score_board.add(self._config, self._board.elapsed_time)
+                self._is_scored = True
+            scores = self._score_board.top(self._config)
+
+        self._renderer.render(self._board, scores)
 
         return handled
 
+    def invalidate(self):
+        """Forces the next run to redraw the entire page"""
+        self._renderer.invalidate()
+
+    def add_board_listener(self, listener: BoardListener):
+        """Registers `listener` to be called with every new board"""
+        self._board_listeners.append(listener)
+
     def create_new_board(self, width: int, height: int, mines: int):
         """Create a new board from a given configuration"""
-        self._board = BoardModel(width, height, mines)
+        self._reset_solver()
+        if self._history is not None:
+            self._history.detach()
+        self._board = self._create_board(width, height, mines)
+        self._history = self._create_history()
+        self._is_scored = False
+        for listener in self._board_listeners:
+            listener(self._board)
 
-    def _create_new_board_with_same_config(self):
+    @property
+    def _config(self) -> Tuple[int, int, int]:
         width, height = self._board.dimensions
-        mines = self._board.mines
-        self.create_new_board(width, height, mines)
+        return width, height, self._board.mines
+
+    def _create_board(self, width: int, height: int, mines: int) -> BoardModel:
+        seed = self._next_seeds.popleft()
+        self._next_seeds.append(self._rng.getrandbits(64))
+        if self._board_pool is None:
+            return self._board_factory(width, height, mines, seed=seed)
+
+        config = (width, height, mines)
+        board = self._board_pool.take(config, seed)
+        if board is None:
+            board = self._board_factory(width, height, mines, seed=seed)
+        self._board_pool.prepare(config, self._next_seeds)
+        return board
+
+    def _create_history(self) -> Optional[BoardHistory]:
+        # boards without flat storage, like chunked boards, have no history
+        if self._board.storage is None:
+            return None
+        return BoardHistory(self._board, self._history_budget)
+
+    def _reset_solver(self):
+        if self._solver is not None:
+            self._solver.detach()
+            self._solver = None
+
+    def _undo(self):
+        # the solver only follows moves forward
+        if self._history is not None and self._history.undo():
+            self._reset_solver()
+
+    def _redo(self):
+        if self._history is not None and self._history.redo():
+            self._reset_solver()
+
+    def _move_to_safe_cell(self):
+        # boards without flat storage, like chunked boards, are not solved
+        if self._board.storage is None:
+            return
+        if self._solver is None:
+            self._solver = ConstraintSolver(self._board)
+
+        index = self._solver.next_safe_cell()
+        if index is None:
+            return
+        row, col = divmod(index, self._board.dimensions[0])
+        self._board.offset_row(row - self._board.active_row)
+        self._board.offset_col(col - self._board.active_col)
+
+    def _create_new_board_with_same_config(self):
+        self.create_new_board(*self._config)
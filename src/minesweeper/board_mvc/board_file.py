@@ -0,0 +1,134 @@
+import mmap
+import struct
+
+from .board_generation import fill_cell_types_from_mask
+from .board_model import BoardModel
+from .board_storage import MINE_CODE
+
+
+# magic, version, flags, width, height, mines, seed, active row, active col
+_HEADER = struct.Struct("<4sHHIIQQII")
+_MAGIC = b"MSWP"
+_VERSION = 1
+_GENERATED_FLAG = 1
+
+# bit `i` of every byte, as 0 or 1
+_BIT_TABLES = [bytes((value >> bit) & 1 for value in range(256)) for bit in range(8)]
+_MINE_TABLE = bytes(code == MINE_CODE for code in range(256))
+
+# plane bytes decoded at once, 512k cells, bounds the buffers of a load
+_DECODE_CHUNK = 1 << 16
+
+
+def save_board(board: BoardModel, path: str):
+    """Writes the board to `path` in the bit-packed board format
+
+    A small header is followed by three bit-planes of a bit per cell in
+    flat index order: the mines, then bit 0 and bit 1 of the cell state
+    codes, which are the open and the flag bits. A question mark sets both
+    """
+    storage = board.storage
+    if storage is None:
+        raise ValueError("only boards with a flat storage can be saved")
+
+    width, height = board.dimensions
+    header = _HEADER.pack(
+        _MAGIC,
+        _VERSION,
+        _GENERATED_FLAG if board.is_generated else 0,
+        width,
+        height,
+        board.mines,
+        board.seed,
+        board.active_row,
+        board.active_col,
+    )
+    with open(path, "wb") as file:
+        file.write(header)
+        file.write(_pack_bits(storage.types.translate(_MINE_TABLE)))
+        file.write(_pack_bits(storage.states.translate(_BIT_TABLES[0])))
+        file.write(_pack_bits(storage.states.translate(_BIT_TABLES[1])))
+
+
+def load_board(path: str) -> BoardModel:
+    """Reads a board written by `save_board`
+
+    The file is memory-mapped and its planes are decoded straight from the
+    mapping, `_DECODE_CHUNK` bytes at a time, so only one chunk of each
+    plane is copied out at once. Loading still decodes every cell: the
+    board keeps its cells in `bytearray` buffers that the fill, the solver
+    and the views scan directly, so the planes are not paged in lazily
+    """
+    with open(path, "rb") as file, mmap.mmap(
+        file.fileno(), 0, access=mmap.ACCESS_READ
+    ) as data:
+        if len(data) < _HEADER.size:
+            raise ValueError(f"{path} is not a board file")
+        (
+            magic,
+            version,
+            flags,
+            width,
+            height,
+            mines,
+            seed,
+            active_row,
+            active_col,
+        ) = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{path} is not a version {_VERSION} board file")
+
+        size = width * height
+        plane_size = (size + 7) // 8
+        if len(data) != _HEADER.size + 3 * plane_size:
+            raise ValueError(f"{path} is truncated")
+        mine_start = _HEADER.size
+        open_start = mine_start + plane_size
+        flag_start = open_start + plane_size
+
+        board = BoardModel(width, height, mines, seed)
+        storage = board.storage
+        is_generated = bool(flags & _GENERATED_FLAG)
+        mine_mask = bytearray(size) if is_generated else None
+        for start in range(0, plane_size, _DECODE_CHUNK):
+            stop = min(start + _DECODE_CHUNK, plane_size)
+            first, cells = start * 8, min(size - start * 8, (stop - start) * 8)
+            if mine_mask is not None:
+                mine_mask[first : first + cells] = _unpack_bits(
+                    data[mine_start + start : mine_start + stop], cells
+                )
+            opened = _unpack_bits(data[open_start + start : open_start + stop], cells)
+            flagged = _unpack_bits(data[flag_start + start : flag_start + stop], cells)
+            states = int.from_bytes(opened, "little") | (
+                int.from_bytes(flagged, "little") << 1
+            )
+            storage.states[first : first + cells] = states.to_bytes(cells, "little")
+
+    if mine_mask is not None:
+        fill_cell_types_from_mask(storage, mine_mask)
+    board.restore(is_generated)
+    board.offset_row(active_row)
+    board.offset_col(active_col)
+    return board
+
+
+def _pack_bits(cells: bytes) -> bytes:
+    """Packs a 0 or 1 byte per cell into a bit per cell, lowest bit first
+
+    Every eighth cell is one byte lane of a big integer, shifting lane group
+    `i` by `i` bits stacks the eight groups in the same bytes without carries
+    """
+    cells = bytes(cells) + bytes(-len(cells) % 8)
+    packed = 0
+    for bit in range(8):
+        packed |= int.from_bytes(cells[bit::8], "little") << bit
+    return packed.to_bytes(len(cells) // 8, "little")
+
+
+def _unpack_bits(packed: bytes, size: int) -> bytearray:
+    """Unpacks a bit per cell into a 0 or 1 byte per cell, inverse of `_pack_bits`"""
+    cells = bytearray(len(packed) * 8)
+    for bit in range(8):
+        cells[bit::8] = packed.translate(_BIT_TABLES[bit])
+    del cells[size:]
+    return cells
@@ -0,0 +1,117 @@
+import bisect
+import random
+
+from typing import Iterable, List
+
+from .board_storage import MINE_CODE, BoardStorage
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional speedup
+    np = None
+
+
+# maps the summed lanes to type codes, mines are marked by adding `_MINE_MARK`
+_MINE_MARK = 16
+_LANES_TO_TYPE_CODES = bytes(
+    MINE_CODE if value >= _MINE_MARK else value for value in range(256)
+)
+
+
+def sample_mine_indices(
+    size: int, mines: int, excluded: Iterable[int] = (), rng: random.Random = random
+) -> List[int]:
+    """Draws `mines` distinct flat indices in `range(size)` outside `excluded`
+
+    Indices are sampled from the free cells without materializing them, so
+    the cost scales with the number of mines instead of the board area
+    """
+    excluded = sorted(set(excluded))
+
+    # a free position moves past every excluded index at or before it
+    thresholds = [index - skipped for skipped, index in enumerate(excluded)]
+    return [
+        position + bisect.bisect_right(thresholds, position)
+        for position in rng.sample(range(size - len(excluded)), mines)
+    ]
+
+
+def fill_cell_types(storage: BoardStorage, mine_indices: Iterable[int]):
+    """Places the mines in the storage and numbers every other cell
+
+    Every neighbour count is computed in a single pass over the board,
+    using NumPy when it is installed
+    """
+    if np is not None:
+        _fill_cell_types_numpy(storage, mine_indices)
+    else:
+        _fill_cell_types_lanes(storage, mine_indices)
+
+
+def fill_cell_types_from_mask(storage: BoardStorage, mine_mask: bytes):
+    """Same as `fill_cell_types`, with a 0 or 1 byte per cell marking the mines"""
+    if np is not None:
+        mines = np.frombuffer(mine_mask, dtype=np.uint8)
+        _count_neighbours_numpy(storage, mines.reshape(storage.height, storage.width))
+    else:
+        width = storage.width
+        guarded_mask = b"".join(
+            mine_mask[row * width : (row + 1) * width] + b"\0"
+            for row in range(storage.height)
+        )
+        _count_neighbours_lanes(storage, guarded_mask)
+
+
+def _fill_cell_types_numpy(storage: BoardStorage, mine_indices: Iterable[int]):
+    width, height = storage.width, storage.height
+
+    mines = np.zeros(width * height, dtype=np.uint8)
+    mines[np.fromiter(mine_indices, dtype=np.int64)] = 1
+    _count_neighbours_numpy(storage, mines.reshape(height, width))
+
+
+def _count_neighbours_numpy(storage: BoardStorage, mines):
+    width, height = storage.width, storage.height
+    padded = np.pad(mines, 1)
+    counts = np.zeros((height, width), dtype=np.uint8)
+    for row_offset in range(3):
+        for col_offset in range(3):
+            counts += padded[
+                row_offset : row_offset + height, col_offset : col_offset + width
+            ]
+    counts[mines == 1] = MINE_CODE
+
+    storage.types[:] = counts.tobytes()
+
+
+def _fill_cell_types_lanes(storage: BoardStorage, mine_indices: Iterable[int]):
+    width = storage.width
+    guarded_mask = bytearray((width + 1) * storage.height)
+    for index in mine_indices:
+        guarded_mask[index + index // width] = 1
+    _count_neighbours_lanes(storage, guarded_mask)
+
+
+def _count_neighbours_lanes(storage: BoardStorage, guarded_mask: bytes):
+    """Pure Python fallback
+
+    The board is packed into one big integer with a byte lane per cell and a
+    zero guard column after every row, so shifting the integer by one lane
+    or by one row adds up neighbours without carries or wrap-around
+    """
+    width, height = storage.width, storage.height
+    stride = width + 1
+
+    mines = int.from_bytes(guarded_mask, "little")
+    row_sums = mines + (mines << 8) + (mines >> 8)
+    counts = row_sums + (row_sums << (8 * stride)) + (row_sums >> (8 * stride))
+    counts += mines * _MINE_MARK
+
+    lanes = (counts & ((1 << (8 * stride * height)) - 1)).to_bytes(
+        stride * height, "little"
+    )
+    lanes = lanes.translate(_LANES_TO_TYPE_CODES)
+
+    storage.types[:] = b"".join(
+        lanes[row * stride : row * stride + width] for row in range(height)
+    )
@@ -0,0 +1,118 @@
+import sys
+
+from array import array
+from collections import deque
+from typing import Deque, Sequence, Tuple
+
+from .board_model import BoardModel
+from .board_storage import CLOSE_CODE, NEXT_MARK_CODE, OPEN_CODE
+
+
+# memory the journal of a board may take, in bytes
+HISTORY_BUDGET = 16 << 20
+
+# state code a cell had before a move left it with a given state code,
+# opening only turns closed cells open and marking cycles through the marks
+_PREVIOUS_CODES = {
+    OPEN_CODE: CLOSE_CODE,
+    **{
+        next_code: code
+        for code, next_code in enumerate(NEXT_MARK_CODE)
+        if next_code != OPEN_CODE
+    },
+}
+_PREVIOUS_STATE = bytes(_PREVIOUS_CODES.get(code, code) for code in range(256))
+
+# flat indices of the cells a move changed, with their state codes after it
+_Entry = Tuple[array, bytes]
+
+
+class BoardHistory:
+    """Undo and redo of the moves played on a board
+
+    Every change notification of the board is journaled as a move: the flat
+    indices of the changed cells and their state codes after it. The codes
+    before a move follow from the codes after it, so a move takes about 5
+    bytes per changed cell, and undoing or redoing it costs as much as the
+    move instead of the board size. The oldest moves are dropped once the
+    journal outgrows `budget` bytes
+    """
+
+    def __init__(self, board: BoardModel, budget: int = HISTORY_BUDGET):
+        if board.storage is None:
+            raise ValueError("only boards with a flat storage keep a history")
+        self._board = board
+        self._budget = budget
+        self._undo: Deque[_Entry] = deque()
+        self._redo: Deque[_Entry] = deque()
+        self._memory = 0
+        self._is_replaying = False
+        board.add_change_listener(self._on_board_change)
+
+    @property
+    def memory(self) -> int:
+        """Returns the bytes taken by the journaled moves"""
+        return self._memory
+
+    @property
+    def can_undo(self) -> bool:
+        """Returns True if there is a move to undo"""
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        """Returns True if there is an undone move to play again"""
+        return bool(self._redo)
+
+    def undo(self) -> bool:
+        """Takes back the last move, returns False if there is none"""
+        if not self._undo:
+            return False
+        indices, codes = entry = self._undo.pop()
+        self._redo.append(entry)
+        self._replay(indices, codes.translate(_PREVIOUS_STATE))
+        return True
+
+    def redo(self) -> bool:
+        """Plays the last undone move again, returns False if there is none"""
+        if not self._redo:
+            return False
+        indices, codes = entry = self._redo.pop()
+        self._undo.append(entry)
+        self._replay(indices, codes)
+        return True
+
+    def detach(self):
+        """Stops following the board and drops the journal"""
+        self._board.remove_change_listener(self._on_board_change)
+        self._undo.clear()
+        self._redo.clear()
+        self._memory = 0
+
+    def _replay(self, indices: array, codes: bytes):
+        self._is_replaying = True
+        try:
+            self._board.set_states(indices, codes)
+        finally:
+            self._is_replaying = False
+
+    def _on_board_change(self, indices: Sequence[int]):
+        if self._is_replaying:
+            return
+
+        # a new move forks the history, the undone moves are lost
+        while self._redo:
+            self._memory -= _entry_size(self._redo.pop())
+
+        states = self._board.storage.states
+        entry = (array("I", indices), bytes(states[index] for index in indices))
+        self._undo.append(entry)
+        self._memory += _entry_size(entry)
+
+        while self._memory > self._budget and self._undo:
+            self._memory -= _entry_size(self._undo.popleft())
+
+
+def _entry_size(entry: _Entry) -> int:
+    indices, codes = entry
+    return sys.getsizeof(entry) + sys.getsizeof(indices) + sys.getsizeof(codes)
@@ -0,0 +1,75 @@
+from dataclasses import dataclass
+from typing import Tuple
+
+from .board_storage import CLOSE_CODE, EMPTY_CODE, MINE_CODE, OPEN_CODE, BoardStorage
+from .flood_fill import open_region
+
+
+@dataclass(frozen=True)
+class BoardMetrics:
+    """Difficulty of a generated board
+
+    `three_bv` is the least number of clicks that clears the board: one per
+    opening, a region of empty cells with its numbered border, plus one per
+    isolated number, a number touching no empty cell
+    """
+
+    openings: int
+    isolated_numbers: int
+
+    @property
+    def three_bv(self) -> int:
+        """Returns the least number of clicks that clears the board"""
+        return self.openings + self.isolated_numbers
+
+
+def compute_metrics(storage: BoardStorage) -> BoardMetrics:
+    """Returns the metrics of the generated board in `storage`"""
+    openings, isolated_numbers, _ = _scan(storage, count_cleared=False)
+    return BoardMetrics(openings, isolated_numbers)
+
+
+def solved_three_bv(storage: BoardStorage) -> int:
+    """Returns the part of the 3BV already cleared by the opened cells"""
+    return _scan(storage, count_cleared=True)[2]
+
+
+def _scan(storage: BoardStorage, count_cleared: bool) -> Tuple[int, int, int]:
+    """Returns the openings, the isolated numbers and the cleared 3BV
+
+    Every opening is flood filled once on a scratch copy of the states,
+    with the same fill as opening a cell, so the pass is linear in the
+    board size. The numbers left closed afterwards are the isolated ones.
+    An opening is cleared when every cell of it is open, a flag can stop
+    the fill of a played opening partway
+    """
+    types, states = storage.types, storage.states
+    scratch = BoardStorage(storage.width, storage.height)
+    scratch.types = types
+    filled = scratch.states
+
+    openings = cleared = 0
+    index = types.find(EMPTY_CODE)
+    while index != -1:
+        if filled[index] == CLOSE_CODE:
+            region = open_region(scratch, index)
+            openings += 1
+            if count_cleared:
+                cleared += all(states[cell] == OPEN_CODE for cell in region)
+            index = types.find(EMPTY_CODE, index + 1)
+        else:
+            # skips the run of cells filled already
+            index = filled.find(CLOSE_CODE, index)
+            if index != -1:
+                index = types.find(EMPTY_CODE, index)
+
+    isolated_numbers = filled.count(CLOSE_CODE) - types.count(MINE_CODE)
+
+    if count_cleared:
+        # cells the fills left closed are the isolated numbers and the mines
+        index = filled.find(CLOSE_CODE)
+        while index != -1:
+            cleared += states[index] == OPEN_CODE and types[index] != MINE_CODE
+            index = filled.find(CLOSE_CODE, index + 1)
+
+    return openings, isolated_numbers, cleared
@@ -1,13 +1,28 @@
 import random
 
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Generator, List, Tuple, TypeVar
-
+from typing import (
+    Callable,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from ..stopwatch import Stopwatch
+from .board_generation import fill_cell_types, sample_mine_indices
+from .board_metrics import BoardMetrics, compute_metrics, solved_three_bv
+from .board_storage import EMPTY_CODE, FLAG_CODE, MINE_CODE, OPEN_CODE, BoardStorage
 from .cell import Cell, CellState, CellType
+from .flood_fill import open_region
 
 
-T = TypeVar("T")
-Grid = List[List[T]]
+# seeds are stored as unsigned 64-bit integers in board files and input logs
+SEED_BITS = 64
 
 
 class BoardState(Enum):
@@ -25,12 +40,95 @@ class BoardAction(Enum):
     FLAG = "Flag"
 
 
+ChangeListener = Callable[[Sequence[int]], None]
+
+
+@dataclass
+class BoardChanges:
+    """What a batch of actions changed, cells are flat indices
+
+    `marked` holds the cells whose flag or question mark was toggled
+    """
+
+    opened: List[int] = field(default_factory=list)
+    marked: List[int] = field(default_factory=list)
+    state: BoardState = BoardState.PLAYING
+
+
+# translation tables marking the mines and the opened cells with 1
+_MINE_FLAGS = bytes(code == MINE_CODE for code in range(256))
+_OPEN_FLAGS = bytes(code == OPEN_CODE for code in range(256))
+
+# random draws per mine moved off the first open before listing the free cells
+_RELOCATION_ATTEMPTS = 32
+
+
+class _RowView:
+    """Lazy view of a single row of the board"""
+
+    __slots__ = ("_board", "_row")
+
+    def __init__(self, board: "BoardModel", row: int):
+        self._board = board
+        self._row = row
+
+    def __len__(self) -> int:
+        return self._board.dimensions[0]
+
+    def __getitem__(self, col: int) -> Cell:
+        width = self._board.dimensions[0]
+        if not -width <= col < width:
+            raise IndexError("column index out of range")
+        return self._board.cell(self._row, col % width)
+
+    def __iter__(self) -> Iterator[Cell]:
+        for col in range(self._board.dimensions[0]):
+            yield self._board.cell(self._row, col)
+
+
+class GridView:
+    """Lazy `grid[row][col]` view of the board cells
+
+    Cells are created on access, so the view costs nothing when unused
+    """
+
+    __slots__ = ("_board",)
+
+    def __init__(self, board: "BoardModel"):
+        self._board = board
+
+    def __len__(self) -> int:
+        return self._board.dimensions[1]
+
+    def __getitem__(self, row: int) -> _RowView:
+        height = self._board.dimensions[1]
+        if not -height <= row < height:
+            raise IndexError("row index out of range")
+        return _RowView(self._board, row % height)
+
+    def __iter__(self) -> Iterator[_RowView]:
+        for row in range(self._board.dimensions[1]):
+            yield _RowView(self._board, row)
+
+
 class BoardModel:
-    def __init__(self, width, height, mines):
+    """Minesweeper board
+
+    The mines are placed on the first open, drawn from a generator seeded
+    with `seed`, so `(width, height, mines, seed)` and the first opened cell
+    always yield the same board, whether it was pregenerated or not. The
+    seed is an unsigned 64-bit integer
+    """
+
+    def __init__(self, width, height, mines, seed: Optional[int] = None):
+        if seed is not None and not 0 <= seed < 1 << SEED_BITS:
+            raise ValueError(f"seed must be an unsigned {SEED_BITS}-bit integer")
         self._dimensions = (width, height)
         self._mines = mines
+        self._seed = seed if seed is not None else random.getrandbits(SEED_BITS)
+        self._rng = random.Random(self._seed)
 
-        self._grid = None
+        self._storage = None
         self._initialize_grid()
 
         self._active_action = None
@@ -43,6 +141,11 @@ class BoardModel:
         self._opened_count = 0
         self._flagged_count = 0
         self._mine_opened = False
+        self._stopwatch = Stopwatch()
+        self._metrics: Optional[BoardMetrics] = None
+        self._cleared_three_bv: Optional[int] = None
+
+        self._change_listeners: List[ChangeListener] = []
 
     @property
     def dimensions(self) -> Tuple[int, int]:
@@ -54,6 +157,11 @@ class BoardModel:
         """Returns the number of mines in the board"""
         return self._mines
 
+    @property
+    def seed(self) -> int:
+        """Returns the seed the mines are placed from"""
+        return self._seed
+
     @property
     def state(self) -> BoardState:
         """Returns the current board state"""
@@ -65,9 +173,54 @@ class BoardModel:
         return self._mines - self._flagged_count
 
     @property
-    def grid(self) -> Grid:
+    def elapsed_time(self) -> float:
+        """Returns the seconds played, from the first open to the end of the game"""
+        return self._stopwatch.elapsed
+
+    @property
+    def is_timing(self) -> bool:
+        """Returns True while the game time runs"""
+        return self._stopwatch.is_running
+
+    @property
+    def metrics(self) -> Optional[BoardMetrics]:
+        """Returns the difficulty metrics, None before the mines are placed
+
+        They are computed on the first call, so boards nobody measures do not
+        pay for the pass over the board
+        """
+        if self._metrics is None and self._is_generated and self._storage is not None:
+            self._metrics = compute_metrics(self._storage)
+        return self._metrics
+
+    @property
+    def three_bv_per_second(self) -> Optional[float]:
+        """Returns the 3BV cleared per second played, None until the game ends
+
+        A lost game counts the openings and isolated numbers it cleared
+        """
+        if self._state == BoardState.PLAYING or self._storage is None:
+            return None
+        elapsed = self._stopwatch.elapsed
+        if elapsed <= 0:
+            return None
+
+        if self._cleared_three_bv is None:
+            if self._state == BoardState.WON:
+                self._cleared_three_bv = self.metrics.three_bv
+            else:
+                self._cleared_three_bv = solved_three_bv(self._storage)
+        return self._cleared_three_bv / elapsed
+
+    @property
+    def grid(self) -> GridView:
         """Returns the grid of cells"""
-        return self._grid
+        return GridView(self)
+
+    @property
+    def storage(self) -> BoardStorage:
+        """Returns the flat storage of the board cells"""
+        return self._storage
 
     @property
     def active_row(self) -> int:
@@ -84,6 +237,18 @@ class BoardModel:
         """Returns the active action"""
         return self._active_action
 
+    def cell(self, row: int, col: int) -> Cell:
+        """Returns a view of the cell at (row, col)"""
+        return Cell(self._storage, row, col)
+
+    def add_change_listener(self, listener: ChangeListener):
+        """Registers `listener` to be called with the flat indices of changed cells"""
+        self._change_listeners.append(listener)
+
+    def remove_change_listener(self, listener: ChangeListener):
+        """Unregisters a listener added with `add_change_listener`"""
+        self._change_listeners.remove(listener)
+
     def offset_row(self, offset: int):
         """Adds the `offset` to the active column"""
         self._active_row = (self._active_row + offset) % self._dimensions[1]
@@ -104,74 +269,220 @@ class BoardModel:
             case BoardAction.FLAG:
                 self.flag(self._active_row, self._active_col)
 
+    @property
+    def is_generated(self) -> bool:
+        """Returns True once the mines are placed, which happens on the first open"""
+        return self._is_generated
+
     def _initialize_grid(self):
         width, height = self._dimensions
-        self._grid = [[Cell(row, col) for col in range(width)] for row in range(height)]
+        self._storage = BoardStorage(width, height)
+        self._is_generated = False
+        self._is_pregenerated = False
+
+    def pregenerate(self):
+        """Places and numbers the mines ahead of the first open
 
-        for cell in self._get_random_cells_for_mines():
-            cell.type = CellType.MINE
+        This is the costly part of the generation, the first open then only
+        moves the few mines found around the opened cell
+        """
+        if self._is_generated or self._is_pregenerated:
+            return
+        mine_indices = sample_mine_indices(
+            self._storage.size, self._mines, (), self._rng
+        )
+        fill_cell_types(self._storage, mine_indices)
+        self._is_pregenerated = True
+
+    def generate(self, row: int, col: int):
+        """Places the mines as if the cell at (row, col) were opened first"""
+        if not self._is_generated:
+            self._place_mines(self._storage.index(row, col))
+
+    def _place_mines(self, first_index: int):
+        """Places the mines away from the first opened cell and its neighbours
+
+        The mines are drawn over the whole board, then the ones in the safe
+        area are moved to random free cells, which keeps every layout with a
+        free safe area equally likely. The safe area shrinks to the opened
+        cell alone, then to nothing, when the board is too crowded to keep it
+        free
+        """
+        self.pregenerate()
+
+        size = self._storage.size
+        safe_area = [first_index, *self._storage.neighbours(first_index)]
+        if self._mines > size - len(safe_area):
+            safe_area = [first_index] if self._mines < size else []
+
+        self._move_mines_out_of(safe_area)
+        self._is_generated = True
+
+    def _move_mines_out_of(self, area: List[int]):
+        """Moves the mines of `area` to random free cells and renumbers around them"""
+        storage = self._storage
+        types = storage.types
+        moved = [index for index in area if types[index] == MINE_CODE]
+        if not moved:
+            return
 
-        for row in range(height):
-            for col in range(width):
-                cell = self._grid[row][col]
-                if cell.is_initialized:
-                    continue
+        taken = {*area}
+        targets: List[int] = []
+        for _ in range(_RELOCATION_ATTEMPTS * len(moved)):
+            index = self._rng.randrange(storage.size)
+            if index not in taken and types[index] != MINE_CODE:
+                taken.add(index)
+                targets.append(index)
+                if len(targets) == len(moved):
+                    break
+        else:
+            # crowded boards list their few free cells instead
+            free = [
+                index
+                for index in range(storage.size)
+                if index not in taken and types[index] != MINE_CODE
+            ]
+            targets += self._rng.sample(free, len(moved) - len(targets))
+
+        for index in moved:
+            types[index] = EMPTY_CODE
+        for index in targets:
+            types[index] = MINE_CODE
+
+        renumbered = {*moved, *targets}
+        for index in moved + targets:
+            renumbered.update(storage.neighbours(index))
+        for index in renumbered:
+            if types[index] != MINE_CODE:
+                types[index] = sum(
+                    types[neighbour] == MINE_CODE
+                    for neighbour in storage.neighbours(index)
+                )
+
+    def restore(self, is_generated: bool):
+        """Recounts the board state after a saved game was read into the storage
+
+        Listeners are not notified, they are expected to draw the board anew
+        """
+        storage = self._storage
+        self._is_generated = is_generated
 
-                mine_count = self._count_mines_around_cell(cell)
-                cell.type = CellType(mine_count)
+        states = storage.states
+        self._opened_count = states.count(OPEN_CODE)
+        self._flagged_count = states.count(FLAG_CODE)
 
-    def _get_random_cells_for_mines(self) -> List[Cell]:
-        width, height = self._dimensions
-        free_cells = filter(
-            lambda cell: not cell.is_initialized,
-            (self._grid[row][col] for row in range(height) for col in range(width)),
-        )
-        return random.sample([*free_cells], self.mines)
+        # a lost game has its mine open, opened mines do not count as opened
+        mines = int.from_bytes(storage.types.translate(_MINE_FLAGS), "little")
+        opened = int.from_bytes(states.translate(_OPEN_FLAGS), "little")
+        self._mine_opened = bool(mines & opened)
+        self._opened_count -= self._mine_opened
 
-    def _count_mines_around_cell(self, cell: Cell) -> int:
-        width, height = self._dimensions
-        count = 0
-        for row in range(max(0, cell.row - 1), min(height, cell.row + 2)):
-            for col in range(max(0, cell.col - 1), min(width, cell.col + 2)):
-                if self._grid[row][col].type == CellType.MINE:
-                    count += 1
-        return count
-
-    def open(self, row: int, col: int):
-        """Opens the cell at (row, col)"""
-        cell = self._grid[row][col]
-        self._open_and_expand_selection(cell)
+        self._state = BoardState.PLAYING
+        self._metrics = None
+        self._cleared_three_bv = None
         self._update_board_state()
 
-    def _open_and_expand_selection(self, cell: Cell):
-        """Opens the selected cell and expand the opened area if relevant
-        Returns the number of opened cells
+    def open(self, row: int, col: int) -> List[int]:
+        """Opens the cell at (row, col)
+
+        Returns the flat indices of the cells opened by the action
         """
-        if cell is None or cell.state != CellState.CLOSE:
-            return
+        opened = self._open_cell(row, col)
+        self._update_board_state()
+        self._notify_change(opened)
+        return opened
 
-        self._open_cell(cell)
+    def open_many(self, cells: Iterable[Tuple[int, int]]) -> BoardChanges:
+        """Opens every (row, col) of `cells`, stopping at the first mine
 
-        if cell.type != CellType.EMPTY:
-            return
+        The board state is updated and the listeners are notified once for
+        the whole batch
+        """
+        changes = BoardChanges()
+        for row, col in cells:
+            changes.opened += self._open_cell(row, col)
+            if self._mine_opened:
+                break
 
-        width, height = self._dimensions
-        for row in range(max(0, cell.row - 1), min(height, cell.row + 2)):
-            for col in range(max(0, cell.col - 1), min(width, cell.col + 2)):
-                _cell = self._grid[row][col]
-                self._open_and_expand_selection(_cell)
+        self._update_board_state()
+        self._notify_change(changes.opened)
+        changes.state = self._state
+        return changes
+
+    def chord(self, row: int, col: int) -> BoardChanges:
+        """Opens the unflagged neighbours of the number at (row, col)
 
-    def _open_cell(self, cell):
-        cell.open()
+        Nothing happens unless the cell is an opened number with as many
+        flags around it as its number
+        """
+        cell = self.cell(row, col)
+        if cell.state != CellState.OPEN or cell.type in (
+            CellType.EMPTY,
+            CellType.MINE,
+        ):
+            return BoardChanges(state=self._state)
 
-        if cell.type == CellType.MINE:
+        width, height = self._dimensions
+        neighbours = [
+            (neighbour_row, neighbour_col)
+            for neighbour_row in range(max(0, row - 1), min(height, row + 2))
+            for neighbour_col in range(max(0, col - 1), min(width, col + 2))
+            if neighbour_row != row or neighbour_col != col
+        ]
+        states = [self.cell(*neighbour).state for neighbour in neighbours]
+        if states.count(CellState.FLAG) != cell.type.value:
+            return BoardChanges(state=self._state)
+
+        return self.open_many(
+            neighbour
+            for neighbour, state in zip(neighbours, states)
+            if state == CellState.CLOSE
+        )
+
+    def _open_cell(self, row: int, col: int) -> List[int]:
+        """Opens the cell at (row, col) without updating the board state"""
+        index = self._storage.index(row, col)
+        if not self._is_generated:
+            self._place_mines(index)
+        return self._open_and_expand_selection(index)
+
+    def _open_and_expand_selection(self, index: int) -> List[int]:
+        """Opens the selected cell and expand the opened area if relevant"""
+        opened = open_region(self._storage, index)
+        if not opened:
+            return opened
+
+        # only the selected cell can be a mine, expansion stops at numbers
+        if self._storage.types[index] == MINE_CODE:
             self._mine_opened = True
+            self._opened_count += len(opened) - 1
         else:
-            self._opened_count += 1
+            self._opened_count += len(opened)
+
+        return opened
 
     def flag(self, row: int, col: int):
         """Toggles the flag on the cell at (row, col)"""
-        cell = self._grid[row][col]
+        if self._toggle_mark(row, col):
+            self._notify_change((row * self._dimensions[0] + col,))
+
+    def flag_many(self, cells: Iterable[Tuple[int, int]]) -> BoardChanges:
+        """Toggles the flag on every (row, col) of `cells`
+
+        The listeners are notified once for the whole batch
+        """
+        width = self._dimensions[0]
+        changes = BoardChanges(state=self._state)
+        for row, col in cells:
+            if self._toggle_mark(row, col):
+                changes.marked.append(row * width + col)
+
+        self._notify_change(changes.marked)
+        return changes
+
+    def _toggle_mark(self, row: int, col: int) -> bool:
+        """Toggles the flag on the cell at (row, col), returns True if it changed"""
+        cell = self._touch_cell(row, col)
         prev_state = cell.state
         cell.toggle_flag()
         curr_state = cell.state
@@ -182,6 +493,54 @@ class BoardModel:
         elif prev_state == CellState.FLAG:
             self._flagged_count -= 1
 
+        return prev_state != curr_state
+
+    def set_states(self, indices: Sequence[int], codes: bytes):
+        """Sets the state codes of the cells at `indices`, as undoing a move does
+
+        The counters are adjusted for the changed cells only, so the cost
+        follows the number of cells instead of the board size
+        """
+        states, types = self._storage.states, self._storage.types
+        for index, code in zip(indices, codes):
+            previous = states[index]
+            if previous == code:
+                continue
+            is_mine = types[index] == MINE_CODE
+
+            if previous == OPEN_CODE:
+                if is_mine:
+                    self._mine_opened = False
+                else:
+                    self._opened_count -= 1
+            elif previous == FLAG_CODE:
+                self._flagged_count -= 1
+
+            if code == OPEN_CODE:
+                if is_mine:
+                    self._mine_opened = True
+                else:
+                    self._opened_count += 1
+            elif code == FLAG_CODE:
+                self._flagged_count += 1
+
+            states[index] = code
+
+        self._state = BoardState.PLAYING
+        self._cleared_three_bv = None
+        self._update_board_state()
+        self._notify_change(indices)
+
+    def _touch_cell(self, row: int, col: int) -> Cell:
+        """Returns the cell at (row, col) for an action on it"""
+        return self.cell(row, col)
+
+    def _notify_change(self, indices: Sequence[int]):
+        if not indices:
+            return
+        for listener in self._change_listeners:
+            listener(indices)
+
     def _update_board_state(self):
         width, height = self._dimensions
         if self._mine_opened:
@@ -189,6 +548,12 @@ class BoardModel:
         elif self._opened_count == width * height - self._mines:
             self._state = BoardState.WON
 
+        if self._state != BoardState.PLAYING:
+            self._stopwatch.stop()
+        elif self._opened_count and not self._stopwatch.is_running:
+            # an undone ending move resumes the time of the game
+            self._stopwatch.resume()
+
     def _create_action_generator(self) -> Generator[None, None, BoardAction]:
         actions = [*BoardAction]
         actions_count = len(actions)
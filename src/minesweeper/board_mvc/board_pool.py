@@ -0,0 +1,81 @@
+import threading
+
+from collections import deque
+from typing import Deque, Dict, Optional, Sequence, Set, Tuple
+
+from .board_model import BoardModel
+
+
+# (width, height, mines)
+Config = Tuple[int, int, int]
+
+
+class BoardPool:
+    """Pregenerates the next boards of a configuration in a worker thread
+
+    `prepare` names the boards about to be played, by configuration and
+    seed, and drops every other board, so a configuration change discards
+    the stale ones. `take` hands over a ready board, or None when the worker
+    has not reached it yet and the caller builds the board itself. A board
+    is the same whether it comes from the pool or not, see
+    `BoardModel.pregenerate`
+    """
+
+    def __init__(self, board_factory=BoardModel):
+        self._board_factory = board_factory
+        self._condition = threading.Condition()
+        self._pending: Deque[Tuple[Config, int]] = deque()
+        self._ready: Dict[Tuple[Config, int], BoardModel] = {}
+        self._wanted: Set[Tuple[Config, int]] = set()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._work, name="board pool", daemon=True
+        )
+        self._thread.start()
+
+    def prepare(self, config: Config, seeds: Sequence[int]):
+        """Queues the boards of `config` with `seeds`, dropping any other board"""
+        wanted = [(config, seed) for seed in seeds]
+        with self._condition:
+            self._wanted = {*wanted}
+            self._ready = {
+                key: self._ready[key] for key in wanted if key in self._ready
+            }
+            self._pending = deque(key for key in wanted if key not in self._ready)
+            self._condition.notify()
+
+    def take(self, config: Config, seed: int) -> Optional[BoardModel]:
+        """Returns the ready board of `config` with `seed`, None if there is none"""
+        with self._condition:
+            return self._ready.pop((config, seed), None)
+
+    def close(self):
+        """Stops the worker, dropping the boards not taken"""
+        with self._condition:
+            self._closed = True
+            self._pending.clear()
+            self._ready.clear()
+            self._wanted.clear()
+            self._condition.notify()
+        self._thread.join()
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                key = self._pending.popleft()
+
+            (width, height, mines), seed = key
+            board = self._board_factory(width, height, mines, seed=seed)
+            board.pregenerate()
+
+            with self._condition:
+                # kept only if still wanted, a `prepare` during the build
+                # may have queued it again
+                if key in self._wanted:
+                    self._ready[key] = board
+                    if key in self._pending:
+                        self._pending.remove(key)
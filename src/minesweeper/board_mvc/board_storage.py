@@ -0,0 +1,57 @@
+from typing import List, Tuple
+
+
+# packed cell type codes, numbered cells use their mine count as the code
+EMPTY_CODE = 0
+MINE_CODE = 9
+UNINITIALIZED_CODE = 10
+
+# packed cell state codes
+CLOSE_CODE = 0
+OPEN_CODE = 1
+FLAG_CODE = 2
+NOT_SURE_CODE = 3
+
+# next state when toggling the flag of a cell, indexed by the current state code
+NEXT_MARK_CODE = bytes([FLAG_CODE, OPEN_CODE, NOT_SURE_CODE, CLOSE_CODE])
+
+
+class BoardStorage:
+    """Flat storage of the board cells
+
+    Cell types and states are kept as small integer codes in two `bytearray`
+    buffers, indexed by `row * width + col`
+    """
+
+    __slots__ = ("width", "height", "types", "states")
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.types = bytearray([UNINITIALIZED_CODE]) * (width * height)
+        self.states = bytearray(width * height)
+
+    @property
+    def size(self) -> int:
+        """Returns the number of cells in the storage"""
+        return self.width * self.height
+
+    def index(self, row: int, col: int) -> int:
+        """Returns the flat index of the cell at (row, col)"""
+        return row * self.width + col
+
+    def coordinates(self, index: int) -> Tuple[int, int]:
+        """Returns the (row, col) of the cell at the flat `index`"""
+        return divmod(index, self.width)
+
+    def neighbours(self, index: int) -> List[int]:
+        """Returns the flat indices of the cells around the cell at `index`"""
+        width = self.width
+        row, col = divmod(index, width)
+        cols = range(max(0, col - 1), min(width, col + 2))
+        return [
+            neighbour_row * width + neighbour_col
+            for neighbour_row in range(max(0, row - 1), min(self.height, row + 2))
+            for neighbour_col in cols
+            if neighbour_row != row or neighbour_col != col
+        ]
@@ -1,4 +1,11 @@
+import shutil
+
+from dataclasses import dataclass
+from typing import Iterable, Optional, Sequence, Set, Tuple
+
 from .. import assets, console_utils
+from ..score_board import Score
+from ..stopwatch import format_time
 from .board_model import BoardAction, BoardModel, BoardState
 from .cell import Cell, CellState, CellType
 
@@ -28,28 +35,59 @@ _BOARD_ACTION_TO_COLOR = {
 }
 
 
-def show_board_page(board: BoardModel):
-    """Shows the board and it's stats"""
+# screen lines kept free for the help bar, the grid spacers and the status
+_RESERVED_LINES = 8
+
+
+@dataclass(frozen=True)
+class Viewport:
+    """The part of the board shown on screen"""
+
+    top: int
+    left: int
+    rows: int
+    cols: int
+
+    def contains(self, row: int, col: int) -> bool:
+        """Returns True if (row, col) is shown in the viewport"""
+        return (
+            self.top <= row < self.top + self.rows
+            and self.left <= col < self.left + self.cols
+        )
+
+
+def show_board_page(
+    board: BoardModel,
+    viewport: Optional[Viewport] = None,
+    scores: Sequence[Score] = (),
+):
+    """Shows the board and it's stats
+
+    Only the cells inside `viewport` are shown, the whole board by default.
+    The `scores` of the board configuration are listed when the game is won
+    """
     match board.state:
         case BoardState.PLAYING:
-            _print_grid(board)
+            if viewport is None:
+                width, height = board.dimensions
+                viewport = Viewport(0, 0, height, width)
+            _print_grid(board, viewport)
         case BoardState.WON:
             console_utils.write_line(assets.WON_MESSAGE)
+            _print_scores(scores)
         case BoardState.LOST:
             console_utils.write_line(assets.LOST_MESSAGE)
 
-    _print_status(board.state, board.active_action, board.remaining_mines)
-
+    _print_status(board)
 
-def _print_grid(board: BoardModel):
-    width, height = board.dimensions
 
-    spacer = "--" * (width + 1) + "\n"
+def _print_grid(board: BoardModel, viewport: Viewport):
+    spacer = "--" * (viewport.cols + 1) + "\n"
     console_utils.write(spacer, flush=False)
-    for row in range(height):
+    for row in range(viewport.top, viewport.top + viewport.rows):
         line = "|"
-        for col in range(width):
-            cell = board.grid[row][col]
+        for col in range(viewport.left, viewport.left + viewport.cols):
+            cell = board.cell(row, col)
             is_active = row == board.active_row and col == board.active_col
             cell_visual = _generate_cell_visual(cell, board.active_action, is_active)
             line += f"{cell_visual} "
@@ -71,14 +109,174 @@ def _generate_cell_visual(cell: Cell, action: BoardAction, is_active_cell: bool)
     return visual
 
 
-def _print_status(state: BoardState, action: BoardAction, remaining_mines: int):
-    console_utils.write_line(
-        ", ".join(
-            [
-                f"State: {state.value}",
-                f"Action: {action.value}",
-                f"Mines: {remaining_mines}",
-                # f"Time: {self._stopwatch.time_format}"
-            ]
+def _print_scores(scores: Sequence[Score]):
+    if not scores:
+        return
+    console_utils.write_line("Best times:", flush=False)
+    for place, score in enumerate(scores, 1):
+        console_utils.write_line(
+            f"{place:>3}. {format_time(score.seconds)}", flush=False
         )
-    )
+
+
+def _print_status(board: BoardModel):
+    console_utils.write_line(_format_status(board))
+
+
+def _format_status(board: BoardModel):
+    status = [
+        f"State: {board.state.value}",
+        f"Action: {board.active_action.value}",
+        f"Mines: {board.remaining_mines}",
+        f"Time: {format_time(board.elapsed_time)}",
+    ]
+    three_bv_per_second = board.three_bv_per_second
+    if three_bv_per_second is not None:
+        status.append(f"3BV: {board.metrics.three_bv}")
+        status.append(f"3BV/s: {three_bv_per_second:.2f}")
+    return ", ".join(status)
+
+
+class BoardRenderer:
+    """Draws the board page, repainting only what changed since the last frame
+
+    The page is drawn below the cursor position saved by the game view.
+    Boards larger than the terminal are shown through a viewport that
+    follows the active cell.
+    Cells changed by the board model, the previous and current active cells
+    and the status line are rewritten in place, everything else is left on
+    screen from the previous frame. Once the game ended the page is redrawn
+    whenever its status line changes
+    """
+
+    # above this share of changed cells a full redraw is cheaper
+    _FULL_REDRAW_RATIO = 0.5
+
+    def __init__(self):
+        self._board: Optional[BoardModel] = None
+        self._is_valid = False
+        self._changed_cells: Set[int] = set()
+        self._viewport: Optional[Viewport] = None
+        self._drawn_state: Optional[BoardState] = None
+        self._drawn_active_cell: Optional[Tuple[int, int]] = None
+        self._drawn_action: Optional[BoardAction] = None
+        self._drawn_status: Optional[str] = None
+        self._scores: Sequence[Score] = ()
+
+    def invalidate(self):
+        """Forces the next frame to redraw the entire page"""
+        self._is_valid = False
+
+    def render(self, board: BoardModel, scores: Sequence[Score] = ()):
+        """Draws the page of `board`, with the best `scores` once it is won"""
+        scores = tuple(scores)
+        if scores != self._scores:
+            self._scores = scores
+            self._is_valid = False
+        if board is not self._board:
+            self._attach(board)
+
+        viewport = self._follow_active_cell(board)
+        if (
+            not self._is_valid
+            or viewport != self._viewport
+            or board.state != self._drawn_state
+            or len(self._changed_cells)
+            > viewport.rows * viewport.cols * self._FULL_REDRAW_RATIO
+        ):
+            self._viewport = viewport
+            self._redraw(board)
+        elif board.state == BoardState.PLAYING:
+            self._update(board)
+        elif _format_status(board) != self._drawn_status:
+            # the page of an ended game has no grid, it is redrawn whole
+            self._redraw(board)
+
+        self._changed_cells.clear()
+        console_utils.flush()
+
+    def _attach(self, board: BoardModel):
+        if self._board is not None:
+            self._board.remove_change_listener(self._changed_cells.update)
+        board.add_change_listener(self._changed_cells.update)
+        self._board = board
+        self._viewport = None
+        self._is_valid = False
+
+    def _follow_active_cell(self, board: BoardModel) -> Viewport:
+        """Returns the viewport, scrolled just enough to show the active cell"""
+        width, height = board.dimensions
+        columns, lines = shutil.get_terminal_size()
+        rows = max(1, min(height, lines - _RESERVED_LINES))
+        cols = max(1, min(width, (columns - 2) // 2))
+
+        top, left = 0, 0
+        if self._viewport is not None:
+            top, left = self._viewport.top, self._viewport.left
+        top = min(max(top, board.active_row - rows + 1), board.active_row)
+        left = min(max(left, board.active_col - cols + 1), board.active_col)
+        top = min(top, height - rows)
+        left = min(left, width - cols)
+
+        return Viewport(top, left, rows, cols)
+
+    def _redraw(self, board: BoardModel):
+        console_utils.restore_cursor_position()
+        console_utils.clear(console_utils.ANSIClear.CURSOR_DOWN)
+        show_board_page(board, self._viewport, self._scores)
+
+        self._is_valid = True
+        self._drawn_state = board.state
+        self._drawn_active_cell = (board.active_row, board.active_col)
+        self._drawn_action = board.active_action
+        self._drawn_status = _format_status(board)
+
+    def _update(self, board: BoardModel):
+        width = board.dimensions[0]
+        active_cell = (board.active_row, board.active_col)
+
+        dirty_cells = {divmod(index, width) for index in self._changed_cells}
+        if (
+            active_cell != self._drawn_active_cell
+            or board.active_action != self._drawn_action
+        ):
+            dirty_cells.add(self._drawn_active_cell)
+            dirty_cells.add(active_cell)
+        self._repaint_cells(board, dirty_cells, active_cell)
+        self._drawn_active_cell = active_cell
+        self._drawn_action = board.active_action
+
+        status = _format_status(board)
+        if status != self._drawn_status:
+            # the status line follows the top spacer, the grid rows and the bottom spacer
+            console_utils.restore_cursor_position()
+            console_utils.move_cursor(
+                console_utils.ANSIDirection.DOWN, self._viewport.rows + 2
+            )
+            console_utils.write(console_utils.ANSIClear.WHOLE_LINE.value, flush=False)
+            console_utils.write(status, flush=False)
+            self._drawn_status = status
+
+    def _repaint_cells(
+        self,
+        board: BoardModel,
+        cells: Iterable[Tuple[int, int]],
+        active_cell: Tuple[int, int],
+    ):
+        viewport = self._viewport
+        for row, col in cells:
+            if not viewport.contains(row, col):
+                continue
+
+            visual = _generate_cell_visual(
+                board.cell(row, col), board.active_action, (row, col) == active_cell
+            )
+            # rows start below the top spacer, cells follow the left border
+            console_utils.restore_cursor_position()
+            console_utils.move_cursor(
+                console_utils.ANSIDirection.DOWN, row - viewport.top + 1
+            )
+            console_utils.move_cursor(
+                console_utils.ANSIDirection.RIGHT, 2 * (col - viewport.left) + 1
+            )
+            console_utils.write(visual, flush=False)
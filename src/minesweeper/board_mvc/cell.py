@@ -1,5 +1,16 @@
 from enum import Enum, auto
-from typing import Generator
+from typing import Optional
+
+from .board_storage import (
+    CLOSE_CODE,
+    FLAG_CODE,
+    MINE_CODE,
+    NEXT_MARK_CODE,
+    NOT_SURE_CODE,
+    OPEN_CODE,
+    UNINITIALIZED_CODE,
+    BoardStorage,
+)
 
 
 class CellType(Enum):
@@ -27,16 +38,41 @@ class CellState(Enum):
     NOT_SURE = auto()
 
 
+_CODE_TO_CELL_TYPE = (
+    *(CellType(count) for count in range(9)),
+    CellType.MINE,
+    CellType.UNINITIALIZED,
+)
+_CELL_TYPE_TO_CODE = {
+    **{CellType(count): count for count in range(9)},
+    CellType.MINE: MINE_CODE,
+    CellType.UNINITIALIZED: UNINITIALIZED_CODE,
+}
+
+_CODE_TO_CELL_STATE = {
+    CLOSE_CODE: CellState.CLOSE,
+    OPEN_CODE: CellState.OPEN,
+    FLAG_CODE: CellState.FLAG,
+    NOT_SURE_CODE: CellState.NOT_SURE,
+}
+
+
 class Cell:
-    """A cell for minesweeper board"""
+    """A lightweight view of a cell stored in a `BoardStorage`
+
+    `index` locates the cell in the storage when (row, col) are relative to a
+    larger board than the storage, such as a chunk of a lazily generated board
+    """
+
+    __slots__ = ("_storage", "_row", "_col", "_index")
 
-    def __init__(self, row: int, col: int):
+    def __init__(
+        self, storage: BoardStorage, row: int, col: int, index: Optional[int] = None
+    ):
+        self._storage = storage
         self._row = row
         self._col = col
-        self._state = CellState.CLOSE
-        self.type = CellType.UNINITIALIZED
-
-        self._marks_generator = self._create_marks_generator()
+        self._index = storage.index(row, col) if index is None else index
 
     @property
     def row(self) -> int:
@@ -48,31 +84,37 @@ class Cell:
         """Returns the column that the cell is placed at relative to the `parent_table`"""
         return self._col
 
+    @property
+    def index(self) -> int:
+        """Returns the flat index of the cell in its storage"""
+        return self._index
+
+    @property
+    def type(self) -> CellType:
+        """Returns the type of the cell"""
+        return _CODE_TO_CELL_TYPE[self._storage.types[self._index]]
+
+    @type.setter
+    def type(self, cell_type: CellType):
+        self._storage.types[self._index] = _CELL_TYPE_TO_CODE[cell_type]
+
     @property
     def state(self) -> CellState:
         """Returns the state of the cell"""
-        return self._state
+        return _CODE_TO_CELL_STATE[self._storage.states[self._index]]
 
     @property
     def is_initialized(self) -> bool:
         """Returns True if cell is initialized else False"""
-        return self.type != CellType.UNINITIALIZED
+        return self._storage.types[self._index] != UNINITIALIZED_CODE
 
     def open(self):
         """Sets the state of the cell to opened if cell was closed"""
-        if self._state == CellState.CLOSE:
-            self._state = CellState.OPEN
+        states = self._storage.states
+        if states[self._index] == CLOSE_CODE:
+            states[self._index] = OPEN_CODE
 
     def toggle_flag(self):
         """Toggles the state of the cell to flag"""
-        if self._state == CellState.OPEN:
-            return
-        self._state = next(self._marks_generator)
-
-    def _create_marks_generator(self) -> Generator[None, None, CellState]:
-        marks = [CellState.FLAG, CellState.NOT_SURE, CellState.CLOSE]
-        marks_count = len(marks)
-        i = 0
-        while True:
-            yield marks[i]
-            i = (i + 1) % marks_count
+        states = self._storage.states
+        states[self._index] = NEXT_MARK_CODE[states[self._index]]
@@ -0,0 +1,203 @@
+import random
+
+from typing import Dict, List, Optional, Tuple
+
+from .board_generation import fill_cell_types
+from .board_model import BoardModel
+from .board_storage import EMPTY_CODE, MINE_CODE, BoardStorage
+from .cell import Cell
+from .flood_fill import open_region
+
+
+CHUNK_SIZE = 64
+
+# below this density empty regions percolate and a single flood fill could
+# walk the whole board
+MIN_DENSITY = 0.1
+
+ChunkKey = Tuple[int, int]
+
+# every cell of a chunk that was not generated yet is closed
+_CLOSED_CELL_STORAGE = BoardStorage(1, 1)
+
+
+class ChunkedBoardModel(BoardModel):
+    """Board generated lazily in `chunk_size` x `chunk_size` chunks
+
+    A chunk is generated from a seed derived from `(seed, chunk_row,
+    chunk_col)` the first time the cursor or a flood fill touches it, so
+    memory grows with the explored area instead of the board area and the
+    same seed always yields the same board.
+    Mines are spread with the density `mines / (width * height)`, clamped to
+    `MIN_DENSITY`, so `mines` reports the actual number of mines placed
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        mines: int,
+        seed: Optional[int] = None,
+        chunk_size: int = CHUNK_SIZE,
+    ):
+        self._chunk_size = chunk_size
+        self._density = max(MIN_DENSITY, mines / (width * height))
+        self._chunks: Dict[ChunkKey, BoardStorage] = {}
+        self._chunk_mines: Dict[ChunkKey, List[int]] = {}
+
+        super().__init__(width, height, mines, seed)
+        self._touch_cell(self._active_row, self._active_col)
+
+    @property
+    def generated_chunks(self) -> int:
+        """Returns the number of chunks generated so far"""
+        return len(self._chunks)
+
+    def cell(self, row: int, col: int) -> Cell:
+        chunk = self._chunks.get(self._chunk_key(row, col))
+        if chunk is None:
+            return Cell(_CLOSED_CELL_STORAGE, row, col, 0)
+        return Cell(chunk, row, col, self._local_index(chunk, row, col))
+
+    def offset_row(self, offset: int):
+        super().offset_row(offset)
+        self._touch_cell(self._active_row, self._active_col)
+
+    def offset_col(self, offset: int):
+        super().offset_col(offset)
+        self._touch_cell(self._active_row, self._active_col)
+
+    def _open_cell(self, row: int, col: int) -> List[int]:
+        width, height = self._dimensions
+        size = self._chunk_size
+        opened = []
+
+        pending = [(row, col)]
+        while pending:
+            row, col = pending.pop()
+            chunk = self._get_chunk(self._chunk_key(row, col))
+            region = open_region(chunk, self._local_index(chunk, row, col))
+            if not region:
+                continue
+
+            if chunk.types[region[0]] == MINE_CODE:
+                self._mine_opened = True
+                self._opened_count -= 1
+            self._opened_count += len(region)
+
+            chunk_row, chunk_col = row - row % size, col - col % size
+            last_row, last_col = chunk.height - 1, chunk.width - 1
+            for index in region:
+                local_row, local_col = divmod(index, chunk.width)
+                cell_row, cell_col = chunk_row + local_row, chunk_col + local_col
+                opened.append(cell_row * width + cell_col)
+
+                # empty cells on the chunk border expand into the next chunks
+                if chunk.types[index] != EMPTY_CODE or (
+                    0 < local_row < last_row and 0 < local_col < last_col
+                ):
+                    continue
+                for next_row in range(max(0, cell_row - 1), min(height, cell_row + 2)):
+                    for next_col in range(
+                        max(0, cell_col - 1), min(width, cell_col + 2)
+                    ):
+                        if (
+                            next_row // size != chunk_row // size
+                            or next_col // size != chunk_col // size
+                        ):
+                            pending.append((next_row, next_col))
+
+        return opened
+
+    def _initialize_grid(self):
+        width, height = self._dimensions
+        self._mines = self._count_mines(width, height)
+        self._is_generated = True
+
+    def _count_mines(self, width: int, height: int) -> int:
+        size = self._chunk_size
+        full_rows, last_rows = divmod(height, size)
+        full_cols, last_cols = divmod(width, size)
+
+        mines = 0
+        for chunk_rows, rows_count in ((size, full_rows), (last_rows, 1)):
+            for chunk_cols, cols_count in ((size, full_cols), (last_cols, 1)):
+                chunk_mines = self._mines_per_chunk(chunk_rows * chunk_cols)
+                mines += chunk_mines * rows_count * cols_count
+        return mines
+
+    def _mines_per_chunk(self, cells: int) -> int:
+        return round(self._density * cells)
+
+    def _touch_cell(self, row: int, col: int) -> Cell:
+        chunk = self._get_chunk(self._chunk_key(row, col))
+        return Cell(chunk, row, col, self._local_index(chunk, row, col))
+
+    def _chunk_key(self, row: int, col: int) -> ChunkKey:
+        return row // self._chunk_size, col // self._chunk_size
+
+    def _local_index(self, chunk: BoardStorage, row: int, col: int) -> int:
+        return (row % self._chunk_size) * chunk.width + col % self._chunk_size
+
+    def _chunk_shape(self, key: ChunkKey) -> Tuple[int, int]:
+        """Returns the (rows, cols) of the chunk, edge chunks may be smaller"""
+        width, height = self._dimensions
+        size = self._chunk_size
+        return (
+            min(size, height - key[0] * size),
+            min(size, width - key[1] * size),
+        )
+
+    def _is_chunk_in_board(self, key: ChunkKey) -> bool:
+        width, height = self._dimensions
+        return (
+            0 <= key[0] * self._chunk_size < height
+            and 0 <= key[1] * self._chunk_size < width
+        )
+
+    def _get_mines(self, key: ChunkKey) -> List[int]:
+        """Returns the local indices of the mines of a chunk"""
+        mines = self._chunk_mines.get(key)
+        if mines is None:
+            rows, cols = self._chunk_shape(key)
+            rng = random.Random(f"{self._seed}:{key[0]}:{key[1]}")
+            mines = rng.sample(range(rows * cols), self._mines_per_chunk(rows * cols))
+            self._chunk_mines[key] = mines
+        return mines
+
+    def _get_chunk(self, key: ChunkKey) -> BoardStorage:
+        chunk = self._chunks.get(key)
+        if chunk is None:
+            chunk = self._generate_chunk(key)
+            self._chunks[key] = chunk
+        return chunk
+
+    def _generate_chunk(self, key: ChunkKey) -> BoardStorage:
+        """Numbers the chunk using its mines and the mines of its neighbours"""
+        rows, cols = self._chunk_shape(key)
+        size = self._chunk_size
+
+        # the chunk with a one cell border taken from the neighbouring chunks
+        padded = BoardStorage(cols + 2, rows + 2)
+        mine_indices = []
+        for row_offset in (-1, 0, 1):
+            for col_offset in (-1, 0, 1):
+                neighbour = (key[0] + row_offset, key[1] + col_offset)
+                if not self._is_chunk_in_board(neighbour):
+                    continue
+
+                neighbour_cols = self._chunk_shape(neighbour)[1]
+                for index in self._get_mines(neighbour):
+                    row, col = divmod(index, neighbour_cols)
+                    row += row_offset * size + 1
+                    col += col_offset * size + 1
+                    if 0 <= row < rows + 2 and 0 <= col < cols + 2:
+                        mine_indices.append(row * (cols + 2) + col)
+        fill_cell_types(padded, mine_indices)
+
+        chunk = BoardStorage(cols, rows)
+        chunk.types[:] = b"".join(
+            padded.types[row * (cols + 2) + 1 : row * (cols + 2) + 1 + cols]
+            for row in range(1, rows + 1)
+        )
+        return chunk
@@ -0,0 +1,60 @@
+from typing import List
+
+from .board_storage import CLOSE_CODE, EMPTY_CODE, OPEN_CODE, BoardStorage
+
+
+def open_region(storage: BoardStorage, start: int) -> List[int]:
+    """Opens the cell at the flat index `start` and expands empty regions
+
+    The region is walked scan-line style with an explicit stack of row runs
+    of empty cells, so its size is not bounded by the recursion limit and
+    every revealed cell is opened once.
+    Returns the flat indices of the opened cells, in opening order
+    """
+    states = storage.states
+    types = storage.types
+    width = storage.width
+    size = len(states)
+
+    if states[start] != CLOSE_CODE:
+        return []
+
+    states[start] = OPEN_CODE
+    opened = [start]
+    if types[start] != EMPTY_CODE:
+        return opened
+
+    # inclusive (first, last) runs of opened empty cells within a single row
+    pending = [(start, start)]
+    while pending:
+        first, last = pending.pop()
+        row_first = first - first % width
+        segment_start = first - 1 if first > row_first else first
+        segment_stop = last + 2 if last < row_first + width - 1 else last + 1
+
+        for row_offset in (-width, 0, width):
+            lo = segment_start + row_offset
+            if lo < 0 or lo >= size:
+                continue
+            hi = segment_stop + row_offset
+
+            run_first = run_last = -2
+            index = states.find(CLOSE_CODE, lo, hi)
+            while index != -1:
+                states[index] = OPEN_CODE
+                opened.append(index)
+
+                if types[index] == EMPTY_CODE:
+                    if index == run_last + 1:
+                        run_last = index
+                    else:
+                        if run_first >= 0:
+                            pending.append((run_first, run_last))
+                        run_first = run_last = index
+
+                index = states.find(CLOSE_CODE, index + 1, hi)
+
+            if run_first >= 0:
+                pending.append((run_first, run_last))
+
+    return opened
@@ -0,0 +1,38 @@
+from typing import Iterable
+
+from .board_storage import CLOSE_CODE, FLAG_CODE, NOT_SURE_CODE, OPEN_CODE, BoardStorage
+
+
+# what a player sees of a cell, as a single ASCII character: "." closed,
+# "F" flagged, "?" unsure, "0"-"8" and "*" for opened numbers and mines
+_STATE_VISUALS = {CLOSE_CODE: ".", FLAG_CODE: "F", NOT_SURE_CODE: "?"}
+_TYPE_VISUALS = "012345678*"
+
+# maps `state << 4 | type` to the visible code of a cell
+VISIBLE_CODES = bytes(
+    ord(
+        _TYPE_VISUALS[code & 0xF]
+        if code >> 4 == OPEN_CODE and (code & 0xF) < len(_TYPE_VISUALS)
+        else _STATE_VISUALS.get(code >> 4, ".")
+    )
+    for code in range(256)
+)
+
+
+def encode_cells(storage: BoardStorage, indices: Iterable[int]) -> bytes:
+    """Returns the visible codes of the cells at the flat `indices`"""
+    types, states = storage.types, storage.states
+    return bytes(VISIBLE_CODES[states[index] << 4 | types[index]] for index in indices)
+
+
+def visible_cells(storage: BoardStorage) -> bytes:
+    """Returns the visible code of every cell
+
+    States and types are combined in byte lanes of one big integer, states
+    are below 16 so shifting them by four bits never carries into the next
+    lane
+    """
+    combined = (int.from_bytes(storage.states, "little") << 4) | int.from_bytes(
+        storage.types, "little"
+    )
+    return combined.to_bytes(storage.size, "little").translate(VISIBLE_CODES)
@@ -1,18 +1,27 @@
 from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, Literal, Tuple, Union
-
+from typing import Dict, Literal, Optional, Tuple, Union
 
 IntOnlyOne = Union[Literal[1], Literal[0], Literal[-1]]
 
 DEFAULT_GRID_SIZE = 10
-MAX_GRID_SIZE = 50
+MAX_GRID_SIZE = 3000
 MIN_GRID_SIZE = 5
 
 DEFAULT_MINES = 10
-MAX_MINES = 99
+MAX_MINES = MAX_GRID_SIZE * MAX_GRID_SIZE - 1
 MIN_MINES = 5
 
+# (name, share of the cells that are mines) of the classic difficulties
+DENSITY_PRESETS = (
+    ("Beginner", 10 / 81),
+    ("Intermediate", 40 / 256),
+    ("Expert", 99 / 480),
+)
+
+# share of the value a fast step moves by, so large ranges take few presses
+_FAST_STEP = 0.25
+
 
 class ConfigurationField(Enum):
     """Configuration fields"""
@@ -51,6 +60,8 @@ class ConfigurationModel:
         }
 
         self._is_saved = True
+        self._entry = ""
+        self._preset_index = -1
 
         self._active_field: Field = None
         self._active_field_index = 0
@@ -71,6 +82,11 @@ class ConfigurationModel:
         """Returns if the current config was saved from the last edit"""
         return self._is_saved
 
+    @property
+    def entry(self) -> Optional[str]:
+        """Returns the digits typed for the active field, None if there are none"""
+        return self._entry or None
+
     def get_configuration(self) -> Tuple[int, int, int]:
         """Returns the current configuration `(width, height, mines)`"""
         self._is_saved = True
@@ -78,12 +94,20 @@ class ConfigurationModel:
         height = self._fields[ConfigurationField.HEIGHT].value
         mines = self._fields[ConfigurationField.MINES].value
         return width, height, mines
-    
+
     def set_configuration(self, width: int, height: int, mines: int):
-        """Sets the model configuration to specific values"""
+        """Sets the model configuration to specific values, clamped to the ranges
+
+        Chunked boards can be larger than the page offers, their values
+        show at the largest the page can set
+        """
         self._fields[ConfigurationField.WIDTH].value = width
         self._fields[ConfigurationField.HEIGHT].value = height
         self._fields[ConfigurationField.MINES].value = mines
+        self._increment_field(self._fields[ConfigurationField.WIDTH], 0)
+        self._increment_field(self._fields[ConfigurationField.HEIGHT], 0)
+        self._set_mines_max_value()
+        self._increment_field(self._fields[ConfigurationField.MINES], 0)
 
     def change_active_field(self, direction: IntOnlyOne):
         """Change the active field being edited
@@ -91,13 +115,53 @@ class ConfigurationModel:
         If `direction == 1` move to the next field.
         If `direction == -1` move to the previous field
         """
+        self._entry = ""
         self._active_field_index += direction
         self._active_field_index %= len(self._fields.keys())
         self._active_field = [*self._fields.values()][self._active_field_index]
 
     def change_field(self, offset: int):
         """Changes the value of the active field by `offset`"""
-        self._increment_field(self._active_field, offset)
+        self._set_field(self._active_field, self._active_field.value + offset)
+
+    def change_field_fast(self, direction: IntOnlyOne):
+        """Changes the value of the active field by a share of it
+
+        Steps grow with the value, so crossing a range of thousands takes
+        a few dozen presses
+        """
+        field = self._active_field
+        step = max(1, round(field.value * _FAST_STEP))
+        self._set_field(field, field.value + direction * step)
+
+    def type_digit(self, digit: int):
+        """Appends a digit to the value typed for the active field"""
+        if len(self._entry) < len(str(self._active_field.max)):
+            self._entry = (self._entry + str(digit)).lstrip("0")
+
+    def erase_digit(self):
+        """Removes the last digit typed for the active field"""
+        self._entry = self._entry[:-1]
+
+    def apply_entry(self):
+        """Sets the active field to the typed value, clamped to its range"""
+        if self._entry:
+            self._set_field(self._active_field, int(self._entry))
+        self._entry = ""
+
+    def apply_density_preset(self):
+        """Sets the mines from the next density preset and the board area"""
+        self._preset_index = (self._preset_index + 1) % len(DENSITY_PRESETS)
+        _, density = DENSITY_PRESETS[self._preset_index]
+        width = self._fields[ConfigurationField.WIDTH].value
+        height = self._fields[ConfigurationField.HEIGHT].value
+        self._set_field(
+            self._fields[ConfigurationField.MINES], round(density * width * height)
+        )
+
+    def _set_field(self, field: Field, value: int):
+        field.value = value
+        self._increment_field(field, 0)
         self._set_mines_max_value()
         self._increment_field(self._fields[ConfigurationField.MINES], 0)
         self._is_saved = False
@@ -107,7 +171,8 @@ class ConfigurationModel:
         width_field = self._fields[ConfigurationField.WIDTH]
         height_field = self._fields[ConfigurationField.HEIGHT]
 
-        max_mines_possible = int(width_field.value * height_field.value)
+        # a cell is kept free of mines for the first open
+        max_mines_possible = width_field.value * height_field.value - 1
         max_mines_allowed = min(MAX_MINES, max_mines_possible)
         mines_field.max = max_mines_allowed
 
@@ -1,3 +1,5 @@
+import functools
+
 from typing import Callable, Optional, Tuple
 
 from .configuraion_model import ConfigurationModel
@@ -31,6 +33,49 @@ class ConfigurationController:
                 operation="dec",
                 callback=lambda: self._configuration.change_field(-1),
             ),
+            b"D": UserAction(
+                key_visual="D",
+                operation="inc fast",
+                callback=lambda: self._configuration.change_field_fast(1),
+            ),
+            b"A": UserAction(
+                key_visual="A",
+                operation="dec fast",
+                callback=lambda: self._configuration.change_field_fast(-1),
+            ),
+            **{
+                str(digit).encode(): UserAction(
+                    key_visual="0-9",
+                    operation="type value",
+                    callback=functools.partial(self._configuration.type_digit, digit),
+                )
+                for digit in range(10)
+            },
+            b"\n": UserAction(
+                key_visual="enter",
+                operation="set value",
+                callback=self._configuration.apply_entry,
+            ),
+            b"\r": UserAction(
+                key_visual="enter",
+                operation="set value",
+                callback=self._configuration.apply_entry,
+            ),
+            b"\x7f": UserAction(
+                key_visual="backspace",
+                operation="erase digit",
+                callback=self._configuration.erase_digit,
+            ),
+            b"\x08": UserAction(
+                key_visual="backspace",
+                operation="erase digit",
+                callback=self._configuration.erase_digit,
+            ),
+            b"p": UserAction(
+                key_visual="p",
+                operation="mines preset",
+                callback=self._configuration.apply_density_preset,
+            ),
             b"\x20": UserAction(
                 key_visual="space",
                 operation="save configuration",
@@ -59,7 +104,12 @@ class ConfigurationController:
 
         return handled
 
+    def invalidate(self):
+        """The configuration page is small and redrawn entirely on every run"""
+
     def _handle_get_config_cb(self):
+        # a typed value is saved without pressing enter first
+        self._configuration.apply_entry()
         if self._get_config_cb:
             self._get_config_cb(self._configuration.get_configuration())
 
@@ -1,46 +1,66 @@
-from .. import console_utils
-from .configuraion_model import (
-    MAX_GRID_SIZE,
-    MAX_MINES,
-    ConfigurationField,
-    ConfigurationModel,
-)
-
+import math
 
-_FIELD_TYPE_MULTIPLIER_MAP = {
-    ConfigurationField.WIDTH: round(MAX_MINES / MAX_GRID_SIZE),
-    ConfigurationField.HEIGHT: round(MAX_MINES / MAX_GRID_SIZE),
-    ConfigurationField.MINES: 1,
-}
+from .. import console_utils
+from .configuraion_model import ConfigurationField, ConfigurationModel
 
+# characters between the brackets of a bar, whatever the range of its field
+_BAR_WIDTH = 40
 
 _PRE_VALUE_BAR_FILLER = "-"
 _POST_VALUE_BAR_FILLER = " "
 
 
 def show_configuration_page(config: ConfigurationModel):
+    console_utils.restore_cursor_position()
+    console_utils.clear(console_utils.ANSIClear.CURSOR_DOWN)
     _show_save_status(config.is_saved)
-    for field in config.fields.values():
+    fields = config.fields
+    area = (
+        fields[ConfigurationField.WIDTH].value * fields[ConfigurationField.HEIGHT].value
+    )
+    for field in fields.values():
         is_active = field is config.active_field
-        _show_field_bar(field.type, field.value, field.min, field.max, is_active)
+        text = f"{field.value:02d}"
+        if is_active and config.entry is not None:
+            text = f"{config.entry}_"
+        if field.type == ConfigurationField.MINES:
+            text += f" ({field.value / area:.1%})"
+        _show_field_bar(field.type, text, field.value, field.min, field.max, is_active)
+
+
+def _bar_position(value: int, _min: int, _max: int) -> int:
+    """Returns the bar characters before the value
+
+    The bar is logarithmic, so small values stay apart on ranges of
+    thousands
+    """
+    if _max <= _min:
+        return 0
+    share = math.log(value / _min) / math.log(_max / _min)
+    return round(min(max(share, 0.0), 1.0) * _BAR_WIDTH)
 
 
 def _show_field_bar(
-    _type: ConfigurationField, value: int, _min: int, _max: int, is_active: bool
+    _type: ConfigurationField,
+    text: str,
+    value: int,
+    _min: int,
+    _max: int,
+    is_active: bool,
 ):
-    bar_value = f"{value:02d}"
+    bar_value = text
     if is_active:
         bar_value = console_utils.apply_graphic(
             bar_value, console_utils.ANSIGraphicsMode.RED
         )
-    space_multiplier = _FIELD_TYPE_MULTIPLIER_MAP[_type]
+    position = _bar_position(value, _min, _max)
     s = (
         f"{_type.value:>10}: "
         + f"({_min}) "
         + "["
-        + _PRE_VALUE_BAR_FILLER * space_multiplier * (value - _min)
+        + _PRE_VALUE_BAR_FILLER * position
         + bar_value
-        + _POST_VALUE_BAR_FILLER * space_multiplier * (_max - value)
+        + _POST_VALUE_BAR_FILLER * (_BAR_WIDTH - position)
         + "]"
         + f"({_max})"
     )
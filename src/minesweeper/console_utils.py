@@ -1,4 +1,6 @@
+from contextlib import contextmanager
 from enum import Enum
+from typing import Iterator, List, Optional
 import sys
 
 
@@ -37,15 +39,84 @@ class ANSIClear(Enum):
 class ANSICursor(Enum):
     INVISIBLE = "\033[?25l"
     VISIBLE = "\033[?25h"
+    SAVE_POSITION = "\0337"
+    RESTORE_POSITION = "\0338"
+
+
+# parts of the frame being composed, None when writing straight to stdout
+_frame_parts: Optional[List[str]] = None
+
+# headless runs drop everything written
+_output_enabled = True
+
+
+def configure_output():
+    """Configures stdout for the game, called once at startup"""
+    sys.stdout.reconfigure(encoding="utf-8")
+
+
+def set_output_enabled(enabled: bool):
+    """Enables or disables every write to the terminal"""
+    global _output_enabled  # pylint: disable=global-statement
+    _output_enabled = enabled
+
+
+@contextmanager
+def frame() -> Iterator[None]:
+    """Collects everything written inside the block into a single frame
+
+    The frame, escape sequences included, is flushed with one write when the
+    block exits. Nested frames are merged into the outermost one
+    """
+    global _frame_parts  # pylint: disable=global-statement
+
+    if _frame_parts is not None:
+        yield
+        return
+
+    _frame_parts = []
+    try:
+        yield
+    finally:
+        text = "".join(_frame_parts)
+        _frame_parts = None
+        _write_frame(text)
+
+
+def _write_frame(text: str):
+    if not text:
+        return
+
+    sys.stdout.flush()
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        sys.stdout.write(text)
+        sys.stdout.flush()
+        return
+
+    buffer.write(text.encode(sys.stdout.encoding or "utf-8", "replace"))
+    buffer.flush()
 
 
 def write(text: str, flush=True):
+    if not _output_enabled:
+        return
+
+    if _frame_parts is not None:
+        _frame_parts.append(text)
+        return
+
     sys.stdout.write(text)
 
     if flush:
         sys.stdout.flush()
 
 
+def flush():
+    if _frame_parts is None:
+        sys.stdout.flush()
+
+
 def set_cursor_visibility(visible: bool):
     visibility_type = ANSICursor.VISIBLE if visible else ANSICursor.INVISIBLE
     write(visibility_type.value)
@@ -60,7 +131,6 @@ def apply_graphic(text: str, graphic: ANSIGraphicsMode):
 
 
 def clear(direction: ANSIClear):
-    sys.stdout.reconfigure(encoding="utf-8")
     write(direction.value)
 
 
@@ -70,3 +140,16 @@ def write_line(text: str, flush=True):
 
 def move_cursor_to(direction: ANSIDirection):
     write(direction.value)
+
+
+def move_cursor(direction: ANSIDirection, count: int):
+    if count > 0:
+        write(direction.value.format(count), flush=False)
+
+
+def save_cursor_position():
+    write(ANSICursor.SAVE_POSITION.value, flush=False)
+
+
+def restore_cursor_position():
+    write(ANSICursor.RESTORE_POSITION.value, flush=False)
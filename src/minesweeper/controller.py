@@ -1,8 +1,11 @@
 from typing import Optional, Protocol
 
 
-class Controller(Protocol):  # pylint: disable=too-few-public-methods
+class Controller(Protocol):
     """MCV Controller protocol"""
 
     def run(self, char: Optional[bytes]) -> bool:
         """Runs the controller"""
+
+    def invalidate(self):
+        """Forces the next run to redraw the entire page"""
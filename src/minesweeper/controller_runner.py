@@ -1,24 +1,65 @@
-import msvcrt
 import time
 
+from typing import Callable, Optional
+
+from . import console_utils
 from .controller import Controller
+from .input_backend import KeyReader, create_key_reader
+from .input_log import InputLogWriter
 
 
 class ControllerRunner:
     """MVC Controller runner class
-    
-    Handles input reading
+
+    Handles input reading. The controller runs once per key press, and once
+    every `tick_interval` seconds while `is_timing` returns True, never while
+    idle. Without `is_timing` the ticks never stop. Keys and ticks are
+    appended to `input_log` when one is given
     """
-    def __init__(self, controller: Controller):
+
+    def __init__(
+        self,
+        controller: Controller,
+        key_reader: Optional[KeyReader] = None,
+        tick_interval: Optional[float] = None,
+        input_log: Optional[InputLogWriter] = None,
+        is_timing: Optional[Callable[[], bool]] = None,
+    ):
         self._controller = controller
+        self._key_reader = key_reader if key_reader is not None else create_key_reader()
+        self._tick_interval = tick_interval
+        self._input_log = input_log
+        self._is_timing = is_timing
 
     def run(self):
-        inp = None
-        while True:
-            if msvcrt.kbhit():
-                inp = msvcrt.getch()
-            else:
-                inp = None
-                time.sleep(0.05)
+        with self._key_reader:
+            self._run_frame(None)
+
+            next_tick = None
+            while True:
+                if not self._wants_ticks():
+                    next_tick = None
+                elif next_tick is None:
+                    next_tick = time.monotonic() + self._tick_interval
 
+                timeout = None
+                if next_tick is not None:
+                    timeout = max(0.0, next_tick - time.monotonic())
+
+                inp = self._key_reader.read_key(timeout)
+                if inp is None:
+                    # the tick is due, the next one is scheduled from now
+                    next_tick = None
+                if self._input_log is not None:
+                    self._input_log.record(inp)
+
+                self._run_frame(inp)
+
+    def _run_frame(self, inp: Optional[bytes]):
+        with console_utils.frame():
             self._controller.run(inp)
+
+    def _wants_ticks(self) -> bool:
+        if self._tick_interval is None:
+            return False
+        return self._is_timing is None or self._is_timing()
@@ -0,0 +1,159 @@
+import argparse
+import itertools
+import json
+import os
+import random
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+from .board_mvc.board_metrics import BoardMetrics, compute_metrics
+from .board_mvc.board_model import BoardModel
+from .no_guess import first_cell
+
+
+Configuration = Tuple[int, int, int]
+
+# batches per worker process, more batches balance uneven boards better
+_BATCHES_PER_PROCESS = 4
+
+
+@dataclass(frozen=True)
+class ScoredBoard:
+    """Metrics of the board of `seed` opened first at the flat index `first`"""
+
+    seed: int
+    first: int
+    metrics: BoardMetrics
+
+
+def score_board(config: Configuration, seed: int, first: int) -> BoardMetrics:
+    """Returns the metrics of the board of `seed` opened first at `first`"""
+    width, height, mines = config
+    board = BoardModel(width, height, mines, seed)
+    board.generate(*divmod(first, width))
+    return compute_metrics(board.storage)
+
+
+def _score_batch(
+    config: Configuration, seeds: Sequence[int], first: int
+) -> List[BoardMetrics]:
+    return [score_board(config, seed, first) for seed in seeds]
+
+
+def score_boards(
+    config: Configuration,
+    count: int,
+    first: Optional[int] = None,
+    processes: Optional[int] = None,
+    seed: Optional[int] = None,
+) -> List[ScoredBoard]:
+    """Generates and scores `count` boards over a pool of `processes` workers
+
+    Boards are opened first at `first`, the cell no-guess boards are opened
+    from by default
+    """
+    width, height, _ = config
+    first = first if first is not None else first_cell(width, height)
+    processes = processes or os.cpu_count() or 1
+    rng = random.Random(seed)
+    seeds = [rng.getrandbits(64) for _ in range(count)]
+
+    batch_size = -(-count // (processes * _BATCHES_PER_PROCESS)) or 1
+    batches = [
+        seeds[start : start + batch_size] for start in range(0, count, batch_size)
+    ]
+    if processes == 1:
+        results = [_score_batch(config, batch, first) for batch in batches]
+    else:
+        with ProcessPoolExecutor(processes) as executor:
+            results = list(
+                executor.map(
+                    _score_batch,
+                    [config] * len(batches),
+                    batches,
+                    [first] * len(batches),
+                )
+            )
+
+    return [
+        ScoredBoard(board_seed, first, metrics)
+        for board_seed, metrics in zip(seeds, itertools.chain.from_iterable(results))
+    ]
+
+
+def difficulty_buckets(boards: Sequence[ScoredBoard], buckets: int) -> List[int]:
+    """Returns the 3BV bounds splitting `boards` into `buckets` equal groups
+
+    Bucket `i` holds the boards with a 3BV below bound `i` and at least
+    bound `i - 1`
+    """
+    values = sorted(board.metrics.three_bv for board in boards)
+    if not values:
+        return []
+    return [
+        values[min(len(values) - 1, len(values) * bucket // buckets)]
+        for bucket in range(1, buckets)
+    ] + [values[-1] + 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="minesweeper-difficulty",
+        description="Score random boards by their 3BV",
+    )
+    parser.add_argument("--boards", type=int, default=10_000)
+    parser.add_argument("--width", type=int, default=30)
+    parser.add_argument("--height", type=int, default=16)
+    parser.add_argument("--mines", type=int, default=99)
+    parser.add_argument("--buckets", type=int, default=3)
+    parser.add_argument(
+        "--processes", type=int, default=None, help="defaults to the number of CPUs"
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--json", metavar="PATH", default=None, help="write every scored board to PATH"
+    )
+    args = parser.parse_args()
+
+    config = (args.width, args.height, args.mines)
+    start = time.perf_counter()
+    boards = score_boards(config, args.boards, None, args.processes, args.seed)
+    elapsed = time.perf_counter() - start
+
+    values = [board.metrics.three_bv for board in boards]
+    print(
+        f"{len(boards)} boards of {args.width}x{args.height} with {args.mines} "
+        f"mines in {elapsed:.3f}s, {len(boards) / elapsed:.1f} boards/s"
+    )
+    if values:
+        print(
+            f"3BV: min {min(values)}, mean {sum(values) / len(values):.1f}, "
+            f"max {max(values)}"
+        )
+    low = min(values, default=0)
+    for bucket, bound in enumerate(difficulty_buckets(boards, args.buckets), 1):
+        print(f"{bucket:>3}. 3BV {low} to {bound - 1}")
+        low = bound
+
+    if args.json is not None:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(
+                [
+                    {
+                        "seed": board.seed,
+                        "first": board.first,
+                        "openings": board.metrics.openings,
+                        "isolated_numbers": board.metrics.isolated_numbers,
+                        "three_bv": board.metrics.three_bv,
+                    }
+                    for board in boards
+                ],
+                file,
+            )
+
+
+if __name__ == "__main__":
+    main()
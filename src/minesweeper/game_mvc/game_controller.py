@@ -1,26 +1,37 @@
 from typing import Optional, Tuple
 from ..board_mvc import BoardController
+from ..board_mvc.board_controller import DEFAULT_CONFIG, BoardFactory, BoardListener
+from ..board_mvc.board_model import BoardModel
+from ..board_mvc.board_pool import BoardPool
 from ..configurations_mvc import ConfigurationController
 from ..controller import Controller
+from ..score_board import ScoreBoard
 from ..user_action import UserAction
 from .game_view import show_game_help_bar
 
 
-_DEFAULT_CONFIG = (10, 10, 10)
-
-
 class GameController:
-    def __init__(self):
-        self._config = _DEFAULT_CONFIG
+    def __init__(
+        self,
+        config: Tuple[int, int, int] = DEFAULT_CONFIG,
+        board_factory: BoardFactory = BoardModel,
+        seed: Optional[int] = None,
+        score_board: Optional[ScoreBoard] = None,
+        board_pool: Optional[BoardPool] = None,
+    ):
+        self._config = config
         self._config_updated = False
 
         self._config_controller = ConfigurationController(self._update_config)
-        self._config_controller.set_current_config(*_DEFAULT_CONFIG)
+        self._config_controller.set_current_config(*config)
 
-        self._board_controller = BoardController()
-        self._board_controller.create_new_board(*_DEFAULT_CONFIG)
+        self._board_controller = BoardController(
+            config, board_factory, seed, score_board, board_pool
+        )
 
         self._active_controller = self._board_controller
+        self._shown_controller = None
+        self._shown_help_message = None
 
         self._key_action_map = {
             b"o": UserAction(
@@ -31,6 +42,22 @@ class GameController:
             b"\x1b": UserAction(key_visual="Esc", operation="exit", callback=exit),
         }
 
+    @property
+    def board(self) -> BoardModel:
+        """Returns the board being played"""
+        return self._board_controller.board
+
+    @property
+    def is_timing(self) -> bool:
+        """Returns True while the game time shown on the board runs"""
+        return (
+            self._active_controller is self._board_controller and self.board.is_timing
+        )
+
+    def add_board_listener(self, listener: BoardListener):
+        """Registers `listener` to be called with every new board"""
+        self._board_controller.add_board_listener(listener)
+
     @property
     def help_message(self) -> str:
         """Returns the help message"""
@@ -43,11 +70,11 @@ class GameController:
 
     def run(self, char: Optional[bytes] = None) -> bool:
         """Runs the current controller"""
-        show_game_help_bar(self.help_message)
-
         if self._config_updated:
             self._handle_new_config()
 
+        self._show_help_bar()
+
         handled = self._active_controller.run(char)
 
         action = self._key_action_map.get(char, None)
@@ -55,8 +82,28 @@ class GameController:
             action.callback()
             handled = True
 
+        if self._config_updated:
+            self.run()
+
         return handled
 
+    def invalidate(self):
+        """Forces the next run to redraw the entire screen"""
+        self._shown_controller = None
+
+    def _show_help_bar(self):
+        help_message = self.help_message
+        if (
+            self._active_controller is self._shown_controller
+            and help_message == self._shown_help_message
+        ):
+            return
+
+        show_game_help_bar(help_message)
+        self._active_controller.invalidate()
+        self._shown_controller = self._active_controller
+        self._shown_help_message = help_message
+
     def _handle_new_config(self):
         self._config_updated = False
         self._board_controller.create_new_board(*self._config)
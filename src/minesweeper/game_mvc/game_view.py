@@ -2,6 +2,11 @@ from .. import console_utils
 
 
 def show_game_help_bar(help_message: str):
+    """Clears the screen and shows the help bar
+
+    The cursor position below the help bar is saved as the origin of the page
+    """
     console_utils.move_cursor_to(console_utils.ANSIDirection.HOME)
     console_utils.clear(console_utils.ANSIClear.CURSOR_DOWN)
     console_utils.write_line(help_message)
+    console_utils.save_cursor_position()
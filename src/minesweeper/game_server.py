@@ -0,0 +1,354 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Tuple
+
+from .board_mvc.board_model import BoardChanges, BoardModel
+from .board_mvc.visible_codes import encode_cells, visible_cells
+
+
+Request = Dict[str, Any]
+Response = Dict[str, Any]
+
+# upper bound of a request line, bounds the memory of a connection
+_MAX_LINE = 1 << 20
+
+# seconds between sweeps of the idle sessions
+_SWEEP_INTERVAL = 5.0
+
+# cells of all the sessions together, a board takes about 2 bytes per cell
+# so they fit in about 128 MB
+MAX_TOTAL_CELLS = 64_000_000
+
+
+class RequestError(Exception):
+    """A request the server cannot serve"""
+
+
+@dataclass
+class ServerStats:
+    """Totals since the server started"""
+
+    started: float
+    sessions: int = 0
+    moves: int = 0
+    evicted: int = 0
+
+    def to_dict(self, active_sessions: int) -> Dict[str, Any]:
+        """Returns the totals and rates as a JSON serializable dictionary"""
+        elapsed = time.monotonic() - self.started
+        return {
+            "active_sessions": active_sessions,
+            "sessions": self.sessions,
+            "moves": self.moves,
+            "evicted": self.evicted,
+            "uptime": elapsed,
+            "sessions_per_second": self.sessions / elapsed if elapsed else 0.0,
+            "moves_per_second": self.moves / elapsed if elapsed else 0.0,
+        }
+
+
+class GameServer:
+    """Hosts many independent boards driven by JSON requests
+
+    A request is an object with an `op` and the fields of that operation,
+    its optional `id` is echoed in the response:
+
+    - `new` with `width`, `height`, `mines` and an optional `seed` starts a
+      session and returns its `session` id
+    - `open` and `flag` with a `session` and `cells`, a list of [row, col]
+    - `chord` with a `session`, a `row` and a `col`
+    - `view` with a `session` returns every visible cell
+    - `close` with a `session` ends it
+    - `stats` returns the server totals and rates
+
+    Moves return the changed cells as flat indices with their visible codes
+    (see `visible_codes`), the board state and the remaining mines.
+    Memory is bounded by `max_sessions` sessions of at most `max_cells`
+    cells each and `max_total_cells` cells together. Sessions are kept in
+    least recently used order, so the ones idle for more than
+    `idle_timeout` seconds are evicted from the front
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 10_000,
+        max_cells: int = 1_000_000,
+        idle_timeout: float = 300.0,
+        max_total_cells: int = MAX_TOTAL_CELLS,
+    ):
+        self._max_sessions = max_sessions
+        self._max_cells = max_cells
+        self._max_total_cells = max_total_cells
+        self._total_cells = 0
+        self._idle_timeout = idle_timeout
+
+        # session id: (board, last use), least recently used first
+        self._sessions: "OrderedDict[int, Tuple[BoardModel, float]]" = OrderedDict()
+        self._next_session = 1
+        self._stats = ServerStats(time.monotonic())
+
+        self._operations: Dict[str, Callable[[Request], Response]] = {
+            "new": self._new,
+            "open": self._open,
+            "flag": self._flag,
+            "chord": self._chord,
+            "view": self._view,
+            "close": self._close,
+            "stats": self._report,
+        }
+
+    @property
+    def sessions(self) -> int:
+        """Returns the number of live sessions"""
+        return len(self._sessions)
+
+    def handle_line(self, line: bytes) -> bytes:
+        """Serves a request line and returns the response line"""
+        request: Request = {}
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise RequestError("a request must be a JSON object")
+            response = self.handle(request)
+        except (RequestError, ValueError) as error:
+            response = {"ok": False, "error": str(error)}
+            if isinstance(request, dict) and "id" in request:
+                response["id"] = request["id"]
+        return json.dumps(response, separators=(",", ":")).encode() + b"\n"
+
+    def handle(self, request: Request) -> Response:
+        """Serves a request, raises RequestError if it cannot be served"""
+        op = request.get("op")
+        operation = self._operations.get(op) if isinstance(op, str) else None
+        if operation is None:
+            raise RequestError(f"unknown op {op!r}")
+
+        self.evict_idle_sessions()
+        response = operation(request)
+        response["ok"] = True
+        if "id" in request:
+            response["id"] = request["id"]
+        return response
+
+    def evict_idle_sessions(self):
+        """Ends the sessions idle for longer than the idle timeout"""
+        deadline = time.monotonic() - self._idle_timeout
+        sessions = self._sessions
+        while sessions:
+            session, (_, last_use) = next(iter(sessions.items()))
+            if last_use > deadline:
+                break
+            self._end_session(session)
+            self._stats.evicted += 1
+
+    def _session(self, request: Request) -> BoardModel:
+        session = request.get("session")
+        entry = self._sessions.get(session) if _is_integer(session) else None
+        if entry is None:
+            raise RequestError(f"no session {session!r}")
+        self._sessions[session] = (entry[0], time.monotonic())
+        self._sessions.move_to_end(session)
+        return entry[0]
+
+    def _new(self, request: Request) -> Response:
+        width, height, mines = (
+            _integer(request, "width"),
+            _integer(request, "height"),
+            _integer(request, "mines"),
+        )
+        if not (0 < width and 0 < height and 0 <= mines < width * height):
+            raise RequestError("invalid board configuration")
+        if width * height > self._max_cells:
+            raise RequestError(f"boards are limited to {self._max_cells} cells")
+        if len(self._sessions) >= self._max_sessions:
+            raise RequestError("too many sessions")
+        if self._total_cells + width * height > self._max_total_cells:
+            raise RequestError("too many cells in play")
+
+        seed = request.get("seed")
+        if seed is not None and not _is_integer(seed):
+            raise RequestError("seed must be an integer")
+
+        board = BoardModel(width, height, mines, seed)
+        session = self._next_session
+        self._next_session += 1
+        self._sessions[session] = (board, time.monotonic())
+        self._total_cells += width * height
+        self._stats.sessions += 1
+        return {"session": session, "seed": board.seed}
+
+    def _open(self, request: Request) -> Response:
+        board = self._session(request)
+        cells = self._cells(request, board)
+        self._stats.moves += len(cells)
+        return _changes_response(board, board.open_many(cells))
+
+    def _flag(self, request: Request) -> Response:
+        board = self._session(request)
+        cells = self._cells(request, board)
+        self._stats.moves += len(cells)
+        return _changes_response(board, board.flag_many(cells))
+
+    def _chord(self, request: Request) -> Response:
+        board = self._session(request)
+        row, col = _check_cell(board, request.get("row"), request.get("col"))
+        self._stats.moves += 1
+        return _changes_response(board, board.chord(row, col))
+
+    def _view(self, request: Request) -> Response:
+        board = self._session(request)
+        width, height = board.dimensions
+        return {
+            "width": width,
+            "height": height,
+            "mines": board.mines,
+            "state": board.state.value,
+            "remaining_mines": board.remaining_mines,
+            "cells": visible_cells(board.storage).decode("ascii"),
+        }
+
+    def _close(self, request: Request) -> Response:
+        self._session(request)
+        self._end_session(request["session"])
+        return {}
+
+    def _end_session(self, session: int):
+        board, _ = self._sessions.pop(session)
+        width, height = board.dimensions
+        self._total_cells -= width * height
+
+    def _report(self, _: Request) -> Response:
+        return self._stats.to_dict(len(self._sessions))
+
+    @staticmethod
+    def _cells(request: Request, board: BoardModel) -> List[Tuple[int, int]]:
+        cells = request.get("cells")
+        try:
+            return [_check_cell(board, row, col) for row, col in cells]
+        except (TypeError, ValueError):
+            raise RequestError("cells must be a list of [row, col]") from None
+
+
+def _check_cell(board: BoardModel, row: Any, col: Any) -> Tuple[int, int]:
+    width, height = board.dimensions
+    if not (_is_integer(row) and _is_integer(col)):
+        raise RequestError("row and col must be integers")
+    if not (0 <= row < height and 0 <= col < width):
+        raise RequestError(f"cell [{row}, {col}] is outside the board")
+    return row, col
+
+
+def _integer(request: Request, key: str) -> int:
+    value = request.get(key)
+    if not _is_integer(value):
+        raise RequestError(f"{key} must be an integer")
+    return value
+
+
+def _is_integer(value: Any) -> bool:
+    # JSON true and false load as bool, a subclass of int
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _changes_response(board: BoardModel, changes: BoardChanges) -> Response:
+    changed = changes.opened + changes.marked
+    return {
+        "cells": changed,
+        "visuals": encode_cells(board.storage, changed).decode("ascii"),
+        "state": changes.state.value,
+        "remaining_mines": board.remaining_mines,
+    }
+
+
+async def serve(server: GameServer, host: str, port: int):
+    """Serves JSON line connections on (host, port) until cancelled
+
+    Every connection is a task on the same event loop, requests of a
+    connection are answered in order
+    """
+
+    async def serve_connection(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        try:
+            while line := await reader.readline():
+                writer.write(server.handle_line(line))
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def sweep():
+        while True:
+            await asyncio.sleep(_SWEEP_INTERVAL)
+            server.evict_idle_sessions()
+
+    listener = await asyncio.start_server(
+        serve_connection, host, port, limit=_MAX_LINE, backlog=1024
+    )
+    sweeper = asyncio.ensure_future(sweep())
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        sweeper.cancel()
+
+
+def serve_stdio(server: GameServer, stdin=None, stdout=None):
+    """Serves JSON lines read from stdin, answering on stdout"""
+    stdin = stdin if stdin is not None else sys.stdin.buffer
+    stdout = stdout if stdout is not None else sys.stdout.buffer
+    for line in stdin:
+        if line.strip():
+            stdout.write(server.handle_line(line))
+            stdout.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="minesweeper-server",
+        description="Host minesweeper games for bots over JSON lines",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7878)
+    parser.add_argument(
+        "--stdio", action="store_true", help="serve stdin and stdout instead"
+    )
+    parser.add_argument("--max-sessions", type=int, default=10_000)
+    parser.add_argument("--max-cells", type=int, default=1_000_000)
+    parser.add_argument(
+        "--max-total-cells",
+        type=int,
+        default=MAX_TOTAL_CELLS,
+        help="cells of all the sessions together",
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=300.0,
+        help="seconds before an unused session is evicted",
+    )
+    args = parser.parse_args()
+
+    server = GameServer(
+        args.max_sessions, args.max_cells, args.idle_timeout, args.max_total_cells
+    )
+    if args.stdio:
+        serve_stdio(server)
+        return
+
+    try:
+        asyncio.run(serve(server, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
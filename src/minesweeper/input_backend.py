@@ -0,0 +1,136 @@
+import os
+import re
+import selectors
+import sys
+import time
+
+from typing import Optional, Protocol
+
+
+# CSI (Esc [ parameters, intermediates, final byte) and SS3 (Esc O key)
+# sequences sent by arrows and function keys
+_ESCAPE_SEQUENCE = re.compile(rb"\x1b(?:\[[0-?]*[ -/]*[@-~]|O.)", re.DOTALL)
+# the start of such a sequence, cut off by the end of a read
+_INCOMPLETE_SEQUENCE = re.compile(rb"\x1b(?:\[[0-?]*[ -/]*|O)?")
+# seconds the rest of a cut off sequence is waited for before a lone Esc
+_ESCAPE_WAIT = 0.04
+_READ_SIZE = 64
+
+
+class KeyReader(Protocol):
+    """Blocking keyboard input protocol"""
+
+    def __enter__(self) -> "KeyReader":
+        """Prepares the terminal for reading single keys"""
+
+    def __exit__(self, *exc_info):
+        """Restores the terminal"""
+
+    def read_key(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """Blocks until a key is pressed or `timeout` seconds passed
+
+        Returns None on timeout
+        """
+
+
+class PosixKeyReader:
+    """Reads keys from a POSIX terminal in cbreak mode
+
+    Waits on the terminal with `selectors`, so no CPU is used while idle.
+    Escape sequences (arrows, function keys) are returned as a single key
+    so they are not mistaken for a lone Esc press, a sequence split across
+    reads is waited for a few milliseconds. Any other Esc is a key of its
+    own, so the keys typed or pasted right after it are kept
+    """
+
+    def __init__(self, stream=None):
+        self._stream = stream if stream is not None else sys.stdin
+        self._fd = self._stream.fileno()
+        self._saved_attributes = None
+        self._selector = None
+        self._pending = b""
+
+    def __enter__(self) -> "PosixKeyReader":
+        import termios  # pylint: disable=import-outside-toplevel
+        import tty  # pylint: disable=import-outside-toplevel
+
+        if self._stream.isatty():
+            self._saved_attributes = termios.tcgetattr(self._fd)
+            tty.setcbreak(self._fd)
+
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._fd, selectors.EVENT_READ)
+        return self
+
+    def __exit__(self, *exc_info):
+        import termios  # pylint: disable=import-outside-toplevel
+
+        if self._saved_attributes is not None:
+            termios.tcsetattr(self._fd, termios.TCSADRAIN, self._saved_attributes)
+            self._saved_attributes = None
+
+        if self._selector is not None:
+            self._selector.close()
+            self._selector = None
+
+    def read_key(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        if not self._pending:
+            if not self._selector.select(timeout):
+                return None
+            self._pending = os.read(self._fd, _READ_SIZE)
+            if not self._pending:
+                raise EOFError("input stream closed")
+
+        if _INCOMPLETE_SEQUENCE.fullmatch(self._pending):
+            self._read_rest_of_sequence()
+        sequence = _ESCAPE_SEQUENCE.match(self._pending)
+        size = sequence.end() if sequence else 1
+        key, self._pending = self._pending[:size], self._pending[size:]
+        return key
+
+    def _read_rest_of_sequence(self):
+        """Reads until the pending sequence is complete or `_ESCAPE_WAIT` passed"""
+        deadline = time.monotonic() + _ESCAPE_WAIT
+        while _INCOMPLETE_SEQUENCE.fullmatch(self._pending):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self._selector.select(remaining):
+                return
+            data = os.read(self._fd, _READ_SIZE)
+            if not data:
+                # the closed stream is reported by the next read
+                return
+            self._pending += data
+
+
+class WindowsKeyReader:
+    """Reads keys from a Windows console with `msvcrt`"""
+
+    _POLL_INTERVAL = 0.01
+
+    def __enter__(self) -> "WindowsKeyReader":
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def read_key(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        import msvcrt  # pylint: disable=import-outside-toplevel,import-error
+
+        if timeout is None:
+            return msvcrt.getch()
+
+        # the console handle can not be waited on together with a timeout
+        deadline = time.monotonic() + timeout
+        while not msvcrt.kbhit():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            time.sleep(min(self._POLL_INTERVAL, remaining))
+        return msvcrt.getch()
+
+
+def create_key_reader() -> KeyReader:
+    """Returns the key reader for the current platform"""
+    if sys.platform == "win32":
+        return WindowsKeyReader()
+    return PosixKeyReader()
@@ -0,0 +1,96 @@
+import struct
+import time
+
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+
+# magic, version, flags, width, height, mines, seed
+_HEADER = struct.Struct("<4sHHIIQQ")
+# nanoseconds since the session started, key length, followed by the key
+_RECORD = struct.Struct("<QB")
+_MAGIC = b"MSWL"
+_VERSION = 1
+_CHUNKED_FLAG = 1
+
+
+@dataclass(frozen=True)
+class SessionInfo:
+    """What a game session needs to be replayed, besides its keys"""
+
+    config: Tuple[int, int, int]
+    seed: int
+    chunked: bool = False
+
+
+class InputLogWriter:
+    """Appends the keys of a session to a binary log
+
+    Every key is written with the monotonic time it was read at, timer
+    ticks are written as empty keys. Records are flushed one by one, so the
+    log of a crashed session is complete up to its last key
+    """
+
+    def __init__(self, path: str, session: SessionInfo):
+        self._path = path
+        self._session = session
+        self._file: Optional[BinaryIO] = None
+        self._start = 0
+
+    def __enter__(self) -> "InputLogWriter":
+        session = self._session
+        self._file = open(self._path, "wb")  # pylint: disable=consider-using-with
+        self._file.write(
+            _HEADER.pack(
+                _MAGIC,
+                _VERSION,
+                _CHUNKED_FLAG if session.chunked else 0,
+                *session.config,
+                session.seed,
+            )
+        )
+        self._start = time.monotonic_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._file.close()
+        self._file = None
+
+    def record(self, key: Optional[bytes]):
+        """Appends a key, None for a timer tick"""
+        key = key or b""
+        self._file.write(
+            _RECORD.pack(time.monotonic_ns() - self._start, len(key)) + key
+        )
+        self._file.flush()
+
+
+def read_input_log(
+    path: str,
+) -> Tuple[SessionInfo, Iterator[Tuple[int, Optional[bytes]]]]:
+    """Returns the session of a log and an iterator over its (time, key) records
+
+    Times are in nanoseconds since the session started, ticks have a None key
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+
+    if len(data) < _HEADER.size:
+        raise ValueError(f"{path} is not an input log")
+    magic, version, flags, width, height, mines, seed = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError(f"{path} is not a version {_VERSION} input log")
+    session = SessionInfo((width, height, mines), seed, bool(flags & _CHUNKED_FLAG))
+
+    def records() -> Iterator[Tuple[int, Optional[bytes]]]:
+        offset = _HEADER.size
+        # a crash can leave the last record incomplete
+        while offset + _RECORD.size <= len(data):
+            timestamp, length = _RECORD.unpack_from(data, offset)
+            offset += _RECORD.size
+            if offset + length > len(data):
+                return
+            yield timestamp, data[offset : offset + length] or None
+            offset += length
+
+    return session, records()
@@ -0,0 +1,211 @@
+import functools
+import json
+import time
+
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from . import console_utils
+from .board_mvc import board_view
+from .board_mvc.board_model import BoardModel
+from .board_mvc.chunked_board_model import ChunkedBoardModel
+from .configurations_mvc import configuration_controller
+from .controller_runner import ControllerRunner
+from .game_mvc import game_controller
+from .user_action import UserAction
+
+
+# Ctrl+P, dumps the report while playing
+DUMP_KEY = b"\x10"
+
+_BOARD_OPERATIONS = ("open", "flag", "press", "offset_row", "offset_col")
+
+_PERCENTILES = (0.5, 0.9, 0.99)
+
+
+class Histogram:
+    """Log scale histogram, bucket `i` counts the values in [2**(i-1), 2**i)"""
+
+    __slots__ = ("unit", "count", "total", "minimum", "maximum", "buckets")
+
+    def __init__(self, unit: str):
+        self.unit = unit
+        self.count = 0
+        self.total = 0
+        self.minimum: Optional[int] = None
+        self.maximum: Optional[int] = None
+        self.buckets: List[int] = []
+
+    def record(self, value: int):
+        """Adds a value to the histogram"""
+        self.count += 1
+        self.total += value
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+        bucket = value.bit_length()
+        if bucket >= len(self.buckets):
+            self.buckets.extend([0] * (bucket + 1 - len(self.buckets)))
+        self.buckets[bucket] += 1
+
+    def percentile(self, share: float) -> int:
+        """Returns an upper bound of the `share` quantile of the values"""
+        threshold = share * self.count
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= threshold:
+                return min(1 << bucket, self.maximum)
+        return self.maximum or 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the histogram as a JSON serializable dictionary"""
+        return {
+            "unit": self.unit,
+            "count": self.count,
+            "total": self.total,
+            "min": self.minimum,
+            "max": self.maximum,
+            "mean": self.total / self.count if self.count else None,
+            **{
+                f"p{round(share * 100)}": self.percentile(share)
+                for share in _PERCENTILES
+            },
+            "buckets": {
+                f"<{1 << bucket}": count
+                for bucket, count in enumerate(self.buckets)
+                if count
+            },
+        }
+
+
+class Instrumentation:
+    """Records latency and output size histograms of the game loop
+
+    Nothing in the game refers to the instrumentation, `install` wraps the
+    hot paths in place and `uninstall` restores them, so the game runs
+    untouched when it is disabled. Controllers must be created after
+    `install` for their key handlers to be timed.
+    Frames are timed from the moment their key was read until their output
+    was written, which is the input to frame latency the player sees
+    """
+
+    def __init__(self, dump_path: Optional[str] = None):
+        self._dump_path = dump_path
+        self._histograms: Dict[str, Histogram] = {}
+        self._patches: List[Tuple[Any, str, Any]] = []
+        # histograms being timed, a subclass calling its patched base is
+        # timed once
+        self._timing: Set[str] = set()
+
+    @property
+    def histograms(self) -> Dict[str, Histogram]:
+        """Returns the histograms by name"""
+        return self._histograms
+
+    def record(self, name: str, value: int, unit: str = "us"):
+        """Adds a value to the histogram `name`"""
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            histogram = self._histograms[name] = Histogram(unit)
+        histogram.record(value)
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """Returns every histogram as a JSON serializable dictionary"""
+        return {
+            name: histogram.to_dict()
+            for name, histogram in sorted(self._histograms.items())
+        }
+
+    def dump(self, path: Optional[str] = None):
+        """Writes the report as JSON to `path`, the dump path by default"""
+        path = path if path is not None else self._dump_path
+        if path is None:
+            return
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.report(), file, indent=2)
+
+    def install(self):
+        """Wraps the game hot paths with timers"""
+        if self._patches:
+            return
+
+        self._patch(ControllerRunner, "_run_frame", self._wrap_frame)
+        self._patch(game_controller.GameController, "run", self._timer("game"))
+        self._patch(UserAction, "__init__", self._wrap_user_action)
+
+        for board_class in (BoardModel, ChunkedBoardModel):
+            for operation in _BOARD_OPERATIONS:
+                if operation in vars(board_class):
+                    self._patch(
+                        board_class, operation, self._timer(f"board.{operation}")
+                    )
+
+        self._patch(board_view.BoardRenderer, "render", self._timer("view.board"))
+        self._patch(board_view, "show_board_page", self._timer("view.board_page"))
+        self._patch(game_controller, "show_game_help_bar", self._timer("view.help_bar"))
+        self._patch(
+            configuration_controller,
+            "show_configuration_page",
+            self._timer("view.configuration"),
+        )
+        self._patch(console_utils, "_write_frame", self._wrap_write_frame)
+
+    def uninstall(self):
+        """Restores the unwrapped hot paths"""
+        for owner, name, original in reversed(self._patches):
+            setattr(owner, name, original)
+        self._patches.clear()
+
+    def _patch(self, owner: Any, name: str, wrap: Callable[[Callable], Callable]):
+        original = getattr(owner, name)
+        self._patches.append((owner, name, original))
+        setattr(owner, name, functools.wraps(original)(wrap(original)))
+
+    def _timer(self, name: str) -> Callable[[Callable], Callable]:
+        def wrap(function: Callable) -> Callable:
+            def timed(*args, **kwargs):
+                if name in self._timing:
+                    return function(*args, **kwargs)
+                self._timing.add(name)
+                start = time.perf_counter_ns()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self._timing.discard(name)
+                    self.record(name, (time.perf_counter_ns() - start) // 1000)
+
+            return timed
+
+        return wrap
+
+    def _wrap_frame(self, run_frame: Callable) -> Callable:
+        time_frame = self._timer("frame")(run_frame)
+
+        def frame(runner: ControllerRunner, inp: Optional[bytes]):
+            if inp == DUMP_KEY:
+                self.dump()
+                return None
+            return time_frame(runner, inp)
+
+        return frame
+
+    def _wrap_user_action(self, init: Callable) -> Callable:
+        def user_action_init(action: UserAction, *args, **kwargs):
+            init(action, *args, **kwargs)
+            action.callback = self._timer(f"handler.{action.operation}")(
+                action.callback
+            )
+
+        return user_action_init
+
+    def _wrap_write_frame(self, write_frame: Callable) -> Callable:
+        time_write = self._timer("write")(write_frame)
+
+        def write(text: str):
+            if text:
+                self.record("bytes_written", len(text.encode("utf-8")), "B")
+            return time_write(text)
+
+        return write
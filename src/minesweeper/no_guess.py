@@ -0,0 +1,243 @@
+import argparse
+import os
+import random
+import struct
+import sys
+import time
+
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import List, Optional, Set, Tuple
+
+from .board_mvc.board_model import BoardModel, BoardState
+from .solver import ConstraintSolver
+
+
+Configuration = Tuple[int, int, int]
+
+# seed, flat index of the first cell to open
+NoGuessBoard = Tuple[int, int]
+
+_RECORD = struct.Struct("<QI")
+
+# candidates verified per task, large enough to amortize the process overhead
+_BATCH_SIZE = 64
+
+# tasks kept in flight per worker process
+_TASKS_PER_PROCESS = 2
+
+# candidates searched for a board when the cache has none
+_SEARCH_CANDIDATES = 2048
+
+# directory the no-guess boards are cached in
+CACHE_DIRECTORY = os.path.join(os.path.expanduser("~"), ".minesweeper_no_guess")
+
+
+def first_cell(width: int, height: int) -> int:
+    """Returns the flat index of the cell no-guess boards are opened from"""
+    return (height // 2) * width + width // 2
+
+
+def is_no_guess(width: int, height: int, mines: int, seed: int, first: int) -> bool:
+    """Returns True if the solver clears the board opened at `first` unaided"""
+    board = BoardModel(width, height, mines, seed)
+    board.open(*divmod(first, width))
+    solver = ConstraintSolver(board)
+
+    while board.state == BoardState.PLAYING:
+        safe_cells = [*solver.safe_cells]
+        if not safe_cells:
+            break
+        board.open_many(divmod(index, width) for index in safe_cells)
+
+    solver.detach()
+    return board.state == BoardState.WON
+
+
+def _verify_batch(
+    width: int, height: int, mines: int, first: int, seeds: List[int]
+) -> List[int]:
+    return [seed for seed in seeds if is_no_guess(width, height, mines, seed, first)]
+
+
+def search_no_guess(
+    config: Configuration,
+    count: int,
+    processes: Optional[int] = None,
+    seed: Optional[int] = None,
+    max_candidates: int = 1_000_000,
+) -> List[NoGuessBoard]:
+    """Returns up to `count` no-guess boards of `config`
+
+    Candidate seeds are verified in batches over a pool of `processes`
+    workers. The search stops after `max_candidates` candidates, so dense
+    configurations return fewer boards instead of searching forever
+    """
+    width, height, mines = config
+    first = first_cell(width, height)
+    processes = processes or os.cpu_count() or 1
+    rng = random.Random(seed)
+    found: List[NoGuessBoard] = []
+    candidates = 0
+
+    def next_batch() -> List[int]:
+        nonlocal candidates
+        size = min(_BATCH_SIZE, max_candidates - candidates)
+        candidates += size
+        return [rng.getrandbits(64) for _ in range(size)]
+
+    if processes == 1:
+        while len(found) < count and candidates < max_candidates:
+            seeds = _verify_batch(width, height, mines, first, next_batch())
+            found += ((seed, first) for seed in seeds)
+        return found[:count]
+
+    with ProcessPoolExecutor(processes) as executor:
+        running: Set[Future] = set()
+        while len(found) < count:
+            while (
+                len(running) < processes * _TASKS_PER_PROCESS
+                and candidates < max_candidates
+            ):
+                running.add(
+                    executor.submit(
+                        _verify_batch, width, height, mines, first, next_batch()
+                    )
+                )
+            if not running:
+                break
+
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                found += ((seed, first) for seed in future.result())
+
+        for future in running:
+            future.cancel()
+    return found[:count]
+
+
+class NoGuessCache:
+    """Verified no-guess boards on disk, a file of records per configuration
+
+    A board is a seed and the cell it is opened from, so a cached board
+    takes a few bytes. Taking a board reads the last record of the file and
+    truncates it, which costs the same whatever the number of cached boards,
+    and a board is never served twice
+    """
+
+    def __init__(self, directory: str = CACHE_DIRECTORY):
+        self._directory = directory
+
+    def count(self, config: Configuration) -> int:
+        """Returns the number of cached boards of `config`"""
+        try:
+            return os.path.getsize(self._path(config)) // _RECORD.size
+        except FileNotFoundError:
+            return 0
+
+    def add(self, config: Configuration, boards: List[NoGuessBoard]):
+        """Appends verified boards of `config` to the cache"""
+        os.makedirs(self._directory, exist_ok=True)
+        with open(self._path(config), "ab") as file:
+            # a partial record left by an interrupted write is cut off, so
+            # the appended records stay aligned
+            size = file.tell()
+            if size % _RECORD.size:
+                file.truncate(size - size % _RECORD.size)
+            file.write(b"".join(_RECORD.pack(*board) for board in boards))
+
+    def take(self, config: Configuration) -> Optional[NoGuessBoard]:
+        """Removes and returns a cached board of `config`, None if there is none"""
+        try:
+            # pylint: disable-next=consider-using-with
+            file = open(self._path(config), "r+b")
+        except FileNotFoundError:
+            return None
+
+        with file:
+            # an interrupted write can leave a partial record at the end
+            size = file.seek(0, os.SEEK_END)
+            size -= size % _RECORD.size
+            if size == 0:
+                return None
+            file.seek(size - _RECORD.size)
+            board = _RECORD.unpack(file.read(_RECORD.size))
+            file.truncate(size - _RECORD.size)
+        return board
+
+    def _path(self, config: Configuration) -> str:
+        width, height, mines = config
+        return os.path.join(self._directory, f"{width}x{height}x{mines}.seeds")
+
+
+class NoGuessBoardFactory:
+    """Board factory serving no-guess boards from a cache
+
+    A board is only free of guesses when opened from its first cell, so
+    that cell is opened right away and the cursor starts on it. When the
+    cache has no boards of a configuration, one is searched from the given
+    seed on the spot. If the search finds none either, a random board is
+    served and a notice is written to stderr
+    """
+
+    def __init__(self, cache: NoGuessCache):
+        self._cache = cache
+
+    def __call__(self, width: int, height: int, mines: int, seed: int) -> BoardModel:
+        config = (width, height, mines)
+        cached = self._cache.take(config)
+        if cached is None:
+            found = search_no_guess(
+                config, 1, processes=1, seed=seed, max_candidates=_SEARCH_CANDIDATES
+            )
+            if not found:
+                print(
+                    f"No no-guess board of {width}x{height} with {mines} mines was "
+                    "found, this board may need guessing",
+                    file=sys.stderr,
+                )
+                return BoardModel(width, height, mines, seed)
+            cached = found[0]
+
+        seed, first = cached
+        row, col = divmod(first, width)
+        board = BoardModel(width, height, mines, seed)
+        board.offset_row(row)
+        board.offset_col(col)
+        board.open(row, col)
+        return board
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="minesweeper-no-guess",
+        description="Search no-guess boards and add them to the cache",
+    )
+    parser.add_argument("--width", type=int, default=30)
+    parser.add_argument("--height", type=int, default=16)
+    parser.add_argument("--mines", type=int, default=99)
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument(
+        "--processes", type=int, default=None, help="defaults to the number of CPUs"
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--max-candidates", type=int, default=1_000_000)
+    parser.add_argument("--cache", metavar="PATH", default=CACHE_DIRECTORY)
+    args = parser.parse_args()
+
+    config = (args.width, args.height, args.mines)
+    start = time.perf_counter()
+    boards = search_no_guess(
+        config, args.count, args.processes, args.seed, args.max_candidates
+    )
+    elapsed = time.perf_counter() - start
+
+    cache = NoGuessCache(args.cache)
+    cache.add(config, boards)
+    print(
+        f"Found {len(boards)} no-guess boards of {args.width}x{args.height} with "
+        f"{args.mines} mines in {elapsed:.3f}s, {cache.count(config)} cached"
+    )
+
+
+if __name__ == "__main__":
+    main()
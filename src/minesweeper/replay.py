@@ -0,0 +1,73 @@
+import time
+
+from dataclasses import dataclass
+from typing import Optional
+
+from . import console_utils
+from .board_mvc.board_model import BoardModel
+from .board_mvc.board_pool import BoardPool
+from .board_mvc.chunked_board_model import ChunkedBoardModel
+from .game_mvc import GameController
+from .input_log import SessionInfo, read_input_log
+from .score_board import ScoreBoard
+
+
+def create_game(
+    session: SessionInfo,
+    score_board: Optional[ScoreBoard] = None,
+    board_pool: Optional[BoardPool] = None,
+) -> GameController:
+    """Returns the game controller a session starts with
+
+    A `board_pool` speeds up new boards without changing them, so a replay
+    needs none
+    """
+    board_factory = ChunkedBoardModel if session.chunked else BoardModel
+    return GameController(
+        session.config, board_factory, session.seed, score_board, board_pool
+    )
+
+
+@dataclass
+class ReplayReport:
+    """Result of a replay, `seconds` is the wall time spent replaying"""
+
+    keys: int
+    frames: int
+    seconds: float
+
+    @property
+    def frames_per_second(self) -> float:
+        """Returns the number of frames replayed per wall clock second"""
+        return self.frames / self.seconds if self.seconds else 0.0
+
+
+def replay(path: str, render: bool = True) -> ReplayReport:
+    """Runs the logged keys through a new game as fast as possible
+
+    Without `render`, views still run but nothing is written to the terminal
+    """
+    session, records = read_input_log(path)
+    keys = frames = 0
+
+    console_utils.set_output_enabled(render)
+    start = time.perf_counter()
+    try:
+        game = create_game(session)
+        with console_utils.frame():
+            game.run(None)
+        frames += 1
+
+        for _, key in records:
+            keys += key is not None
+            with console_utils.frame():
+                game.run(key)
+            frames += 1
+    except SystemExit:
+        # the session ended with the exit key
+        pass
+    finally:
+        seconds = time.perf_counter() - start
+        console_utils.set_output_enabled(True)
+
+    return ReplayReport(keys, frames, seconds)
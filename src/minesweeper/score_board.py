@@ -0,0 +1,92 @@
+import heapq
+import os
+import struct
+import time
+
+from dataclasses import dataclass
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+
+Configuration = Tuple[int, int, int]
+
+# width, height, mines, seconds, unix time the game was won at
+_RECORD = struct.Struct("<IIQdd")
+
+TOP_SCORES = 10
+
+
+@dataclass(frozen=True)
+class Score:
+    """A won game"""
+
+    config: Configuration
+    seconds: float
+    won_at: float
+
+
+class ScoreBoard:
+    """Best times per board configuration, backed by an append-only file
+
+    Every won game is appended to the file as a fixed size record. Opening
+    the board reads the file once and keeps only the `top` best times of
+    every configuration, in a bounded max-heap, so recording a game and
+    querying a leaderboard never touch the rest of the recorded games
+    """
+
+    def __init__(self, path: str, top: int = TOP_SCORES):
+        self._path = path
+        self._top = top
+        # max-heaps of (-seconds, -won_at), the worst kept score on top
+        self._best: Dict[Configuration, List[Tuple[float, float]]] = {}
+        self._file: Optional[BinaryIO] = None
+        self._load()
+
+    def add(self, config: Configuration, seconds: float) -> Score:
+        """Records a won game"""
+        score = Score(config, seconds, time.time())
+        if self._file is None:
+            # pylint: disable-next=consider-using-with
+            self._file = open(self._path, "ab")
+        self._file.write(_RECORD.pack(*config, seconds, score.won_at))
+        self._file.flush()
+        self._index(config, seconds, score.won_at)
+        return score
+
+    def top(self, config: Configuration) -> List[Score]:
+        """Returns the best scores of `config`, fastest first"""
+        return [
+            Score(config, -seconds, -won_at)
+            for seconds, won_at in sorted(self._best.get(config, ()), reverse=True)
+        ]
+
+    def close(self):
+        """Closes the score file"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _load(self):
+        try:
+            with open(self._path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return
+
+        # an interrupted write can leave a partial record at the end, it is
+        # cut off so the records appended next stay aligned
+        size = len(data) - len(data) % _RECORD.size
+        if size != len(data):
+            os.truncate(self._path, size)
+        data = memoryview(data)[:size]
+        for width, height, mines, seconds, won_at in _RECORD.iter_unpack(data):
+            self._index((width, height, mines), seconds, won_at)
+
+    def _index(self, config: Configuration, seconds: float, won_at: float):
+        best = self._best.get(config)
+        if best is None:
+            best = self._best[config] = []
+        entry = (-seconds, -won_at)
+        if len(best) < self._top:
+            heapq.heappush(best, entry)
+        elif entry > best[0]:
+            heapq.heapreplace(best, entry)
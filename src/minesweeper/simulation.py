@@ -0,0 +1,332 @@
+import argparse
+import json
+import os
+import random
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import AbstractSet, Callable, Dict, List, Optional, Protocol, Tuple
+
+from .board_mvc.board_model import BoardAction, BoardModel, BoardState
+from .board_mvc.board_storage import CLOSE_CODE
+from .solver import ConstraintSolver, ProbabilityEngine
+
+
+Move = Tuple[BoardAction, int, int]
+
+# batches per worker process, more batches balance uneven games better
+_BATCHES_PER_PROCESS = 4
+
+# random picks tried before scanning the board for a closed cell
+_RANDOM_PICK_ATTEMPTS = 32
+
+
+class Strategy(Protocol):
+    """Game playing strategy"""
+
+    def next_move(self, board: BoardModel) -> Optional[Move]:
+        """Returns the next move to play on `board`, None to give up"""
+
+
+class RandomStrategy:
+    """Opens a random closed cell every move"""
+
+    def __init__(self, rng: random.Random):
+        self._rng = rng
+
+    def next_move(self, board: BoardModel) -> Optional[Move]:
+        index = _pick_closed_cell(board, self._rng)
+        if index is None:
+            return None
+        return (BoardAction.OPEN, *divmod(index, board.dimensions[0]))
+
+
+class SolverStrategy:
+    """Opens the cells the constraint solver proves safe, guesses otherwise"""
+
+    def __init__(self, rng: random.Random):
+        self._rng = rng
+        self._board: Optional[BoardModel] = None
+        self._solver: Optional[ConstraintSolver] = None
+
+    def next_move(self, board: BoardModel) -> Optional[Move]:
+        if board is not self._board:
+            if self._solver is not None:
+                self._solver.detach()
+            self._board = board
+            self._solver = ConstraintSolver(board)
+
+        index = self._solver.next_safe_cell()
+        if index is None:
+            index = _pick_closed_cell(board, self._rng, self._solver.mine_cells)
+        if index is None:
+            return None
+        return (BoardAction.OPEN, *divmod(index, board.dimensions[0]))
+
+
+class ProbabilityStrategy:
+    """Opens the cell least likely to be a mine, from exact probabilities"""
+
+    def __init__(self, rng: random.Random):
+        self._rng = rng
+        self._board: Optional[BoardModel] = None
+        self._engine: Optional[ProbabilityEngine] = None
+
+    def next_move(self, board: BoardModel) -> Optional[Move]:
+        if board is not self._board:
+            if self._engine is not None:
+                self._engine.solver.detach()
+            self._board = board
+            self._engine = ProbabilityEngine(board)
+
+        # before the first open every cell is as likely, and the first is safe
+        if not board.is_generated:
+            index = _pick_closed_cell(board, self._rng)
+        else:
+            index = self._engine.safest_cell()
+        if index is None:
+            return None
+        return (BoardAction.OPEN, *divmod(index, board.dimensions[0]))
+
+
+def _pick_closed_cell(
+    board: BoardModel, rng: random.Random, excluded: AbstractSet[int] = frozenset()
+) -> Optional[int]:
+    """Returns a random closed cell outside `excluded`, None if there is none"""
+    states = board.storage.states
+
+    for _ in range(_RANDOM_PICK_ATTEMPTS):
+        index = rng.randrange(len(states))
+        if states[index] == CLOSE_CODE and index not in excluded:
+            return index
+
+    index = states.find(CLOSE_CODE)
+    while index != -1 and index in excluded:
+        index = states.find(CLOSE_CODE, index + 1)
+    return index if index != -1 else None
+
+
+StrategyFactory = Callable[[random.Random], Strategy]
+
+STRATEGIES: Dict[str, StrategyFactory] = {
+    "random": RandomStrategy,
+    "solver": SolverStrategy,
+    "probability": ProbabilityStrategy,
+}
+
+
+@dataclass
+class SimulationStats:
+    """Totals of a group of simulated games, timings are in seconds"""
+
+    games: int = 0
+    wins: int = 0
+    moves: int = 0
+    phase_times: Dict[str, float] = field(
+        default_factory=lambda: dict.fromkeys(
+            ("setup", "generate", "decide", "apply"), 0.0
+        )
+    )
+
+    def merge(self, other: "SimulationStats"):
+        """Adds the totals of `other` to these totals"""
+        self.games += other.games
+        self.wins += other.wins
+        self.moves += other.moves
+        for phase, seconds in other.phase_times.items():
+            self.phase_times[phase] += seconds
+
+
+@dataclass
+class SimulationReport:
+    """Result of a simulation run"""
+
+    width: int
+    height: int
+    mines: int
+    strategy: str
+    processes: int
+    wall_time: float
+    stats: SimulationStats
+
+    @property
+    def games_per_second(self) -> float:
+        """Returns the number of games played per wall clock second"""
+        return self.stats.games / self.wall_time if self.wall_time else 0.0
+
+    @property
+    def moves_per_second(self) -> float:
+        """Returns the number of moves played per wall clock second"""
+        return self.stats.moves / self.wall_time if self.wall_time else 0.0
+
+    @property
+    def win_rate(self) -> float:
+        """Returns the share of games won"""
+        return self.stats.wins / self.stats.games if self.stats.games else 0.0
+
+    def to_dict(self) -> dict:
+        """Returns the report as a JSON serializable dictionary"""
+        report = asdict(self)
+        report.update(
+            games_per_second=self.games_per_second,
+            moves_per_second=self.moves_per_second,
+            win_rate=self.win_rate,
+        )
+        return report
+
+
+def play_game(
+    width: int, height: int, mines: int, strategy: Strategy, stats: SimulationStats
+) -> bool:
+    """Plays one game to its end and adds its totals to `stats`
+
+    Returns True if the game was won
+    """
+    phase_times = stats.phase_times
+    clock = time.perf_counter
+
+    start = clock()
+    board = BoardModel(width, height, mines)
+    phase_times["setup"] += clock() - start
+
+    moves = 0
+    while board.state == BoardState.PLAYING:
+        start = clock()
+        move = strategy.next_move(board)
+        phase_times["decide"] += clock() - start
+        if move is None:
+            break
+
+        action, row, col = move
+        start = clock()
+        if action == BoardAction.OPEN:
+            board.open(row, col)
+        else:
+            board.flag(row, col)
+        elapsed = clock() - start
+
+        # mines are placed by the first open, its cost is the generation phase
+        phase_times["generate" if moves == 0 else "apply"] += elapsed
+        moves += 1
+
+    won = board.state == BoardState.WON
+    stats.games += 1
+    stats.wins += won
+    stats.moves += moves
+    return won
+
+
+def _play_batch(
+    games: int, width: int, height: int, mines: int, strategy: str, seed: str
+) -> SimulationStats:
+    # boards draw from the global generator, seed it so runs are repeatable
+    random.seed(seed)
+    strategy_instance = STRATEGIES[strategy](random.Random(seed))
+
+    stats = SimulationStats()
+    for _ in range(games):
+        play_game(width, height, mines, strategy_instance, stats)
+    return stats
+
+
+def simulate(
+    games: int,
+    width: int,
+    height: int,
+    mines: int,
+    strategy: str = "random",
+    processes: Optional[int] = None,
+    seed: Optional[int] = None,
+) -> SimulationReport:
+    """Plays `games` games split in batches over a pool of `processes` workers"""
+    processes = processes or os.cpu_count() or 1
+    seed = seed if seed is not None else random.getrandbits(64)
+
+    batches = _split_games(games, processes * _BATCHES_PER_PROCESS)
+    stats = SimulationStats()
+
+    start = time.perf_counter()
+    if processes == 1:
+        for batch, batch_games in enumerate(batches):
+            stats.merge(
+                _play_batch(
+                    batch_games, width, height, mines, strategy, f"{seed}:{batch}"
+                )
+            )
+    else:
+        with ProcessPoolExecutor(processes) as executor:
+            futures = [
+                executor.submit(
+                    _play_batch,
+                    batch_games,
+                    width,
+                    height,
+                    mines,
+                    strategy,
+                    f"{seed}:{batch}",
+                )
+                for batch, batch_games in enumerate(batches)
+            ]
+            for future in futures:
+                stats.merge(future.result())
+    wall_time = time.perf_counter() - start
+
+    return SimulationReport(width, height, mines, strategy, processes, wall_time, stats)
+
+
+def _split_games(games: int, batches: int) -> List[int]:
+    batches = max(1, min(batches, games))
+    size, extra = divmod(games, batches)
+    return [size + (batch < extra) for batch in range(batches)]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="minesweeper-sim", description="Play minesweeper games headlessly"
+    )
+    parser.add_argument("--games", type=int, default=10_000)
+    parser.add_argument("--width", type=int, default=30)
+    parser.add_argument("--height", type=int, default=16)
+    parser.add_argument("--mines", type=int, default=99)
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="random")
+    parser.add_argument(
+        "--processes", type=int, default=None, help="defaults to the number of CPUs"
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    report = simulate(
+        args.games,
+        args.width,
+        args.height,
+        args.mines,
+        args.strategy,
+        args.processes,
+        args.seed,
+    )
+
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2))
+        return
+
+    stats = report.stats
+    print(
+        f"{stats.games} games of {report.width}x{report.height} with "
+        f"{report.mines} mines, strategy '{report.strategy}', "
+        f"{report.processes} processes"
+    )
+    print(f"Wall time: {report.wall_time:.3f}s")
+    print(
+        f"Throughput: {report.games_per_second:.1f} games/s, "
+        f"{report.moves_per_second:.1f} moves/s"
+    )
+    print(f"Win rate: {report.win_rate:.2%}")
+    for phase, seconds in stats.phase_times.items():
+        per_game = seconds / stats.games if stats.games else 0.0
+        print(f"{phase:>10}: {seconds:.3f}s total, {per_game * 1e6:.1f}us per game")
+
+
+if __name__ == "__main__":
+    main()
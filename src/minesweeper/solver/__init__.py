@@ -0,0 +1,2 @@
+from .constraint_solver import ConstraintSolver
+from .probability_engine import MineProbabilities, ProbabilityEngine
\ No newline at end of file
@@ -0,0 +1,174 @@
+from collections import defaultdict
+from typing import AbstractSet, Dict, Optional, Sequence, Set
+
+from ..board_mvc.board_model import BoardModel
+from ..board_mvc.board_storage import EMPTY_CODE, MINE_CODE, OPEN_CODE
+
+
+class Constraint:
+    """`mines` mines are hidden among the unresolved `cells`"""
+
+    __slots__ = ("cells", "mines")
+
+    def __init__(self, cells: Set[int], mines: int):
+        self.cells = cells
+        self.mines = mines
+
+
+class ConstraintSolver:
+    """Derives certainly safe and certainly mined cells of a board
+
+    Every opened number is a constraint over its unresolved neighbours.
+    Constraints are reduced with the single-cell rule (no mines left or
+    only mines left) and the pairwise rule between overlapping constraints.
+    The solver listens to the board, so a move only revisits the constraints
+    around the cells it changed. Flags are player guesses and are ignored
+    """
+
+    def __init__(self, board: BoardModel):
+        self._board = board
+        self._storage = board.storage
+
+        # constraints are keyed by the index of the number that defines them
+        self._constraints: Dict[int, Constraint] = {}
+        self._cell_constraints: Dict[int, Set[int]] = defaultdict(set)
+        self._pending: Set[int] = set()
+
+        self._safe_cells: Set[int] = set()
+        self._mine_cells: Set[int] = set()
+
+        self._on_board_change(self._find_opened_cells())
+        board.add_change_listener(self._on_board_change)
+
+    @property
+    def safe_cells(self) -> AbstractSet[int]:
+        """Returns the flat indices of closed cells that are certainly safe"""
+        return self._safe_cells
+
+    @property
+    def mine_cells(self) -> AbstractSet[int]:
+        """Returns the flat indices of cells that are certainly mines"""
+        return self._mine_cells
+
+    @property
+    def constraints(self) -> Dict[int, Constraint]:
+        """Returns the unresolved constraints keyed by their number's index"""
+        return self._constraints
+
+    def next_safe_cell(self) -> Optional[int]:
+        """Returns the flat index of a certainly safe closed cell, if any"""
+        return next(iter(self._safe_cells), None)
+
+    def detach(self):
+        """Stops following the board"""
+        self._board.remove_change_listener(self._on_board_change)
+
+    def _find_opened_cells(self) -> Sequence[int]:
+        states = self._storage.states
+        opened = []
+        index = states.find(OPEN_CODE)
+        while index != -1:
+            opened.append(index)
+            index = states.find(OPEN_CODE, index + 1)
+        return opened
+
+    def _on_board_change(self, indices: Sequence[int]):
+        states = self._storage.states
+        for index in indices:
+            # flags and question marks carry no information
+            if states[index] == OPEN_CODE:
+                self._reveal(index)
+        self._propagate()
+
+    def _reveal(self, index: int):
+        self._safe_cells.discard(index)
+        self._resolve(index, is_mine=False)
+
+        mines = self._storage.types[index]
+        if mines in (EMPTY_CODE, MINE_CODE):
+            return
+
+        states = self._storage.states
+        cells = set()
+        for neighbour in self._storage.neighbours(index):
+            if neighbour in self._mine_cells:
+                mines -= 1
+            elif states[neighbour] != OPEN_CODE and neighbour not in self._safe_cells:
+                cells.add(neighbour)
+
+        if not cells:
+            return
+        self._constraints[index] = Constraint(cells, mines)
+        for cell in cells:
+            self._cell_constraints[cell].add(index)
+        self._pending.add(index)
+
+    def _resolve(self, cell: int, is_mine: bool):
+        """Removes a cell whose content is known from every constraint"""
+        for owner in self._cell_constraints.pop(cell, ()):
+            constraint = self._constraints[owner]
+            constraint.cells.discard(cell)
+            constraint.mines -= is_mine
+            self._pending.add(owner)
+
+    def _mark_safe(self, cell: int):
+        if cell not in self._safe_cells:
+            self._safe_cells.add(cell)
+            self._resolve(cell, is_mine=False)
+
+    def _mark_mine(self, cell: int):
+        if cell not in self._mine_cells:
+            self._mine_cells.add(cell)
+            self._resolve(cell, is_mine=True)
+
+    def _propagate(self):
+        while self._pending:
+            owner = self._pending.pop()
+            constraint = self._constraints.get(owner)
+            if constraint is None:
+                continue
+
+            if not constraint.cells:
+                del self._constraints[owner]
+            elif constraint.mines == 0:
+                for cell in [*constraint.cells]:
+                    self._mark_safe(cell)
+            elif constraint.mines == len(constraint.cells):
+                for cell in [*constraint.cells]:
+                    self._mark_mine(cell)
+            else:
+                self._apply_pairwise_rule(owner, constraint)
+
+    def _apply_pairwise_rule(self, owner: int, constraint: Constraint):
+        """Compares the constraint with every constraint sharing a cell with it
+
+        With `a` mines in the cells only the first constraint covers and `b`
+        in the cells only the second covers, `a - b` is the difference of
+        their mine counts. When it equals the size of either side, one side
+        is all mines and the other is all safe
+        """
+        overlapping = set()
+        for cell in constraint.cells:
+            overlapping |= self._cell_constraints[cell]
+        overlapping.discard(owner)
+
+        for other_owner in overlapping:
+            other = self._constraints[other_owner]
+            only_own = constraint.cells - other.cells
+            only_other = other.cells - constraint.cells
+            difference = constraint.mines - other.mines
+
+            if difference == len(only_own):
+                mines, safe = only_own, only_other
+            elif -difference == len(only_other):
+                mines, safe = only_other, only_own
+            else:
+                continue
+
+            if not mines and not safe:
+                continue
+            for cell in mines:
+                self._mark_mine(cell)
+            for cell in safe:
+                self._mark_safe(cell)
+            return
@@ -0,0 +1,321 @@
+import math
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from ..board_mvc.board_model import BoardModel
+from ..board_mvc.board_storage import CLOSE_CODE, OPEN_CODE
+from .constraint_solver import Constraint, ConstraintSolver
+
+
+# constraints of a component as ((cells, mines), ...), the memoization key
+ComponentSignature = FrozenSet[Tuple[FrozenSet[int], int]]
+
+# solved components kept for reuse in the next moves
+_CACHE_LIMIT = 4096
+
+
+@dataclass
+class ComponentSolution:
+    """Solutions of an independent group of frontier constraints
+
+    `ways[k]` is the number of mine layouts of the component with `k` mines
+    and `cell_mines[k][i]` the number of those layouts with a mine on
+    `cells[i]`
+    """
+
+    cells: List[int]
+    ways: Dict[int, int]
+    cell_mines: Dict[int, List[int]]
+
+
+@dataclass
+class MineProbabilities:
+    """Exact mine probability of every unresolved closed cell
+
+    `cells` holds the frontier cells and the cells the solver resolved,
+    every other closed cell has the `interior` probability
+    """
+
+    cells: Dict[int, float]
+    interior: float
+
+    def of(self, index: int) -> float:
+        """Returns the mine probability of the closed cell at `index`"""
+        return self.cells.get(index, self.interior)
+
+
+class ProbabilityEngine:
+    """Computes exact mine probabilities from the visible state of a board
+
+    The frontier constraints of a `ConstraintSolver` are split into
+    independent components. Each component is counted with a dynamic
+    program over its cells, ordered so constraints open and close quickly,
+    which keeps long frontiers polynomial instead of enumerating every
+    layout. The components and the unconstrained interior are combined with
+    binomial weights for the mines left. Component solutions are memoized by
+    their constraints, so unchanged components are reused across moves
+    """
+
+    def __init__(self, board: BoardModel, solver: Optional[ConstraintSolver] = None):
+        self._board = board
+        self._solver = solver if solver is not None else ConstraintSolver(board)
+        self._cache: Dict[ComponentSignature, ComponentSolution] = {}
+
+    @property
+    def solver(self) -> ConstraintSolver:
+        """Returns the solver providing the constraints"""
+        return self._solver
+
+    def compute(self) -> Optional[MineProbabilities]:
+        """Returns the mine probabilities, None if the constraints contradict"""
+        solver = self._solver
+        components = [
+            self._solve(signature)
+            for signature in _split_components(solver.constraints.values())
+        ]
+
+        storage = self._board.storage
+        closed = storage.size - storage.states.count(OPEN_CODE)
+        frontier = sum(len(component.cells) for component in components)
+        interior = closed - frontier - len(solver.mine_cells) - len(solver.safe_cells)
+        mines_left = self._board.mines - len(solver.mine_cells)
+
+        ways = [component.ways for component in components]
+        prefixes = [{0: 1}]
+        for component_ways in ways:
+            prefixes.append(_convolve(prefixes[-1], component_ways))
+        suffixes = [{0: 1}]
+        for component_ways in reversed(ways):
+            suffixes.append(_convolve(suffixes[-1], component_ways))
+        suffixes.reverse()
+
+        total_weight = sum(
+            count * math.comb(interior, mines_left - mines)
+            for mines, count in prefixes[-1].items()
+            if 0 <= mines_left - mines
+        )
+        if total_weight == 0:
+            return None
+
+        probabilities = dict.fromkeys(solver.safe_cells, 0.0)
+        probabilities.update(dict.fromkeys(solver.mine_cells, 1.0))
+        for index, component in enumerate(components):
+            others = _convolve(prefixes[index], suffixes[index + 1])
+            mine_weights = [0] * len(component.cells)
+            for mines, cell_mines in component.cell_mines.items():
+                weight = sum(
+                    count * math.comb(interior, mines_left - mines - other_mines)
+                    for other_mines, count in others.items()
+                    if 0 <= mines_left - mines - other_mines
+                )
+                for position, count in enumerate(cell_mines):
+                    mine_weights[position] += count * weight
+            for cell, weight in zip(component.cells, mine_weights):
+                probabilities[cell] = weight / total_weight
+
+        # comb(n, m) * m / n == comb(n - 1, m - 1)
+        interior_weight = sum(
+            count * math.comb(interior - 1, mines_left - mines - 1)
+            for mines, count in prefixes[-1].items()
+            if 0 < mines_left - mines and interior > 0
+        )
+        return MineProbabilities(probabilities, interior_weight / total_weight)
+
+    def safest_cell(self) -> Optional[int]:
+        """Returns the closed cell least likely to be a mine, None if there is none"""
+        safe_cell = self._solver.next_safe_cell()
+        if safe_cell is not None:
+            return safe_cell
+
+        probabilities = self.compute()
+        if probabilities is None:
+            return None
+
+        best_cell, best_probability = None, 1.0
+        for cell, probability in probabilities.cells.items():
+            if probability < best_probability:
+                best_cell, best_probability = cell, probability
+
+        if best_cell is None or probabilities.interior < best_probability:
+            interior_cell = self._find_interior_cell(probabilities)
+            if interior_cell is not None:
+                return interior_cell
+        return best_cell
+
+    def _find_interior_cell(self, probabilities: MineProbabilities) -> Optional[int]:
+        states = self._board.storage.states
+        index = states.find(CLOSE_CODE)
+        while index != -1 and index in probabilities.cells:
+            index = states.find(CLOSE_CODE, index + 1)
+        return index if index != -1 else None
+
+    def _solve(self, signature: ComponentSignature) -> ComponentSolution:
+        solution = self._cache.get(signature)
+        if solution is None:
+            if len(self._cache) >= _CACHE_LIMIT:
+                self._cache.clear()
+            solution = _solve_component(signature)
+            self._cache[signature] = solution
+        return solution
+
+
+def _split_components(constraints) -> List[ComponentSignature]:
+    """Groups the constraints that share cells, transitively"""
+    constraints: List[Constraint] = [*constraints]
+    cell_owners: Dict[int, List[int]] = {}
+    for owner, constraint in enumerate(constraints):
+        for cell in constraint.cells:
+            cell_owners.setdefault(cell, []).append(owner)
+
+    seen = [False] * len(constraints)
+    components = []
+    for start in range(len(constraints)):
+        if seen[start]:
+            continue
+        seen[start] = True
+        members = [start]
+        pending = [start]
+        while pending:
+            owner = pending.pop()
+            for cell in constraints[owner].cells:
+                for other in cell_owners[cell]:
+                    if not seen[other]:
+                        seen[other] = True
+                        members.append(other)
+                        pending.append(other)
+        components.append(
+            frozenset(
+                (frozenset(constraints[owner].cells), constraints[owner].mines)
+                for owner in members
+            )
+        )
+    return components
+
+
+def _order_cells(signature: ComponentSignature) -> List[int]:
+    """Orders the cells breadth first along the constraints
+
+    Neighbouring cells end up close to each other, so few constraints are
+    partially assigned at any point of the dynamic program
+    """
+    cell_constraints: Dict[int, List[FrozenSet[int]]] = {}
+    for cells, _ in signature:
+        for cell in cells:
+            cell_constraints.setdefault(cell, []).append(cells)
+
+    ordered = []
+    seen = set()
+    for start in sorted(cell_constraints):
+        if start in seen:
+            continue
+        seen.add(start)
+        pending = deque([start])
+        while pending:
+            cell = pending.popleft()
+            ordered.append(cell)
+            for cells in cell_constraints[cell]:
+                for neighbour in sorted(cells - seen):
+                    seen.add(neighbour)
+                    pending.append(neighbour)
+    return ordered
+
+
+def _solve_component(signature: ComponentSignature) -> ComponentSolution:
+    """Counts the mine layouts of a component
+
+    Cells are assigned in order. The state after `i` cells is the number of
+    mines assigned to each constraint that has cells on both sides of `i`,
+    finished constraints are exact and untouched ones are empty, so equal
+    states have equal futures. A forward pass counts the ways to reach each
+    state, a backward pass the ways to finish from it, and their product
+    gives the per-cell counts
+    """
+    cells = _order_cells(signature)
+    position = {cell: index for index, cell in enumerate(cells)}
+    cells_count = len(cells)
+
+    constraints = [
+        (sorted(position[cell] for cell in members), mines)
+        for members, mines in signature
+    ]
+    # constraints of each cell, with the number of their cells placed after it
+    cell_constraints: List[List[Tuple[int, int]]] = [[] for _ in cells]
+    for owner, (members, _) in enumerate(constraints):
+        for rank, cell_position in enumerate(members):
+            cell_constraints[cell_position].append((owner, len(members) - rank - 1))
+    active = [
+        [
+            owner
+            for owner, (members, _) in enumerate(constraints)
+            if members[0] < index <= members[-1]
+        ]
+        for index in range(cells_count + 1)
+    ]
+
+    def transition(index: int, state: tuple, value: int) -> Optional[tuple]:
+        assigned = dict(zip(active[index], state))
+        for owner, remaining in cell_constraints[index]:
+            count = assigned.get(owner, 0) + value
+            mines = constraints[owner][1]
+            if count > mines or count + remaining < mines:
+                return None
+            assigned[owner] = count
+        return tuple(assigned.get(owner, 0) for owner in active[index + 1])
+
+    # forward[i][state][k]: ways to assign the first i cells with k mines
+    forward: List[Dict[tuple, Dict[int, int]]] = [{(): {0: 1}}]
+    edges: List[Dict[tuple, Tuple[Optional[tuple], Optional[tuple]]]] = []
+    for index in range(cells_count):
+        layer: Dict[tuple, Dict[int, int]] = {}
+        layer_edges = {}
+        for state, ways in forward[index].items():
+            targets = (transition(index, state, 0), transition(index, state, 1))
+            layer_edges[state] = targets
+            for value, target in enumerate(targets):
+                if target is None:
+                    continue
+                target_ways = layer.setdefault(target, {})
+                for mines, count in ways.items():
+                    target_ways[mines + value] = (
+                        target_ways.get(mines + value, 0) + count
+                    )
+        forward.append(layer)
+        edges.append(layer_edges)
+
+    # backward[state][k]: ways to assign the remaining cells with k mines
+    backward: List[Dict[tuple, Dict[int, int]]] = [{}] * cells_count + [{(): {0: 1}}]
+    cell_mines: Dict[int, List[int]] = {}
+    for index in range(cells_count - 1, -1, -1):
+        layer = {}
+        for state, targets in edges[index].items():
+            state_ways: Dict[int, int] = {}
+            for value, target in enumerate(targets):
+                target_ways = backward[index + 1].get(target)
+                if not target_ways:
+                    continue
+                for mines, count in target_ways.items():
+                    state_ways[mines + value] = state_ways.get(mines + value, 0) + count
+
+                if value == 1:
+                    for before, before_count in forward[index][state].items():
+                        for after, after_count in target_ways.items():
+                            total = before + 1 + after
+                            counts = cell_mines.setdefault(total, [0] * cells_count)
+                            counts[index] += before_count * after_count
+            if state_ways:
+                layer[state] = state_ways
+        backward[index] = layer
+
+    ways = backward[0].get((), {}) if cells_count else {0: 1}
+    return ComponentSolution(cells, ways, cell_mines)
+
+
+def _convolve(first: Dict[int, int], second: Dict[int, int]) -> Dict[int, int]:
+    result: Dict[int, int] = {}
+    for first_mines, first_count in first.items():
+        for second_mines, second_count in second.items():
+            mines = first_mines + second_mines
+            result[mines] = result.get(mines, 0) + first_count * second_count
+    return result
@@ -0,0 +1,298 @@
+import asyncio
+import json
+import threading
+
+from collections import deque
+from typing import Deque, List, Optional, Sequence, Set
+
+from .board_mvc.board_model import BoardModel
+from .board_mvc.visible_codes import encode_cells, visible_cells
+from .game_mvc import GameController
+
+
+# a client falling this many bytes behind is resent a snapshot instead
+MAX_PENDING_BYTES = 1 << 20
+
+# lets thousands of spectators connect at once
+_BACKLOG = 1024
+
+
+class _Spectator:
+    """Output queue of a connected client"""
+
+    __slots__ = (
+        "writer",
+        "pending",
+        "pending_bytes",
+        "needs_snapshot",
+        "wakeup",
+        "sender",
+        "handler",
+    )
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.pending: Deque[bytes] = deque()
+        self.pending_bytes = 0
+        self.needs_snapshot = True
+        self.wakeup = asyncio.Event()
+        self.sender: Optional[asyncio.Future] = None
+        self.handler: Optional[asyncio.Future] = None
+
+
+class SpectatorServer:
+    """Streams a live game to spectators over TCP or a Unix socket
+
+    Every message is a JSON line. A client receives a `snapshot` of the
+    visible board when it joins, then a `delta` per move with the visible
+    code of every changed cell, the board state and the remaining mines.
+    Cell codes are "." closed, "F" flagged, "?" unsure, "0"-"8" and "*" for
+    opened cells.
+
+    The server runs its own event loop thread and mirrors the visible board,
+    so the game only hands over the changed cells. Each message is
+    serialized once and the same bytes are queued for every client. A
+    client more than `max_pending_bytes` behind drops its queue and is sent
+    a fresh snapshot when it catches up, so slow clients never stall the
+    game or grow memory
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        path: Optional[str] = None,
+        max_pending_bytes: int = MAX_PENDING_BYTES,
+    ):
+        self._host = host
+        self._port = port
+        self._path = path
+        self._max_pending_bytes = max_pending_bytes
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._spectators: Set[_Spectator] = set()
+
+        # owned by the game thread
+        self._board: Optional[BoardModel] = None
+
+        # owned by the event loop thread
+        self._dimensions = (0, 0)
+        self._mines = 0
+        self._state = ""
+        self._remaining_mines = 0
+        self._cells = bytearray()
+        self._sequence = 0
+        self._snapshot: Optional[bytes] = None
+
+    @property
+    def address(self):
+        """Returns the address the server listens on"""
+        return self._server.sockets[0].getsockname()
+
+    @property
+    def spectators(self) -> int:
+        """Returns the number of connected spectators"""
+        return len(self._spectators)
+
+    def start(self):
+        """Starts serving from a background thread"""
+        started = threading.Event()
+
+        def serve():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self._listen())
+            started.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=serve, name="spectators", daemon=True)
+        self._thread.start()
+        started.wait()
+
+    def stop(self):
+        """Disconnects every spectator and stops the server thread"""
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+    def watch_game(self, game: GameController):
+        """Follows the boards of `game`, including the ones it creates later"""
+        game.add_board_listener(self.watch)
+        self.watch(game.board)
+
+    def watch(self, board: BoardModel):
+        """Streams `board` from now on, replacing the board watched so far
+
+        The server must be started first
+        """
+        storage = board.storage
+        if storage is None:
+            raise ValueError("only boards with a flat storage can be watched")
+
+        if self._board is not None:
+            self._board.remove_change_listener(self._on_board_change)
+        self._board = board
+        board.add_change_listener(self._on_board_change)
+
+        width, height = board.dimensions
+        cells = visible_cells(storage)
+        self._loop.call_soon_threadsafe(
+            self._reset,
+            (width, height),
+            board.mines,
+            board.state.value,
+            board.remaining_mines,
+            cells,
+        )
+
+    def _on_board_change(self, indices: Sequence[int]):
+        visuals = encode_cells(self._board.storage, indices)
+        self._loop.call_soon_threadsafe(
+            self._apply_delta,
+            list(indices),
+            visuals,
+            self._board.state.value,
+            self._board.remaining_mines,
+        )
+
+    async def _listen(self):
+        if self._path is not None:
+            self._server = await asyncio.start_unix_server(
+                self._serve_spectator, self._path, backlog=_BACKLOG
+            )
+        else:
+            self._server = await asyncio.start_server(
+                self._serve_spectator, self._host, self._port, backlog=_BACKLOG
+            )
+
+    async def _close(self):
+        self._server.close()
+        # each handler stops its sender and closes its connection
+        handlers = [spectator.handler for spectator in self._spectators]
+        for handler in handlers:
+            handler.cancel()
+        await asyncio.gather(*handlers, return_exceptions=True)
+        await self._server.wait_closed()
+
+    def _reset(
+        self, dimensions, mines: int, state: str, remaining_mines: int, cells: bytes
+    ):
+        self._dimensions = dimensions
+        self._mines = mines
+        self._state = state
+        self._remaining_mines = remaining_mines
+        self._cells = bytearray(cells)
+        self._sequence += 1
+        self._snapshot = None
+
+        # a new board is a snapshot for everyone
+        for spectator in self._spectators:
+            self._resync(spectator)
+
+    def _apply_delta(
+        self, indices: List[int], visuals: bytes, state: str, remaining_mines: int
+    ):
+        cells = self._cells
+        for index, visual in zip(indices, visuals):
+            cells[index] = visual
+        self._state = state
+        self._remaining_mines = remaining_mines
+        self._sequence += 1
+        self._snapshot = None
+
+        message = _encode(
+            {
+                "type": "delta",
+                "seq": self._sequence,
+                "cells": indices,
+                "visuals": visuals.decode("ascii"),
+                "state": state,
+                "remaining_mines": remaining_mines,
+            }
+        )
+        for spectator in self._spectators:
+            self._enqueue(spectator, message)
+
+    def _snapshot_message(self) -> bytes:
+        if self._snapshot is None:
+            width, height = self._dimensions
+            self._snapshot = _encode(
+                {
+                    "type": "snapshot",
+                    "seq": self._sequence,
+                    "width": width,
+                    "height": height,
+                    "mines": self._mines,
+                    "state": self._state,
+                    "remaining_mines": self._remaining_mines,
+                    "cells": self._cells.decode("ascii"),
+                }
+            )
+        return self._snapshot
+
+    def _enqueue(self, spectator: _Spectator, message: bytes):
+        if spectator.needs_snapshot:
+            return
+        if spectator.pending_bytes + len(message) > self._max_pending_bytes:
+            self._resync(spectator)
+            return
+        spectator.pending.append(message)
+        spectator.pending_bytes += len(message)
+        spectator.wakeup.set()
+
+    def _resync(self, spectator: _Spectator):
+        spectator.pending.clear()
+        spectator.pending_bytes = 0
+        spectator.needs_snapshot = True
+        spectator.wakeup.set()
+
+    async def _serve_spectator(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        spectator = _Spectator(writer)
+        spectator.wakeup.set()
+        spectator.handler = asyncio.current_task()
+        self._spectators.add(spectator)
+        spectator.sender = asyncio.ensure_future(self._send(spectator))
+        try:
+            # spectators do not talk, reading only notices the disconnection
+            while await reader.read(4096):
+                pass
+        except (ConnectionError, asyncio.CancelledError):
+            # `_close` cancels the handlers, the stream callback would log
+            # a handler ending cancelled
+            pass
+        finally:
+            self._spectators.discard(spectator)
+            spectator.sender.cancel()
+            writer.close()
+            await asyncio.gather(spectator.sender, return_exceptions=True)
+
+    async def _send(self, spectator: _Spectator):
+        writer = spectator.writer
+        try:
+            while True:
+                await spectator.wakeup.wait()
+                spectator.wakeup.clear()
+
+                if spectator.needs_snapshot:
+                    spectator.needs_snapshot = False
+                    messages = [self._snapshot_message()]
+                else:
+                    messages = [*spectator.pending]
+                spectator.pending.clear()
+                spectator.pending_bytes = 0
+
+                writer.writelines(messages)
+                await writer.drain()
+        except ConnectionError:
+            writer.close()
+
+
+def _encode(message: dict) -> bytes:
+    return json.dumps(message, separators=(",", ":")).encode("ascii") + b"\n"
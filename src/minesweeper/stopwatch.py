@@ -1,45 +1,61 @@
-import threading
 import time
 
+from typing import Optional
+
+
 class Stopwatch:
+    """Measures the time of a game without a thread
+
+    The elapsed time is derived from `time.monotonic()` when it is read, so
+    it does not drift and costs nothing between reads
+    """
+
     def __init__(self):
-        self._seconds = 0
-        self._time_format = ""
-        self._data_lock = threading.Lock()
-        self._stop_event = threading.Event()
-        self._update_thread = None
-        
-    def _update_clock(self):
-        while not self._stop_event.is_set():
-            mins, secs = divmod(self._seconds, 60)
-            hours, mins = divmod(mins, 60)
-            
-            with self._data_lock:
-                self._time_format = f"{hours:02d}:{mins:02d}:{secs:02d}"
-
-            time.sleep(1)
-            
-            with self._data_lock:
-                self._seconds += 1
-        
+        self._start: Optional[float] = None
+        self._stop: Optional[float] = None
+
     def run(self):
-        if self._update_thread is not None:
-            self.stop()
-            
-        with self._data_lock:
-            self._seconds = 0
-        
-        self._stop_event.clear()
-        self._update_thread = threading.Thread(target=self._update_clock)
-        self._update_thread.start()
-        
+        """Starts measuring from zero"""
+        self._start = time.monotonic()
+        self._stop = None
+
+    def resume(self):
+        """Continues measuring after `stop`, leaving out the stopped time
+
+        A stopwatch that never ran starts from zero
+        """
+        if self._start is None:
+            self.run()
+        elif self._stop is not None:
+            self._start += time.monotonic() - self._stop
+            self._stop = None
+
     def stop(self):
-        self._stop_event.set()
-        if self._update_thread is not None:
-            self._update_thread.join()
-            self._update_thread = None 
-    
+        """Freezes the elapsed time"""
+        if self.is_running:
+            self._stop = time.monotonic()
+
+    @property
+    def is_running(self) -> bool:
+        """Returns True between `run` and `stop`"""
+        return self._start is not None and self._stop is None
+
+    @property
+    def elapsed(self) -> float:
+        """Returns the measured time in seconds"""
+        if self._start is None:
+            return 0.0
+        end = self._stop if self._stop is not None else time.monotonic()
+        return end - self._start
+
     @property
     def time_format(self) -> str:
-        with self._data_lock:
-            return self._time_format
+        """Returns the measured time as HH:MM:SS"""
+        return format_time(self.elapsed)
+
+
+def format_time(seconds: float) -> str:
+    """Returns whole `seconds` as HH:MM:SS"""
+    mins, secs = divmod(int(seconds), 60)
+    hours, mins = divmod(mins, 60)
+    return f"{hours:02d}:{mins:02d}:{secs:02d}"
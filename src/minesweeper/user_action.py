@@ -19,7 +19,9 @@ class UserAction:
         keys_by_type = defaultdict(lambda: [])
 
         for action in actions:
-            keys_by_type[action.operation].append(action.key_visual)
+            # keys sharing a visual, like the digits, are listed once
+            if action.key_visual not in keys_by_type[action.operation]:
+                keys_by_type[action.operation].append(action.key_visual)
 
         msgs = []
         for action_type, keys in keys_by_type.items():
@@ -0,0 +1,69 @@
+import itertools
+import random
+
+from typing import Iterable, Iterator, List, Set
+
+from minesweeper.board_mvc.board_generation import fill_cell_types
+from minesweeper.board_mvc.board_model import BoardModel, BoardState
+from minesweeper.board_mvc.board_storage import CLOSE_CODE, MINE_CODE, OPEN_CODE
+
+
+def consistent_layouts(board: BoardModel) -> List[Set[int]]:
+    """Returns every mine layout of the closed cells that the open numbers allow"""
+    storage = board.storage
+    closed = [
+        index for index in range(storage.size) if storage.states[index] != OPEN_CODE
+    ]
+    numbers = [
+        (set(storage.neighbours(index)), storage.types[index])
+        for index in range(storage.size)
+        if storage.states[index] == OPEN_CODE
+    ]
+    layouts = []
+    for layout in itertools.combinations(closed, board.mines):
+        mines = set(layout)
+        if all(len(cells & mines) == count for cells, count in numbers):
+            layouts.append(mines)
+    return layouts
+
+
+def board_with_mines(
+    width: int, height: int, mines: Iterable[int], opened: Iterable[int]
+) -> BoardModel:
+    """Returns a board with the given mines, where the `opened` cells are open"""
+    mines = list(mines)
+    board = BoardModel(width, height, len(mines), seed=0)
+    fill_cell_types(board.storage, mines)
+    for index in opened:
+        board.storage.states[index] = OPEN_CODE
+    board.restore(True)
+    return board
+
+
+def lucky_moves(board: BoardModel, seed: int) -> Iterator[int]:
+    """Opens random safe cells of `board` until it is won, yielding after each
+
+    Cells are picked by peeking at the mines, so the game reaches positions
+    a solver could not, and a random mine or safe cell is flagged now and
+    then. Yields the flat index of each opened cell
+    """
+    rng = random.Random(seed)
+    width, height = board.dimensions
+    board.open(height // 2, width // 2)
+    yield height // 2 * width + width // 2
+
+    storage = board.storage
+    while board.state == BoardState.PLAYING:
+        closed = [
+            index for index in range(storage.size) if storage.states[index] != OPEN_CODE
+        ]
+        if rng.random() < 0.2:
+            board.flag(*divmod(rng.choice(closed), width))
+        index = rng.choice(
+            [index for index in closed if storage.types[index] != MINE_CODE]
+        )
+        # marks cycle back to closed
+        while storage.states[index] != CLOSE_CODE:
+            board.flag(*divmod(index, width))
+        board.open(*divmod(index, width))
+        yield index
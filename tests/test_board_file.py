@@ -0,0 +1,121 @@
+import random
+
+import pytest
+
+from minesweeper.board_mvc import board_file
+from minesweeper.board_mvc.board_file import (
+    _pack_bits,
+    _unpack_bits,
+    load_board,
+    save_board,
+)
+from minesweeper.board_mvc.board_model import BoardModel, BoardState
+from minesweeper.board_mvc.board_storage import MINE_CODE
+from minesweeper.board_mvc.chunked_board_model import ChunkedBoardModel
+
+
+def _assert_same_board(loaded: BoardModel, board: BoardModel):
+    assert loaded.dimensions == board.dimensions
+    assert loaded.mines == board.mines
+    assert loaded.seed == board.seed
+    assert loaded.is_generated == board.is_generated
+    assert loaded.storage.types == board.storage.types
+    assert loaded.storage.states == board.storage.states
+    assert loaded.state == board.state
+    assert loaded.remaining_mines == board.remaining_mines
+    assert loaded.active_row == board.active_row
+    assert loaded.active_col == board.active_col
+
+
+def _played_board(width: int, height: int, mines: int, seed: int) -> BoardModel:
+    rng = random.Random(seed)
+    board = BoardModel(width, height, mines, seed)
+    board.open(height // 2, width // 2)
+    for _ in range(width * height // 4):
+        row, col = rng.randrange(height), rng.randrange(width)
+        # flags, question marks and cleared marks
+        for _ in range(rng.randrange(3)):
+            board.flag(row, col)
+    board.offset_row(rng.randrange(height))
+    board.offset_col(rng.randrange(width))
+    return board
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("width, height, mines", [(9, 9, 10), (30, 16, 99), (7, 3, 5)])
+def test_played_board_round_trips(tmp_path, width, height, mines, seed):
+    board = _played_board(width, height, mines, seed)
+    path = tmp_path / "board.msp"
+
+    save_board(board, path)
+
+    _assert_same_board(load_board(path), board)
+
+
+def test_board_before_the_first_open_round_trips(tmp_path):
+    board = BoardModel(10, 10, 10, seed=3)
+    path = tmp_path / "board.msp"
+
+    save_board(board, path)
+    loaded = load_board(path)
+
+    _assert_same_board(loaded, board)
+    # the mines are still placed around the first open, from the same seed
+    board.open(5, 5)
+    loaded.open(5, 5)
+    assert loaded.storage.types == board.storage.types
+
+
+def test_lost_board_round_trips(tmp_path):
+    board = _played_board(9, 9, 10, seed=1)
+    board.open(*divmod(board.storage.types.find(MINE_CODE), 9))
+    assert board.state == BoardState.LOST
+    path = tmp_path / "board.msp"
+
+    save_board(board, path)
+
+    _assert_same_board(load_board(path), board)
+
+
+def test_truncated_file_is_rejected(tmp_path):
+    path = tmp_path / "board.msp"
+    save_board(_played_board(9, 9, 10, seed=1), path)
+    path.write_bytes(path.read_bytes()[:-1])
+
+    with pytest.raises(ValueError, match="truncated"):
+        load_board(path)
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / "board.msp"
+    path.write_bytes(b"MSWL" + bytes(60))
+
+    with pytest.raises(ValueError, match="board file"):
+        load_board(path)
+
+
+def test_chunked_boards_cannot_be_saved(tmp_path):
+    with pytest.raises(ValueError):
+        save_board(ChunkedBoardModel(100, 100, 10), tmp_path / "board.msp")
+
+
+@pytest.mark.parametrize("size", [0, 1, 7, 8, 9, 1001])
+def test_bits_round_trip(size):
+    rng = random.Random(size)
+    cells = bytes(rng.randrange(2) for _ in range(size))
+
+    packed = _pack_bits(cells)
+
+    assert len(packed) == (size + 7) // 8
+    assert _unpack_bits(packed, size) == cells
+
+
+@pytest.mark.parametrize("width, height", [(30, 16), (7, 3)])
+def test_planes_decoded_in_chunks_round_trip(tmp_path, monkeypatch, width, height):
+    monkeypatch.setattr(board_file, "_DECODE_CHUNK", 3)
+    board = _played_board(width, height, width * height // 5, seed=2)
+    path = tmp_path / "board.msp"
+
+    save_board(board, path)
+
+    _assert_same_board(load_board(path), board)
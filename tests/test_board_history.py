@@ -0,0 +1,187 @@
+import random
+
+from array import array
+
+import pytest
+
+from minesweeper.board_mvc.board_history import BoardHistory, _entry_size
+from minesweeper.board_mvc.board_model import BoardModel, BoardState
+from minesweeper.board_mvc.board_storage import (
+    CLOSE_CODE,
+    FLAG_CODE,
+    MINE_CODE,
+    OPEN_CODE,
+)
+
+
+def _snapshot(board: BoardModel):
+    return (
+        bytes(board.storage.states),
+        board.state,
+        board.remaining_mines,
+        board.three_bv_per_second is None,
+    )
+
+
+def _play(board: BoardModel, seed: int):
+    """Plays opens, flags, question marks and chords, yielding after each move"""
+    rng = random.Random(seed)
+    storage = board.storage
+    width, height = board.dimensions
+    board.open(height // 2, width // 2)
+    yield
+
+    while board.state == BoardState.PLAYING:
+        closed = [i for i in range(storage.size) if storage.states[i] != OPEN_CODE]
+        move = rng.random()
+        if move < 0.3:
+            board.flag(*divmod(rng.choice(closed), width))
+        elif move < 0.5:
+            # flags every mine around an open number, then chords it
+            numbers = [
+                i
+                for i in range(storage.size)
+                if storage.states[i] == OPEN_CODE and 0 < storage.types[i] < MINE_CODE
+            ]
+            number = rng.choice(numbers)
+            for neighbour in storage.neighbours(number):
+                if storage.types[neighbour] == MINE_CODE:
+                    while storage.states[neighbour] != FLAG_CODE:
+                        board.flag(*divmod(neighbour, width))
+                        yield
+            board.chord(*divmod(number, width))
+        elif move < 0.55:
+            # a wrong guess ends the game
+            board.open(*divmod(storage.types.find(MINE_CODE), width))
+        else:
+            index = rng.choice([i for i in closed if storage.types[i] != MINE_CODE])
+            # marks cycle back to closed
+            while storage.states[index] != CLOSE_CODE:
+                board.flag(*divmod(index, width))
+                yield
+            board.open(*divmod(index, width))
+        yield
+
+
+def _mines(board: BoardModel):
+    """Returns the (row, col) of every mine, closed cells once the board is open"""
+    types, width = board.storage.types, board.dimensions[0]
+    return [divmod(i, width) for i in range(len(types)) if types[i] == MINE_CODE]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_undo_and_redo_walk_every_move(seed):
+    board = BoardModel(9, 9, 10, seed)
+    history = BoardHistory(board)
+    snapshots = [_snapshot(board)]
+    for _ in _play(board, seed):
+        if _snapshot(board)[0] != snapshots[-1][0]:
+            snapshots.append(_snapshot(board))
+
+    for snapshot in reversed(snapshots[:-1]):
+        assert history.undo()
+        assert _snapshot(board) == snapshot
+    assert not history.can_undo
+    assert not history.undo()
+
+    for snapshot in snapshots[1:]:
+        assert history.redo()
+        assert _snapshot(board) == snapshot
+    assert not history.can_redo
+    assert not history.redo()
+
+
+def test_a_new_move_drops_the_undone_moves():
+    board = BoardModel(9, 9, 10, seed=1)
+    history = BoardHistory(board)
+    board.open(4, 4)
+    mines = _mines(board)
+    board.flag(*mines[0])
+    board.flag(*mines[0])
+    memory = history.memory
+
+    history.undo()
+    history.undo()
+    assert history.memory == memory
+    assert history.can_redo
+
+    board.flag(*mines[1])
+    assert not history.can_redo
+    assert not history.redo()
+    assert history.undo()
+    assert history.undo()
+    assert not history.can_undo
+    assert board.storage.states.count(CLOSE_CODE) == board.storage.size
+
+
+def test_memory_follows_the_journaled_moves():
+    board = BoardModel(9, 9, 10, seed=2)
+    history = BoardHistory(board)
+    moves = []
+
+    def journal(indices):
+        states = board.storage.states
+        moves.append((array("I", indices), bytes(states[i] for i in indices)))
+
+    board.add_change_listener(journal)
+    board.open(4, 4)
+    mines = _mines(board)
+    board.flag(*mines[0])
+    board.flag(*mines[1])
+
+    assert history.memory == sum(_entry_size(move) for move in moves)
+
+    board.remove_change_listener(journal)
+    history.undo()
+    board.add_change_listener(journal)
+    board.flag(*mines[2])
+    del moves[2]
+    assert history.memory == sum(_entry_size(move) for move in moves)
+
+    history.detach()
+    assert history.memory == 0
+    assert not history.can_undo
+
+
+def test_the_oldest_moves_are_evicted_over_budget():
+    flag_size = _entry_size((array("I", [0]), bytes([FLAG_CODE])))
+    board = BoardModel(9, 9, 10, seed=3)
+    history = BoardHistory(board, budget=2 * flag_size)
+
+    board.open(4, 4)
+    mines = _mines(board)
+    board.flag(*mines[0])
+    board.flag(*mines[1])
+
+    assert history.memory == 2 * flag_size
+    assert history.undo()
+    assert history.undo()
+    # the opening did not fit next to the flags
+    assert not history.undo()
+    assert board.storage.states.count(CLOSE_CODE) < board.storage.size
+
+
+def test_a_move_larger_than_the_budget_is_not_kept():
+    board = BoardModel(9, 9, 10, seed=4)
+    history = BoardHistory(board, budget=1)
+
+    board.open(4, 4)
+
+    assert history.memory == 0
+    assert not history.can_undo
+    assert not history.undo()
+
+
+def test_undoing_a_loss_resumes_the_game():
+    board = BoardModel(9, 9, 10, seed=5)
+    history = BoardHistory(board)
+    board.open(4, 4)
+    opened = board.storage.states.count(OPEN_CODE)
+    board.open(*divmod(board.storage.types.find(MINE_CODE), 9))
+    assert board.state == BoardState.LOST
+
+    history.undo()
+
+    assert board.state == BoardState.PLAYING
+    assert board.storage.states.count(OPEN_CODE) == opened
+    assert board.is_timing
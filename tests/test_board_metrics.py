@@ -0,0 +1,67 @@
+import pytest
+
+from brute_force import board_with_mines
+from minesweeper.board_mvc.board_metrics import compute_metrics, solved_three_bv
+from minesweeper.board_mvc.board_model import BoardModel, BoardState
+from minesweeper.board_mvc.board_storage import MINE_CODE
+
+
+@pytest.mark.parametrize(
+    "width, height, mines, openings, isolated_numbers",
+    [
+        # no mine, the whole board is one opening
+        (3, 3, [], 1, 0),
+        # a mine in the middle, every other cell is a number
+        (3, 3, [4], 0, 8),
+        # a mine splitting a row into two openings
+        (5, 1, [2], 2, 0),
+        # the bottom row opens the middle one, cells 1 and 3 touch no empty cell
+        (4, 3, [0, 2], 1, 2),
+        # two mines walling off the top left corner, cells 3 and 12 are isolated
+        (4, 4, [2, 8], 2, 2),
+    ],
+)
+def test_three_bv_of_hand_counted_boards(
+    width, height, mines, openings, isolated_numbers
+):
+    board = board_with_mines(width, height, mines, [])
+
+    metrics = compute_metrics(board.storage)
+
+    assert metrics.openings == openings
+    assert metrics.isolated_numbers == isolated_numbers
+    assert metrics.three_bv == openings + isolated_numbers
+
+
+def test_an_opening_stopped_by_a_flag_is_not_cleared():
+    board = board_with_mines(4, 3, [0, 2], [])
+    # the flag on cell 9 keeps cells 10 and 11 of the opening closed
+    board.flag(2, 1)
+    board.open(2, 0)
+    assert solved_three_bv(board.storage) == 0
+
+    board.open(0, 3)
+    assert solved_three_bv(board.storage) == 1
+
+    # the flag cycles through the question mark back to closed
+    board.flag(2, 1)
+    board.flag(2, 1)
+    board.open(2, 1)
+    assert solved_three_bv(board.storage) == 2
+
+    board.open(0, 1)
+    assert solved_three_bv(board.storage) == compute_metrics(board.storage).three_bv
+
+
+def test_a_won_board_clears_its_three_bv():
+    board = BoardModel(30, 16, 99, seed=7)
+    board.open(8, 15)
+    storage = board.storage
+    board.open_many(
+        divmod(index, 30)
+        for index in range(storage.size)
+        if storage.types[index] != MINE_CODE and not storage.states[index]
+    )
+
+    assert board.state == BoardState.WON
+    assert solved_three_bv(storage) == board.metrics.three_bv
@@ -0,0 +1,180 @@
+import pytest
+
+from brute_force import board_with_mines
+from minesweeper.board_mvc.board_model import BoardModel, BoardState
+from minesweeper.board_mvc.board_storage import (
+    CLOSE_CODE,
+    MINE_CODE,
+    NOT_SURE_CODE,
+    BoardStorage,
+)
+
+
+def _assert_numbered(storage: BoardStorage):
+    """Checks that every safe cell holds the count of its neighbouring mines"""
+    types = storage.types
+    for index in range(storage.size):
+        if types[index] != MINE_CODE:
+            assert types[index] == sum(
+                types[neighbour] == MINE_CODE for neighbour in storage.neighbours(index)
+            )
+
+
+# the first cell at every corner, on every edge and inside the board
+_FIRST_CELLS = [(0, 0), (0, 8), (8, 0), (8, 8), (0, 4), (4, 0), (8, 4), (4, 8), (4, 4)]
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("row, col", _FIRST_CELLS)
+@pytest.mark.parametrize("mines", [1, 10, 40, 72])
+def test_first_open_and_its_neighbours_are_mine_free(row, col, mines, seed):
+    board = BoardModel(9, 9, mines, seed)
+
+    board.generate(row, col)
+
+    storage = board.storage
+    first = storage.index(row, col)
+    for index in [first, *storage.neighbours(first)]:
+        assert storage.types[index] != MINE_CODE
+    assert storage.types.count(MINE_CODE) == mines
+    _assert_numbered(storage)
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("row, col", _FIRST_CELLS)
+@pytest.mark.parametrize("mines", [73, 78, 80])
+def test_crowded_boards_keep_the_first_open_mine_free(row, col, mines, seed):
+    board = BoardModel(9, 9, mines, seed)
+
+    board.generate(row, col)
+
+    storage = board.storage
+    assert storage.types[storage.index(row, col)] != MINE_CODE
+    assert storage.types.count(MINE_CODE) == mines
+    _assert_numbered(storage)
+
+
+@pytest.mark.parametrize("width, height", [(1, 1), (1, 2), (2, 2)])
+def test_boards_full_of_mines(width, height):
+    board = BoardModel(width, height, width * height, seed=1)
+
+    board.generate(0, 0)
+
+    assert board.storage.types.count(MINE_CODE) == width * height
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("width, height, mines", [(9, 9, 10), (30, 16, 99), (1, 30, 5)])
+def test_pregenerated_boards_match_the_seed(width, height, mines, seed):
+    first = (height - 1, width // 2)
+    board = BoardModel(width, height, mines, seed)
+    pregenerated = BoardModel(width, height, mines, seed)
+
+    pregenerated.pregenerate()
+    board.open(*first)
+    pregenerated.open(*first)
+
+    assert pregenerated.storage.types == board.storage.types
+    assert pregenerated.storage.states == board.storage.states
+
+
+def _batch_board() -> BoardModel:
+    """Returns a 4x3 board with mines on cells 0 and 2
+
+    The bottom row is empty, opening it opens the middle row of numbers
+    """
+    return board_with_mines(4, 3, [0, 2], [])
+
+
+def test_open_many_notifies_once_for_the_batch():
+    board = _batch_board()
+    notified = []
+    board.add_change_listener(notified.append)
+
+    changes = board.open_many([(2, 0), (0, 3)])
+
+    assert sorted(changes.opened) == [3, 4, 5, 6, 7, 8, 9, 10, 11]
+    assert changes.marked == []
+    assert changes.state == BoardState.PLAYING
+    assert [sorted(indices) for indices in notified] == [sorted(changes.opened)]
+
+    changes = board.open_many([(2, 0), (0, 1)])
+
+    assert changes.opened == [1]
+    assert changes.state == BoardState.WON
+
+
+def test_open_many_stops_at_the_first_mine():
+    board = _batch_board()
+
+    changes = board.open_many([(0, 3), (0, 2), (2, 0)])
+
+    assert changes.opened == [3, 2]
+    assert changes.state == BoardState.LOST
+    assert board.storage.states[8] == CLOSE_CODE
+
+
+def test_flag_many_reports_the_toggled_cells():
+    board = _batch_board()
+    board.open(2, 0)
+
+    changes = board.flag_many([(0, 0), (0, 2), (2, 0)])
+
+    # the open cell cannot be flagged
+    assert changes.marked == [0, 2]
+    assert changes.opened == []
+    assert changes.state == BoardState.PLAYING
+    assert board.remaining_mines == 0
+
+    changes = board.flag_many([(0, 0)])
+
+    assert changes.marked == [0]
+    assert board.storage.states[0] == NOT_SURE_CODE
+    assert board.remaining_mines == 1
+
+
+def test_chord_opens_the_unflagged_neighbours():
+    board = board_with_mines(4, 3, [0, 2], [5])
+    board.flag_many([(0, 0), (0, 2)])
+
+    changes = board.chord(1, 1)
+
+    assert sorted(changes.opened) == [1, 4, 6, 7, 8, 9, 10, 11]
+    assert changes.state == BoardState.PLAYING
+    assert board.storage.states[3] == CLOSE_CODE
+
+
+def test_chord_with_the_wrong_flag_count_does_nothing():
+    board = board_with_mines(4, 3, [0, 2], [5])
+    board.flag(0, 0)
+    states = bytes(board.storage.states)
+
+    changes = board.chord(1, 1)
+
+    assert changes.opened == changes.marked == []
+    assert changes.state == BoardState.PLAYING
+    assert board.storage.states == states
+
+    board.flag_many([(0, 1), (0, 2)])
+    assert board.chord(1, 1).opened == []
+
+
+def test_chord_onto_a_mine_loses():
+    board = board_with_mines(4, 3, [0, 2], [5])
+    # the flag meant for the mine on cell 2 is on the safe cell 1
+    board.flag_many([(0, 0), (0, 1)])
+
+    changes = board.chord(1, 1)
+
+    assert 2 in changes.opened
+    assert changes.state == board.state == BoardState.LOST
+
+
+@pytest.mark.parametrize("row, col", [(0, 1), (2, 0), (0, 0)])
+def test_chord_off_an_open_number_does_nothing(row, col):
+    # a closed cell, an open empty cell and an open mine
+    board = board_with_mines(4, 3, [0, 2], [0, 8])
+
+    changes = board.chord(row, col)
+
+    assert changes.opened == changes.marked == []
@@ -0,0 +1,40 @@
+import pytest
+
+from minesweeper.configurations_mvc.configuraion_model import (
+    MAX_GRID_SIZE,
+    MAX_MINES,
+    MIN_GRID_SIZE,
+    MIN_MINES,
+    ConfigurationModel,
+)
+
+
+@pytest.mark.parametrize(
+    "config, expected",
+    [
+        ((9, 9, 10), (9, 9, 10)),
+        # a chunked board
+        ((100_000, 100_000, 10**9), (MAX_GRID_SIZE, MAX_GRID_SIZE, MAX_MINES)),
+        ((100_000, 20, 100), (MAX_GRID_SIZE, 20, 100)),
+        ((1, 1, 0), (MIN_GRID_SIZE, MIN_GRID_SIZE, MIN_MINES)),
+        # a cell is kept free of mines
+        ((5, 5, 25), (5, 5, 24)),
+    ],
+)
+def test_set_configuration_clamps_to_the_ranges(config, expected):
+    model = ConfigurationModel()
+
+    model.set_configuration(*config)
+
+    assert model.get_configuration() == expected
+
+
+def test_a_clamped_configuration_stays_in_range_when_edited():
+    model = ConfigurationModel()
+    model.set_configuration(100_000, 100_000, 10**9)
+
+    model.change_field(1)
+
+    width, height, mines = model.get_configuration()
+    assert width == height == MAX_GRID_SIZE
+    assert mines == MAX_MINES
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from minesweeper.board_mvc.board_generation import fill_cell_types, sample_mine_indices
+from minesweeper.board_mvc.board_storage import (
+    CLOSE_CODE,
+    EMPTY_CODE,
+    FLAG_CODE,
+    OPEN_CODE,
+    BoardStorage,
+)
+from minesweeper.board_mvc.flood_fill import open_region
+
+
+def _random_storage(width: int, height: int, mines: int, seed: int) -> BoardStorage:
+    rng = random.Random(seed)
+    storage = BoardStorage(width, height)
+    fill_cell_types(storage, sample_mine_indices(storage.size, mines, rng=rng))
+    for index in rng.sample(range(storage.size), storage.size // 10):
+        storage.states[index] = FLAG_CODE
+    return storage
+
+
+def _reference_region(storage: BoardStorage, start: int) -> set:
+    """Returns the cells a plain breadth first fill opens from `start`"""
+    if storage.states[start] != CLOSE_CODE:
+        return set()
+    region = {start}
+    pending = [start] if storage.types[start] == EMPTY_CODE else []
+    while pending:
+        for neighbour in storage.neighbours(pending.pop()):
+            if neighbour in region or storage.states[neighbour] != CLOSE_CODE:
+                continue
+            region.add(neighbour)
+            if storage.types[neighbour] == EMPTY_CODE:
+                pending.append(neighbour)
+    return region
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("width, height, mines", [(9, 9, 10), (31, 17, 40), (1, 40, 3)])
+def test_opens_the_same_region_as_a_plain_fill(width, height, mines, seed):
+    storage = _random_storage(width, height, mines, seed)
+    start = random.Random(seed).randrange(storage.size)
+    expected = _reference_region(storage, start)
+    states = bytearray(storage.states)
+
+    opened = open_region(storage, start)
+
+    assert len(opened) == len(set(opened))
+    assert set(opened) == expected
+    for index in range(storage.size):
+        expected_code = OPEN_CODE if index in expected else states[index]
+        assert storage.states[index] == expected_code
+
+
+def test_opens_a_number_alone():
+    storage = BoardStorage(3, 3)
+    fill_cell_types(storage, [0])
+
+    assert open_region(storage, 1) == [1]
+    assert storage.states.count(OPEN_CODE) == 1
+
+
+def test_opens_nothing_on_an_open_or_flagged_cell():
+    storage = BoardStorage(3, 3)
+    fill_cell_types(storage, [])
+    storage.states[4] = FLAG_CODE
+
+    assert open_region(storage, 4) == []
+    assert len(open_region(storage, 0)) == 8
+    assert open_region(storage, 0) == []
+
+
+def test_fills_a_large_region_without_recursion():
+    storage = BoardStorage(1000, 1000)
+    fill_cell_types(storage, [])
+
+    opened = open_region(storage, 500_500)
+
+    assert len(opened) == storage.size
+    assert storage.states.count(OPEN_CODE) == storage.size
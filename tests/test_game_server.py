@@ -0,0 +1,186 @@
+import io
+import json
+
+import pytest
+
+from minesweeper import game_server
+from minesweeper.board_mvc.board_model import BoardModel
+from minesweeper.board_mvc.board_storage import MINE_CODE
+from minesweeper.game_server import GameServer, serve_stdio
+
+
+def _request(server: GameServer, request) -> dict:
+    return json.loads(server.handle_line(json.dumps(request).encode()))
+
+
+def _new(server: GameServer, **fields) -> dict:
+    return _request(
+        server, {"op": "new", "width": 9, "height": 9, "mines": 10, **fields}
+    )
+
+
+def _numbered_cell(board: BoardModel) -> int:
+    """Returns an open number of `board` with a closed safe neighbour"""
+    storage = board.storage
+    for index in range(storage.size):
+        if storage.states[index] and 0 < storage.types[index] < MINE_CODE:
+            if any(
+                not storage.states[neighbour] and storage.types[neighbour] != MINE_CODE
+                for neighbour in storage.neighbours(index)
+            ):
+                return index
+    raise AssertionError("no open number on the frontier")
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        b"not json",
+        b"[1, 2]",
+        b'{"op": []}',
+        b'{"op": {"a": 1}}',
+        b'{"op": "nope"}',
+        b'{"op": "new", "width": true, "height": 9, "mines": 10}',
+        b'{"op": "new", "width": 9, "height": 9, "mines": 81}',
+        b'{"op": "new", "width": 9, "height": 9, "mines": 10, "seed": "1"}',
+        b'{"op": "new", "width": 9, "height": 9, "mines": 10, "seed": false}',
+        b'{"op": "open", "session": true, "cells": [[0, 0]]}',
+        b'{"op": "open", "session": 99, "cells": [[0, 0]]}',
+    ],
+)
+def test_malformed_requests_are_answered_with_an_error(line):
+    server = GameServer()
+    _new(server)
+
+    response = json.loads(server.handle_line(line))
+
+    assert response["ok"] is False
+    assert response["error"]
+
+
+@pytest.mark.parametrize(
+    "cells", [[[True, 0]], [[0, 9]], [[-1, 0]], [[0]], [0], "00", None]
+)
+def test_malformed_cells_are_rejected(cells):
+    server = GameServer()
+    session = _new(server)["session"]
+
+    response = _request(server, {"op": "open", "session": session, "cells": cells})
+
+    assert response["ok"] is False
+
+
+def test_the_request_id_is_echoed():
+    server = GameServer()
+
+    assert _request(server, {"op": "stats", "id": "a"})["id"] == "a"
+    assert _request(server, {"op": "nope", "id": 7})["id"] == 7
+
+
+def test_stdio_survives_bad_lines():
+    stdin = io.BytesIO(b'{"op": []}\n\n{"op": "stats"}\n')
+    stdout = io.BytesIO()
+
+    serve_stdio(GameServer(), stdin, stdout)
+
+    responses = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    assert [response["ok"] for response in responses] == [False, True]
+
+
+def test_session_limits():
+    server = GameServer(max_sessions=2, max_cells=100)
+
+    assert _new(server, width=12)["ok"] is False
+    first = _new(server)["session"]
+    assert _new(server)["ok"]
+    assert _new(server)["error"] == "too many sessions"
+
+    _request(server, {"op": "close", "session": first})
+    assert _new(server)["ok"]
+    assert server.sessions == 2
+
+
+def test_total_cells_cap():
+    server = GameServer(max_total_cells=200)
+
+    first = _new(server)["session"]
+    assert _new(server)["ok"]
+    assert _new(server)["error"] == "too many cells in play"
+
+    _request(server, {"op": "close", "session": first})
+    assert _new(server)["ok"]
+
+
+def test_idle_sessions_are_evicted(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(game_server.time, "monotonic", lambda: now[0])
+    server = GameServer(idle_timeout=10.0, max_total_cells=162)
+    first = _new(server)["session"]
+    now[0] += 6
+    second = _new(server)["session"]
+    now[0] += 6
+
+    # the first session is evicted, its cells are free again
+    assert _new(server)["ok"]
+    assert _request(server, {"op": "view", "session": first})["ok"] is False
+    assert _request(server, {"op": "view", "session": second})["ok"]
+    assert _request(server, {"op": "stats"})["evicted"] == 1
+
+
+def test_open_and_flag_responses():
+    server = GameServer()
+    created = _new(server, seed=5)
+    session = created["session"]
+    board = BoardModel(9, 9, 10, created["seed"])
+    board.open(4, 4)
+
+    opened = _request(server, {"op": "open", "session": session, "cells": [[4, 4]]})
+
+    storage = board.storage
+    assert opened["ok"] and opened["state"] == "Playing"
+    assert sorted(opened["cells"]) == [
+        index for index in range(storage.size) if storage.states[index]
+    ]
+    assert _request(server, {"op": "view", "session": session})["cells"] == (
+        game_server.visible_cells(storage).decode("ascii")
+    )
+
+    mine = storage.types.find(MINE_CODE)
+    flagged = _request(
+        server, {"op": "flag", "session": session, "cells": [divmod(mine, 9)]}
+    )
+    assert flagged["cells"] == [mine]
+    assert flagged["visuals"] == "F"
+    assert flagged["remaining_mines"] == 9
+
+
+def test_chord_responses():
+    server = GameServer()
+    created = _new(server, seed=5)
+    session = created["session"]
+    board = BoardModel(9, 9, 10, created["seed"])
+    board.open(4, 4)
+    _request(server, {"op": "open", "session": session, "cells": [[4, 4]]})
+
+    number = _numbered_cell(board)
+    row, col = divmod(number, 9)
+    chord = {"op": "chord", "session": session, "row": row, "col": col}
+    assert _request(server, chord)["cells"] == []
+
+    mines = [
+        neighbour
+        for neighbour in board.storage.neighbours(number)
+        if board.storage.types[neighbour] == MINE_CODE
+    ]
+    cells = [divmod(mine, 9) for mine in mines]
+    _request(server, {"op": "flag", "session": session, "cells": cells})
+    board.flag_many(cells)
+    expected = board.chord(row, col)
+
+    chorded = _request(server, chord)
+    assert expected.opened
+    assert chorded["cells"] == expected.opened
+    assert chorded["state"] == expected.state.value
+
+    chord["row"] = True
+    assert _request(server, chord)["ok"] is False
@@ -0,0 +1,76 @@
+import os
+import sys
+import threading
+
+import pytest
+
+from minesweeper.input_backend import PosixKeyReader
+
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="POSIX terminals only")
+
+
+@pytest.fixture
+def pipe():
+    """Returns a key reader on a pipe and the file writing to it"""
+    read_fd, write_fd = os.pipe()
+    with os.fdopen(read_fd, "rb", buffering=0) as stream:
+        with os.fdopen(write_fd, "wb", buffering=0) as writer:
+            with PosixKeyReader(stream) as reader:
+                yield reader, writer
+
+
+def _read_keys(reader: PosixKeyReader, count: int):
+    return [reader.read_key(1.0) for _ in range(count)]
+
+
+@pytest.mark.parametrize(
+    "data, keys",
+    [
+        (b"wa", [b"w", b"a"]),
+        (b"\x1b[A\x1b[1;5C", [b"\x1b[A", b"\x1b[1;5C"]),
+        (b"\x1bOBs", [b"\x1bOB", b"s"]),
+        # an Esc press followed by other keys
+        (b"\x1bw", [b"\x1b", b"w"]),
+        (b"\x1b\x1b[B", [b"\x1b", b"\x1b[B"]),
+    ],
+)
+def test_keys_and_sequences_are_split(pipe, data, keys):
+    reader, writer = pipe
+    writer.write(data)
+
+    assert _read_keys(reader, len(keys)) == keys
+    assert reader.read_key(0) is None
+
+
+@pytest.mark.parametrize(
+    "head, tail", [(b"\x1b", b"[A"), (b"\x1b[1;", b"5C"), (b"\x1bO", b"B")]
+)
+def test_a_sequence_split_across_reads_is_one_key(pipe, head, tail):
+    reader, writer = pipe
+    writer.write(head)
+    timer = threading.Timer(0.01, writer.write, (tail,))
+    timer.start()
+
+    try:
+        assert reader.read_key(1.0) == head + tail
+    finally:
+        timer.join()
+
+
+def test_a_lone_esc_is_returned_after_the_wait(pipe):
+    reader, writer = pipe
+    writer.write(b"\x1b")
+
+    assert reader.read_key(1.0) == b"\x1b"
+    assert reader.read_key(0) is None
+
+
+def test_a_closed_stream_ends_the_input(pipe):
+    reader, writer = pipe
+    writer.write(b"\x1b")
+    writer.close()
+
+    assert reader.read_key(1.0) == b"\x1b"
+    with pytest.raises(EOFError):
+        reader.read_key(1.0)
@@ -0,0 +1,101 @@
+import random
+
+import pytest
+
+from minesweeper import console_utils, replay as replay_module
+from minesweeper.board_mvc.board_storage import OPEN_CODE
+from minesweeper.input_log import InputLogWriter, SessionInfo, read_input_log
+from minesweeper.replay import create_game, replay
+
+# keys of the board page, without the ones leaving it
+_KEYS = [b"w", b"a", b"s", b"d", b"c", b"\x20", b"u", b"r", b"h", None]
+
+
+@pytest.fixture(autouse=True)
+def _silent_console():
+    console_utils.set_output_enabled(False)
+    yield
+    console_utils.set_output_enabled(True)
+
+
+@pytest.mark.parametrize(
+    "session",
+    [SessionInfo((9, 9, 10), 0), SessionInfo((3000, 3000, 10), (1 << 64) - 1, True)],
+)
+def test_keys_round_trip(tmp_path, session):
+    keys = [b"w", None, b"\x1b[A", b"\x1bOB", b"\x20", None]
+    path = tmp_path / "keys.log"
+
+    with InputLogWriter(path, session) as input_log:
+        for key in keys:
+            input_log.record(key)
+
+    read_session, records = read_input_log(path)
+    records = list(records)
+    assert read_session == session
+    assert [key for _, key in records] == keys
+    times = [timestamp for timestamp, _ in records]
+    assert times == sorted(times)
+
+
+def test_an_incomplete_last_record_is_dropped(tmp_path):
+    path = tmp_path / "keys.log"
+    with InputLogWriter(path, SessionInfo((9, 9, 10), 1)) as input_log:
+        input_log.record(b"w")
+        input_log.record(b"\x1b[A")
+    path.write_bytes(path.read_bytes()[:-1])
+
+    _, records = read_input_log(path)
+
+    assert [key for _, key in records] == [b"w"]
+
+
+@pytest.mark.parametrize("header", [b"", b"MSWL", b"MSWB" + bytes(28)])
+def test_other_files_are_rejected(tmp_path, header):
+    path = tmp_path / "keys.log"
+    path.write_bytes(header)
+
+    with pytest.raises(ValueError, match="input log"):
+        read_input_log(path)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_replay_reaches_the_same_board(tmp_path, monkeypatch, seed):
+    rng = random.Random(seed)
+    session = SessionInfo((9, 9, 10), seed)
+    path = tmp_path / "keys.log"
+
+    keys = [rng.choice(_KEYS) for _ in range(300)]
+    # the next board comes from the seed of the session too
+    keys[20] = b"n"
+
+    game = create_game(session)
+    with InputLogWriter(path, session) as input_log:
+        game.run(None)
+        for key in keys:
+            input_log.record(key)
+            game.run(key)
+        # the exit key ends the replay
+        input_log.record(b"\x1b")
+
+    replayed = []
+
+    def create_replayed_game(*args):
+        replayed.append(create_game(*args))
+        return replayed[-1]
+
+    monkeypatch.setattr(replay_module, "create_game", create_replayed_game)
+    report = replay(path, render=False)
+
+    board, replayed_board = game.board, replayed[0].board
+    assert report.keys == len(keys) - keys.count(None) + 1
+    assert report.frames == len(keys) + 1
+    assert board.storage.states.count(OPEN_CODE)
+    assert replayed_board.seed == board.seed
+    assert replayed_board.storage.types == board.storage.types
+    assert replayed_board.storage.states == board.storage.states
+    assert replayed_board.state == board.state
+    assert (replayed_board.active_row, replayed_board.active_col) == (
+        board.active_row,
+        board.active_col,
+    )
@@ -0,0 +1,49 @@
+import pytest
+
+from minesweeper.board_mvc.board_model import BoardModel
+from minesweeper.board_mvc.chunked_board_model import ChunkedBoardModel
+from minesweeper.instrumentation import Histogram, Instrumentation
+
+
+@pytest.fixture
+def instrumentation():
+    instrumentation = Instrumentation()
+    instrumentation.install()
+    yield instrumentation
+    instrumentation.uninstall()
+
+
+@pytest.mark.parametrize(
+    "board", [BoardModel(9, 9, 10), ChunkedBoardModel(1000, 1000, 1000)]
+)
+def test_every_cursor_move_is_recorded_once(instrumentation, board):
+    board.offset_row(1)
+    board.offset_col(1)
+    board.offset_col(-1)
+
+    histograms = instrumentation.histograms
+    assert histograms["board.offset_row"].count == 1
+    assert histograms["board.offset_col"].count == 2
+
+
+def test_uninstall_restores_the_board():
+    offset_row = BoardModel.offset_row
+    instrumentation = Instrumentation()
+    instrumentation.install()
+    instrumentation.uninstall()
+
+    BoardModel(9, 9, 10).offset_row(1)
+
+    assert BoardModel.offset_row is offset_row
+    assert not instrumentation.histograms
+
+
+def test_histogram_percentiles():
+    histogram = Histogram("us")
+    for value in [1, 2, 3, 100, 1000]:
+        histogram.record(value)
+
+    report = histogram.to_dict()
+    assert (report["count"], report["min"], report["max"]) == (5, 1, 1000)
+    assert histogram.percentile(0.5) == 4
+    assert histogram.percentile(0.99) == 1000
@@ -0,0 +1,126 @@
+import pytest
+
+from brute_force import consistent_layouts
+from minesweeper import no_guess
+from minesweeper.board_mvc.board_model import BoardModel, BoardState
+from minesweeper.board_mvc.board_storage import OPEN_CODE
+from minesweeper.no_guess import (
+    NoGuessBoardFactory,
+    NoGuessCache,
+    first_cell,
+    is_no_guess,
+    search_no_guess,
+)
+
+
+def _clears_by_brute_force(width: int, height: int, mines: int, seed: int) -> bool:
+    """Returns True if opening the cells safe in every layout clears the board"""
+    board = BoardModel(width, height, mines, seed)
+    board.open(*divmod(first_cell(width, height), width))
+    storage = board.storage
+    while board.state == BoardState.PLAYING:
+        layouts = consistent_layouts(board)
+        safe = [
+            index
+            for index in range(storage.size)
+            if storage.states[index] != OPEN_CODE
+            and not any(index in layout for layout in layouts)
+        ]
+        if not safe:
+            return False
+        board.open_many(divmod(index, width) for index in safe)
+    return board.state == BoardState.WON
+
+
+def test_cache_takes_the_last_board_added(tmp_path):
+    cache = NoGuessCache(str(tmp_path))
+    config = (9, 9, 10)
+
+    assert cache.take(config) is None
+    cache.add(config, [(1, 40), (2, 40)])
+    cache.add(config, [(3, 40)])
+
+    assert cache.count(config) == 3
+    assert cache.count((9, 9, 11)) == 0
+    assert [cache.take(config) for _ in range(4)] == [(3, 40), (2, 40), (1, 40), None]
+    assert cache.count(config) == 0
+
+
+def test_cache_skips_a_partial_record(tmp_path):
+    cache = NoGuessCache(str(tmp_path))
+    config = (9, 9, 10)
+    cache.add(config, [(1, 40), (2, 40)])
+    path = tmp_path / "9x9x10.seeds"
+    path.write_bytes(path.read_bytes() + b"\x07\x07\x07")
+
+    assert cache.count(config) == 2
+    assert cache.take(config) == (2, 40)
+    assert path.stat().st_size == path.stat().st_size // 12 * 12
+    assert cache.take(config) == (1, 40)
+    assert cache.take(config) is None
+
+
+def test_cache_appends_after_a_partial_record(tmp_path):
+    cache = NoGuessCache(str(tmp_path))
+    config = (9, 9, 10)
+    cache.add(config, [(1, 40)])
+    path = tmp_path / "9x9x10.seeds"
+    path.write_bytes(path.read_bytes() + b"\x07\x07\x07")
+
+    cache.add(config, [(2, 40)])
+
+    assert [cache.take(config) for _ in range(3)] == [(2, 40), (1, 40), None]
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_no_guess_boards_are_cleared_by_brute_force(seed):
+    # the solver misses some deductions, so its boards are a subset
+    if is_no_guess(5, 5, 5, seed, first_cell(5, 5)):
+        assert _clears_by_brute_force(5, 5, 5, seed)
+
+
+def test_dense_boards_can_need_a_guess():
+    verdicts = {is_no_guess(8, 8, 15, seed, first_cell(8, 8)) for seed in range(40)}
+
+    assert verdicts == {True, False}
+
+
+def test_boards_without_mines_need_no_guess():
+    assert is_no_guess(9, 9, 0, 1, first_cell(9, 9))
+
+
+def test_search_returns_no_guess_boards():
+    boards = search_no_guess((9, 9, 10), 3, processes=1, seed=1)
+
+    assert len(boards) == 3
+    for seed, first in boards:
+        assert first == first_cell(9, 9)
+        assert is_no_guess(9, 9, 10, seed, first)
+
+
+def test_factory_opens_the_first_cell(tmp_path):
+    cache = NoGuessCache(str(tmp_path))
+    config = (9, 9, 10)
+    cache.add(config, search_no_guess(config, 1, processes=1, seed=2))
+
+    board = NoGuessBoardFactory(cache)(9, 9, 10, seed=0)
+
+    assert cache.count(config) == 0
+    assert (board.active_row, board.active_col) == (4, 4)
+    assert board.storage.states[first_cell(9, 9)] == OPEN_CODE
+
+
+def test_factory_searches_a_board_when_the_cache_is_empty(tmp_path):
+    board = NoGuessBoardFactory(NoGuessCache(str(tmp_path)))(9, 9, 10, seed=3)
+
+    assert is_no_guess(9, 9, 10, board.seed, first_cell(9, 9))
+    assert board.storage.states[first_cell(9, 9)] == OPEN_CODE
+
+
+def test_factory_tells_when_it_serves_a_random_board(tmp_path, monkeypatch, capsys):
+    # boards this dense almost always need a guess
+    monkeypatch.setattr(no_guess, "_SEARCH_CANDIDATES", 64)
+    board = NoGuessBoardFactory(NoGuessCache(str(tmp_path)))(8, 8, 45, seed=3)
+
+    assert not board.is_generated
+    assert "may need guessing" in capsys.readouterr().err
@@ -0,0 +1,56 @@
+import pytest
+
+from brute_force import board_with_mines, consistent_layouts, lucky_moves
+from minesweeper.board_mvc.board_model import BoardModel, BoardState
+from minesweeper.board_mvc.board_storage import OPEN_CODE
+from minesweeper.solver import ProbabilityEngine
+
+
+def _assert_exact(board: BoardModel, engine: ProbabilityEngine):
+    layouts = consistent_layouts(board)
+    probabilities = engine.compute()
+    storage = board.storage
+    for index in range(storage.size):
+        if storage.states[index] == OPEN_CODE:
+            continue
+        expected = sum(index in layout for layout in layouts) / len(layouts)
+        assert probabilities.of(index) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("seed", range(15))
+@pytest.mark.parametrize("width, height, mines", [(5, 5, 4), (6, 4, 5), (8, 2, 3)])
+def test_probabilities_match_brute_force(width, height, mines, seed):
+    board = BoardModel(width, height, mines, seed)
+    engine = None
+    for _ in lucky_moves(board, seed):
+        if engine is None:
+            engine = ProbabilityEngine(board)
+        if board.state == BoardState.PLAYING:
+            _assert_exact(board, engine)
+
+
+def test_interior_shares_the_mines_left():
+    # an open "1" in the corner, the 3 other mines are among the 21 cells
+    # it does not touch
+    board = board_with_mines(5, 5, [1, 20, 22, 24], [0])
+    probabilities = ProbabilityEngine(board).compute()
+
+    assert probabilities.interior == pytest.approx(3 / 21)
+    for index in (1, 5, 6):
+        assert probabilities.of(index) == pytest.approx(1 / 3)
+
+
+def test_safest_cell_prefers_a_proven_safe_cell():
+    board = board_with_mines(3, 2, [0, 2], [3, 4, 5])
+
+    assert ProbabilityEngine(board).safest_cell() == 1
+
+
+def test_cached_components_give_the_same_probabilities():
+    board = board_with_mines(3, 3, [0, 8], [3, 4, 5])
+    engine = ProbabilityEngine(board)
+
+    first = engine.compute()
+    second = engine.compute()
+
+    assert first == second
@@ -0,0 +1,113 @@
+import random
+
+import pytest
+
+from minesweeper import score_board, stopwatch
+from minesweeper.score_board import _RECORD, ScoreBoard
+from minesweeper.stopwatch import Stopwatch, format_time
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Returns a one item list holding the time read by the score board and stopwatch"""
+    now = [1000.0]
+    monkeypatch.setattr(score_board.time, "time", lambda: now[0])
+    monkeypatch.setattr(stopwatch.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("top", [1, 3, 10])
+def test_top_keeps_the_fastest_games_in_order(tmp_path, clock, top, seed):
+    rng = random.Random(seed)
+    scores = ScoreBoard(tmp_path / "scores", top)
+    games = []
+    for _ in range(50):
+        clock[0] += 1
+        # few distinct times, so ties are broken by the earlier win
+        seconds = float(rng.randrange(10))
+        games.append((seconds, clock[0]))
+        scores.add((9, 9, 10), seconds)
+
+    best = scores.top((9, 9, 10))
+
+    assert [(score.seconds, score.won_at) for score in best] == sorted(games)[:top]
+    assert {score.config for score in best} == {(9, 9, 10)}
+    scores.close()
+
+
+def test_configurations_are_ranked_apart(tmp_path, clock):
+    scores = ScoreBoard(tmp_path / "scores")
+    scores.add((9, 9, 10), 30.0)
+    scores.add((16, 16, 40), 10.0)
+    scores.add((9, 9, 10), 20.0)
+
+    assert [score.seconds for score in scores.top((9, 9, 10))] == [20.0, 30.0]
+    assert [score.seconds for score in scores.top((16, 16, 40))] == [10.0]
+    assert scores.top((30, 16, 99)) == []
+    scores.close()
+
+
+def test_scores_are_read_back(tmp_path, clock):
+    path = tmp_path / "scores"
+    scores = ScoreBoard(path, top=2)
+    for seconds in (5.0, 3.0, 4.0, 1.0):
+        clock[0] += 1
+        scores.add((9, 9, 10), seconds)
+    expected = scores.top((9, 9, 10))
+    scores.close()
+
+    assert ScoreBoard(path, top=2).top((9, 9, 10)) == expected
+    # every game is kept in the file, a larger top finds them all
+    assert len(ScoreBoard(path).top((9, 9, 10))) == 4
+
+
+def test_truncated_file_is_recovered(tmp_path, clock):
+    path = tmp_path / "scores"
+    scores = ScoreBoard(path)
+    scores.add((9, 9, 10), 5.0)
+    scores.add((9, 9, 10), 3.0)
+    scores.close()
+    # a write interrupted halfway through the third record
+    with open(path, "ab") as file:
+        file.write(_RECORD.pack(9, 9, 10, 1.0, clock[0])[:-5])
+
+    scores = ScoreBoard(path)
+    assert [score.seconds for score in scores.top((9, 9, 10))] == [3.0, 5.0]
+    assert path.stat().st_size == 2 * _RECORD.size
+
+    scores.add((9, 9, 10), 4.0)
+    scores.close()
+
+    scores = ScoreBoard(path)
+    assert [score.seconds for score in scores.top((9, 9, 10))] == [3.0, 4.0, 5.0]
+    scores.close()
+
+
+def test_stopwatch_leaves_out_the_stopped_time(clock):
+    watch = Stopwatch()
+    assert watch.elapsed == 0.0
+    assert not watch.is_running
+
+    watch.resume()
+    clock[0] += 5
+    watch.stop()
+    clock[0] += 100
+    assert watch.elapsed == 5.0
+    assert not watch.is_running
+
+    watch.resume()
+    clock[0] += 2
+    assert watch.is_running
+    assert watch.elapsed == 7.0
+
+    watch.run()
+    clock[0] += 1
+    assert watch.elapsed == 1.0
+
+
+@pytest.mark.parametrize(
+    "seconds, text", [(0, "00:00:00"), (59.9, "00:00:59"), (3661, "01:01:01")]
+)
+def test_format_time(seconds, text):
+    assert format_time(seconds) == text
@@ -0,0 +1,69 @@
+import pytest
+
+from brute_force import board_with_mines, consistent_layouts, lucky_moves
+from minesweeper.board_mvc.board_model import BoardModel, BoardState
+from minesweeper.solver import ConstraintSolver
+
+
+def _assert_sound(board: BoardModel, solver: ConstraintSolver):
+    layouts = consistent_layouts(board)
+    assert layouts
+    for layout in layouts:
+        assert not layout & solver.safe_cells
+        assert solver.mine_cells <= layout
+
+
+@pytest.mark.parametrize("seed", range(15))
+@pytest.mark.parametrize("width, height, mines", [(5, 5, 4), (6, 4, 5), (8, 2, 3)])
+def test_deductions_hold_in_every_consistent_layout(width, height, mines, seed):
+    board = BoardModel(width, height, mines, seed)
+    solver = None
+    for _ in lucky_moves(board, seed):
+        if solver is None:
+            solver = ConstraintSolver(board)
+        if board.state == BoardState.PLAYING:
+            _assert_sound(board, solver)
+
+
+def test_pairwise_rule_solves_one_two_one():
+    # closed top row over an open "1 2 1"
+    board = board_with_mines(3, 2, [0, 2], [3, 4, 5])
+    solver = ConstraintSolver(board)
+
+    assert solver.mine_cells == {0, 2}
+    assert solver.safe_cells == {1}
+
+
+def test_single_cell_rule():
+    # an open "1" in a corner with a single closed neighbour left
+    board = board_with_mines(2, 2, [3], [0, 1, 2])
+    solver = ConstraintSolver(board)
+
+    assert solver.mine_cells == {3}
+    assert not solver.safe_cells
+
+
+def test_flags_are_ignored():
+    board = board_with_mines(3, 2, [0, 2], [3, 4, 5])
+    board.flag(0, 1)
+    solver = ConstraintSolver(board)
+
+    assert solver.safe_cells == {1}
+
+
+def test_opened_safe_cells_are_no_longer_reported():
+    board = board_with_mines(3, 2, [0, 2], [3, 4, 5])
+    solver = ConstraintSolver(board)
+    board.open(0, 1)
+
+    assert not solver.safe_cells
+    assert solver.next_safe_cell() is None
+
+
+def test_detach_stops_following_the_board():
+    board = board_with_mines(3, 2, [0, 2], [3, 4, 5])
+    solver = ConstraintSolver(board)
+    solver.detach()
+    board.open(0, 1)
+
+    assert solver.safe_cells == {1}
@@ -0,0 +1,80 @@
+import asyncio
+import json
+import socket
+import time
+
+import pytest
+
+from minesweeper.board_mvc.board_model import BoardModel
+from minesweeper.spectator_server import SpectatorServer
+
+
+@pytest.fixture
+def server():
+    spectator_server = SpectatorServer()
+    spectator_server.start()
+    yield spectator_server
+    spectator_server.stop()
+
+
+def _connect(server: SpectatorServer):
+    """Returns a socket connected to `server` and a file reading its messages"""
+    client = socket.create_connection(server.address[:2], timeout=5)
+    return client, client.makefile("rb")
+
+
+def _pending_tasks(server: SpectatorServer) -> int:
+    async def count() -> int:
+        return len(asyncio.all_tasks() - {asyncio.current_task()})
+
+    return asyncio.run_coroutine_threadsafe(count(), server._loop).result()
+
+
+def test_snapshot_then_deltas(server):
+    board = BoardModel(9, 9, 10, seed=1)
+    server.watch(board)
+    client, messages = _connect(server)
+
+    snapshot = json.loads(messages.readline())
+    opened = board.open(4, 4)
+    delta = json.loads(messages.readline())
+
+    assert snapshot["type"] == "snapshot"
+    assert snapshot["cells"] == "." * 81
+    assert delta["type"] == "delta"
+    assert delta["seq"] == snapshot["seq"] + 1
+    assert delta["cells"] == opened
+    messages.close()
+    client.close()
+
+
+def test_a_disconnected_spectator_leaves_no_task(server):
+    server.watch(BoardModel(9, 9, 10, seed=1))
+    client, messages = _connect(server)
+    messages.readline()
+    assert server.spectators == 1
+
+    messages.close()
+    client.close()
+
+    for _ in range(100):
+        if not server.spectators and not _pending_tasks(server):
+            break
+        time.sleep(0.01)
+    assert server.spectators == 0
+    assert _pending_tasks(server) == 0
+
+
+def test_stop_closes_every_connection(server):
+    server.watch(BoardModel(9, 9, 10, seed=1))
+    clients = [_connect(server) for _ in range(3)]
+    for _, messages in clients:
+        messages.readline()
+
+    asyncio.run_coroutine_threadsafe(server._close(), server._loop).result()
+
+    assert _pending_tasks(server) == 0
+    for client, messages in clients:
+        assert messages.readline() == b""
+        messages.close()
+        client.close()